@@ -0,0 +1,376 @@
+/*
+ * Compiled inner loops of the packed-maze generator, BFS and A*, loaded through ctypes by accel.py.
+ * Build with `python accel.py`. Every function mirrors its pure-Python counterpart step by step
+ * (neighbor order, tie-breaking, random draws), so both backends return identical results.
+ *
+ * Parents are written as 2-bit direction codes into the buffers of a `parentcodes.ParentCodes`
+ * table. Functions return 0 on success and -1 when memory runs out, in which case the caller falls
+ * back to Python.
+ */
+
+#include <stdint.h>
+#include <stdlib.h>
+#include <string.h>
+
+#define TOP 1
+#define RIGHT 2
+#define BOTTOM 4
+#define LEFT 8
+
+/* Direction codes of parentcodes.py: the side the parent lies on */
+#define CODE_TOP 0
+#define CODE_RIGHT 1
+#define CODE_BOTTOM 2
+#define CODE_LEFT 3
+
+#define IS_SET(bits, i) ((bits)[(i) >> 3] & (1 << ((i) & 7)))
+#define SET_BIT(bits, i) ((bits)[(i) >> 3] |= (uint8_t)(1 << ((i) & 7)))
+
+static void set_code(uint8_t *codes, int64_t cell, int code)
+{
+    int shift = (int)(cell & 3) << 1;
+    codes[cell >> 2] = (uint8_t)((codes[cell >> 2] & ~(3 << shift)) | code << shift);
+}
+
+/* ---- Mersenne Twister, as in CPython's _randommodule.c ---- */
+
+#define MT_N 624
+#define MT_M 397
+
+typedef struct {
+    uint32_t *mt;
+    uint32_t index;
+} mt_state;
+
+static uint32_t genrand_uint32(mt_state *self)
+{
+    static const uint32_t mag01[2] = {0x0U, 0x9908b0dfU};
+    uint32_t *mt = self->mt;
+    uint32_t y;
+
+    if (self->index >= MT_N) {
+        int kk;
+        for (kk = 0; kk < MT_N - MT_M; kk++) {
+            y = (mt[kk] & 0x80000000U) | (mt[kk + 1] & 0x7fffffffU);
+            mt[kk] = mt[kk + MT_M] ^ (y >> 1) ^ mag01[y & 0x1U];
+        }
+        for (; kk < MT_N - 1; kk++) {
+            y = (mt[kk] & 0x80000000U) | (mt[kk + 1] & 0x7fffffffU);
+            mt[kk] = mt[kk + (MT_M - MT_N)] ^ (y >> 1) ^ mag01[y & 0x1U];
+        }
+        y = (mt[MT_N - 1] & 0x80000000U) | (mt[0] & 0x7fffffffU);
+        mt[MT_N - 1] = mt[MT_M - 1] ^ (y >> 1) ^ mag01[y & 0x1U];
+        self->index = 0;
+    }
+
+    y = mt[self->index++];
+    y ^= (y >> 11);
+    y ^= (y << 7) & 0x9d2c5680U;
+    y ^= (y << 15) & 0xefc60000U;
+    y ^= (y >> 18);
+    return y;
+}
+
+/* Random.randrange(n) for 1 <= n <= 4: getrandbits(n.bit_length()) until the draw is below n */
+static int randbelow(mt_state *self, int n)
+{
+    int k = n == 1 ? 1 : n <= 3 ? 2 : 3;
+    uint32_t r = genrand_uint32(self) >> (32 - k);
+    while (r >= (uint32_t)n)
+        r = genrand_uint32(self) >> (32 - k);
+    return (int)r;
+}
+
+/* ---- Generator: maze.generate_packed_maze ---- */
+
+/*
+ * Carves a perfect maze into `walls` (all walls standing) with the recursive backtracker. `state`
+ * holds the 624 words and the index of a Python `Random` (its getstate()), and is advanced in place.
+ */
+int accel_generate(uint8_t *walls, int64_t cols, int64_t rows, int64_t start, uint32_t *state)
+{
+    int64_t n = cols * rows;
+    uint8_t *generated = calloc((size_t)(n + 7) / 8, 1);
+    int64_t *stack = malloc(sizeof(int64_t) * (size_t)n);
+    mt_state rng = {state, state[MT_N]};
+
+    if (generated == NULL || stack == NULL) {
+        free(generated);
+        free(stack);
+        return -1;
+    }
+
+    int64_t top = 0;
+    SET_BIT(generated, start);
+    stack[top++] = start;
+
+    while (top) {
+        int64_t current = stack[top - 1];
+        int64_t x = current % cols, y = current / cols;
+        int64_t option_cells[4];
+        int option_walls[4];
+        int count = 0;
+
+        /* Neighbors not generated yet, in the order of the Python generator */
+        if (y > 0 && !IS_SET(generated, current - cols)) {
+            option_cells[count] = current - cols;
+            option_walls[count++] = TOP;
+        }
+        if (x < cols - 1 && !IS_SET(generated, current + 1)) {
+            option_cells[count] = current + 1;
+            option_walls[count++] = RIGHT;
+        }
+        if (y < rows - 1 && !IS_SET(generated, current + cols)) {
+            option_cells[count] = current + cols;
+            option_walls[count++] = BOTTOM;
+        }
+        if (x > 0 && !IS_SET(generated, current - 1)) {
+            option_cells[count] = current - 1;
+            option_walls[count++] = LEFT;
+        }
+
+        if (count) {
+            int choice = randbelow(&rng, count);
+            int64_t next = option_cells[choice];
+            int wall = option_walls[choice];
+            int opposite = wall == TOP ? BOTTOM : wall == RIGHT ? LEFT : wall == BOTTOM ? TOP : RIGHT;
+            walls[current] &= (uint8_t)~wall;
+            walls[next] &= (uint8_t)~opposite;
+            SET_BIT(generated, next);
+            stack[top++] = next;
+        } else {
+            top--;
+        }
+    }
+
+    state[MT_N] = rng.index;
+    free(generated);
+    free(stack);
+    return 0;
+}
+
+/* ---- BFS: search.bfs.bfs_search / compact_bfs_search ---- */
+
+/* Growable ring buffer of cell indices; the capacity is a power of two */
+typedef struct {
+    int64_t *data;
+    size_t capacity, head, length;
+} queue_t;
+
+static int queue_push(queue_t *queue, int64_t value)
+{
+    if (queue->length == queue->capacity) {
+        size_t capacity = queue->capacity ? queue->capacity * 2 : 1024;
+        int64_t *data = malloc(sizeof(int64_t) * capacity);
+        if (data == NULL)
+            return -1;
+        for (size_t i = 0; i < queue->length; i++)
+            data[i] = queue->data[(queue->head + i) & (queue->capacity - 1)];
+        free(queue->data);
+        queue->data = data;
+        queue->capacity = capacity;
+        queue->head = 0;
+    }
+    queue->data[(queue->head + queue->length) & (queue->capacity - 1)] = value;
+    queue->length++;
+    return 0;
+}
+
+static int64_t queue_pop(queue_t *queue)
+{
+    int64_t value = queue->data[queue->head];
+    queue->head = (queue->head + 1) & (queue->capacity - 1);
+    queue->length--;
+    return value;
+}
+
+/*
+ * Breadth-First Search from `start`, stopping when `goal` is dequeued. `codes` and `reached` are the
+ * buffers of an empty ParentCodes table. On success `*visited` is the number of cells dequeued and
+ * `*found` tells whether the goal was reached.
+ */
+int accel_bfs(const uint8_t *walls, int64_t n, int64_t cols, int64_t start, int64_t goal,
+              uint8_t *codes, uint8_t *reached, int64_t *visited, int *found)
+{
+    const int wall_bits[4] = {TOP, RIGHT, BOTTOM, LEFT};
+    const int64_t offsets[4] = {-cols, 1, cols, -1};
+    const int parent_codes[4] = {CODE_BOTTOM, CODE_LEFT, CODE_TOP, CODE_RIGHT};
+    queue_t queue = {NULL, 0, 0, 0};
+    int64_t count = 0;
+
+    (void)n;
+    *found = 0;
+    SET_BIT(reached, start);
+    if (queue_push(&queue, start))
+        return -1;
+
+    while (queue.length) {
+        int64_t current = queue_pop(&queue);
+        count++;
+        if (current == goal) {
+            *found = 1;
+            break;
+        }
+
+        int w = walls[current];
+        for (int i = 0; i < 4; i++) {
+            if (w & wall_bits[i])
+                continue;
+            int64_t neighbor = current + offsets[i];
+            if (IS_SET(reached, neighbor))
+                continue;
+            SET_BIT(reached, neighbor);
+            codes[neighbor >> 2] |= (uint8_t)(parent_codes[i] << ((neighbor & 3) << 1));
+            if (queue_push(&queue, neighbor)) {
+                free(queue.data);
+                return -1;
+            }
+        }
+    }
+
+    free(queue.data);
+    *visited = count;
+    return 0;
+}
+
+/* ---- A*: search.astar.astar_search ---- */
+
+/* Heap entries are compared like the (f cost, h cost, index) tuples of the Python search */
+typedef struct {
+    int64_t f, h, cell;
+} entry_t;
+
+typedef struct {
+    entry_t *data;
+    size_t capacity, length;
+} heap_t;
+
+static int entry_less(const entry_t *a, const entry_t *b)
+{
+    if (a->f != b->f)
+        return a->f < b->f;
+    if (a->h != b->h)
+        return a->h < b->h;
+    return a->cell < b->cell;
+}
+
+static int heap_push(heap_t *heap, entry_t entry)
+{
+    if (heap->length == heap->capacity) {
+        size_t capacity = heap->capacity ? heap->capacity * 2 : 1024;
+        entry_t *data = realloc(heap->data, sizeof(entry_t) * capacity);
+        if (data == NULL)
+            return -1;
+        heap->data = data;
+        heap->capacity = capacity;
+    }
+    size_t i = heap->length++;
+    while (i) {
+        size_t parent = (i - 1) / 2;
+        if (!entry_less(&entry, &heap->data[parent]))
+            break;
+        heap->data[i] = heap->data[parent];
+        i = parent;
+    }
+    heap->data[i] = entry;
+    return 0;
+}
+
+static entry_t heap_pop(heap_t *heap)
+{
+    entry_t top = heap->data[0];
+    entry_t last = heap->data[--heap->length];
+    size_t i = 0;
+    for (;;) {
+        size_t child = 2 * i + 1;
+        if (child >= heap->length)
+            break;
+        if (child + 1 < heap->length && entry_less(&heap->data[child + 1], &heap->data[child]))
+            child++;
+        if (!entry_less(&heap->data[child], &last))
+            break;
+        heap->data[i] = heap->data[child];
+        i = child;
+    }
+    if (heap->length)
+        heap->data[i] = last;
+    return top;
+}
+
+static int64_t abs64(int64_t value)
+{
+    return value < 0 ? -value : value;
+}
+
+/*
+ * A* from `start` to `goal` with the Manhattan heuristic scaled by `min_weight`. `weights` may be
+ * NULL for an unweighted maze. Outputs as for accel_bfs, counting expanded cells.
+ */
+int accel_astar(const uint8_t *walls, const uint8_t *weights, int64_t n, int64_t cols, int64_t start,
+                int64_t goal, int64_t min_weight, uint8_t *codes, uint8_t *reached, int64_t *visited,
+                int *found)
+{
+    const int wall_bits[4] = {TOP, RIGHT, BOTTOM, LEFT};
+    const int64_t offsets[4] = {-cols, 1, cols, -1};
+    const int parent_codes[4] = {CODE_BOTTOM, CODE_LEFT, CODE_TOP, CODE_RIGHT};
+    int64_t goal_x = goal % cols, goal_y = goal / cols;
+    int64_t *g_cost = malloc(sizeof(int64_t) * (size_t)n);
+    uint8_t *closed = calloc((size_t)(n + 7) / 8, 1);
+    heap_t heap = {NULL, 0, 0};
+    int64_t count = 0;
+    int status = -1;
+
+    *found = 0;
+    if (g_cost == NULL || closed == NULL)
+        goto done;
+
+    /* -1 means not reached yet */
+    memset(g_cost, 0xFF, sizeof(int64_t) * (size_t)n);
+    g_cost[start] = 0;
+    SET_BIT(reached, start);
+    int64_t h = (abs64(start % cols - goal_x) + abs64(start / cols - goal_y)) * min_weight;
+    if (heap_push(&heap, (entry_t){h, h, start}))
+        goto done;
+
+    while (heap.length) {
+        int64_t current = heap_pop(&heap).cell;
+
+        /* Skip stale entries: the cell was already expanded through a cheaper entry */
+        if (IS_SET(closed, current))
+            continue;
+        SET_BIT(closed, current);
+        count++;
+        if (current == goal) {
+            *found = 1;
+            break;
+        }
+
+        int64_t g = g_cost[current];
+        int w = walls[current];
+        for (int i = 0; i < 4; i++) {
+            if (w & wall_bits[i])
+                continue;
+            int64_t neighbor = current + offsets[i];
+            if (IS_SET(closed, neighbor))
+                continue;
+            int64_t tentative = g + (weights ? weights[neighbor] : 1);
+            if (g_cost[neighbor] < 0 || tentative < g_cost[neighbor]) {
+                g_cost[neighbor] = tentative;
+                set_code(codes, neighbor, parent_codes[i]);
+                SET_BIT(reached, neighbor);
+                h = (abs64(neighbor % cols - goal_x) + abs64(neighbor / cols - goal_y)) * min_weight;
+                if (heap_push(&heap, (entry_t){tentative + h, h, neighbor}))
+                    goto done;
+            }
+        }
+    }
+
+    *visited = count;
+    status = 0;
+
+done:
+    free(g_cost);
+    free(closed);
+    free(heap.data);
+    return status;
+}
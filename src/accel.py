@@ -0,0 +1,247 @@
+import os
+
+# The C source of the compiled backend and the shared library built from it, next to this file
+SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "_accel.c")
+LIBRARY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "_accel.so")
+
+# Backend in effect: "auto" uses the library when it is built, "python" never does
+BACKENDS = ("auto", "python", "c")
+_backend = os.environ.get("MAZE_BACKEND", "auto")
+
+# The loaded library, None until the first lookup and False when it is not available
+_library = None
+
+# Whether the compiled generator draws the same random numbers as `random.Random`, None until checked
+_generator_ok = None
+
+def build(compiler: str = None):
+    """
+    Compiles the C backend into a shared library next to this file. The library only uses the C
+    standard library and is loaded through ctypes, so any C compiler works and no Python headers
+    are needed.
+
+    Args:
+    - compiler (str): The compiler to run (defaults to $CC, then the compiler Python was built with).
+
+    Returns:
+    - path (str): The path of the library.
+    """
+
+    import shlex
+    import subprocess
+    import sysconfig
+
+    global _library
+    command = shlex.split(compiler or os.environ.get("CC") or sysconfig.get_config_var("CC") or "cc")
+    subprocess.run(command + ["-O2", "-shared", "-fPIC", "-o", LIBRARY, SOURCE], check=True)
+    _library = None
+    return LIBRARY
+
+
+def set_backend(name: str):
+    """
+    Chooses the backend of the accelerated solvers and generator.
+
+    Args:
+    - name (str): "auto" (the C backend when built, else Python), "python" or "c" (fails if the
+      library is not built).
+
+    Returns:
+    - previous (str): The backend chosen before, to restore it later.
+    """
+
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend {name!r}, expected one of {', '.join(BACKENDS)}")
+    if name == "c" and not available():
+        raise ImportError(f"The C backend is not built (python accel.py builds {LIBRARY})")
+    previous, _backend = _backend, name
+    return previous
+
+
+def available():
+    """
+    Returns True if the C backend is built and loads.
+    """
+
+    return _load() is not None
+
+
+def backend():
+    """
+    Returns the backend in effect: "c" or "python".
+    """
+
+    return "c" if _active() is not None else "python"
+
+
+def _load():
+    """
+    Loads the library once and declares the signatures of its functions, or returns None if it was
+    not built or cannot be loaded.
+    """
+
+    global _library
+    if _library is None:
+        _library = False
+        if os.path.exists(LIBRARY):
+            import ctypes
+
+            try:
+                library = ctypes.CDLL(LIBRARY)
+            except OSError:
+                return None
+            i64, i64_p, u8_p = ctypes.c_int64, ctypes.POINTER(ctypes.c_int64), ctypes.POINTER(ctypes.c_uint8)
+            library.accel_generate.argtypes = (u8_p, i64, i64, i64, ctypes.POINTER(ctypes.c_uint32))
+            library.accel_bfs.argtypes = (u8_p, i64, i64, i64, i64, u8_p, u8_p, i64_p, ctypes.POINTER(ctypes.c_int))
+            library.accel_astar.argtypes = (u8_p, u8_p, i64, i64, i64, i64, i64, u8_p, u8_p, i64_p,
+                                            ctypes.POINTER(ctypes.c_int))
+            _library = library
+    return _library or None
+
+
+def _active():
+    """
+    Returns the library if the C backend is in effect, else None.
+    """
+
+    return None if _backend == "python" else _load()
+
+
+def _buffer(data):
+    """
+    Wraps a bytearray for a C function without copying.
+    """
+
+    import ctypes
+
+    return (ctypes.c_uint8 * len(data)).from_buffer(data)
+
+
+def generate(maze, rng, start: int):
+    """
+    Carves a perfect maze like `maze.generate_packed_maze`, drawing from `rng` exactly as the Python
+    loop does, so both backends produce the same maze for the same seed.
+
+    Args:
+    - maze (Maze): A maze with every wall standing; its walls are carved in place.
+    - rng (Random): The random generator, advanced as the Python loop would advance it.
+    - start (int): The index of the cell the carving starts from.
+
+    Returns:
+    - bool: True if the maze was carved, False if the caller must run the Python loop.
+    """
+
+    global _generator_ok
+    library = _active()
+    if library is None:
+        return False
+
+    # Once per process, make sure the random draws match this Python's `Random.randrange`
+    if _generator_ok is None:
+        _generator_ok = _same_random_draws(library)
+    return _generator_ok and _carve(library, maze, rng, start)
+
+
+def _carve(library, maze, rng, start: int):
+    """
+    Runs the compiled generator on the state of `rng` and hands the advanced state back to it.
+    """
+
+    import ctypes
+
+    version, internal, gauss = rng.getstate()
+    state = (ctypes.c_uint32 * len(internal))(*internal)
+    if library.accel_generate(_buffer(maze.walls), maze.cols, maze.rows, start, state):
+        return False
+    rng.setstate((version, tuple(state), gauss))
+    return True
+
+
+def _same_random_draws(library):
+    """
+    Compares the compiled generator with the Python loop on a small maze.
+    """
+
+    from random import Random
+    from maze import Maze, generate_packed_maze
+
+    maze = Maze(13, 11)
+    if not _carve(library, maze, Random(0), 0):
+        return False
+    previous = set_backend("python")
+    try:
+        return maze.walls == generate_packed_maze(13, 11, 0).walls
+    finally:
+        set_backend(previous)
+
+
+def bfs(maze, start: int, goal: int, parents):
+    """
+    Runs the Breadth-First Search of `search.bfs.bfs_search` in C.
+
+    Args:
+    - maze (Maze): The packed maze.
+    - start (int): The index of the start cell.
+    - goal (int): The index of the destination cell.
+    - parents (ParentCodes): An empty table that receives the parent of every cell reached.
+
+    Returns:
+    - found (bool): Whether the goal was reached, or None if the caller must run the Python loop. The
+      table may be partly filled in that case and must not be reused.
+    - visited_cells_count (int): The number of cells dequeued.
+    """
+
+    import ctypes
+
+    library = _active()
+    if library is None:
+        return None, 0
+    visited, found = ctypes.c_int64(), ctypes.c_int()
+    if library.accel_bfs(_buffer(maze.walls), len(maze), maze.cols, start, goal, _buffer(parents.codes),
+                         _buffer(parents.reached_bits), ctypes.byref(visited), ctypes.byref(found)):
+        return None, 0
+    return bool(found.value), visited.value
+
+
+def astar(maze, start: int, goal: int, parents):
+    """
+    Runs the A* search of `search.astar.astar_search` in C, with the same costs, heuristic and
+    tie-breaking.
+
+    Args:
+    - maze (Maze): The packed maze, optionally with cell weights.
+    - start (int): The index of the start cell.
+    - goal (int): The index of the destination cell.
+    - parents (ParentCodes): An empty table that receives the parent of every cell reached.
+
+    Returns:
+    - found (bool): Whether the goal was reached, or None if the caller must run the Python loop. The
+      table may be partly filled in that case and must not be reused.
+    - visited_cells_count (int): The number of cells expanded.
+    """
+
+    import ctypes
+
+    library = _active()
+    if library is None:
+        return None, 0
+    weights = _buffer(maze.weights) if maze.weights is not None else None
+    visited, found = ctypes.c_int64(), ctypes.c_int()
+    if library.accel_astar(_buffer(maze.walls), weights, len(maze), maze.cols, start, goal, maze.min_weight(),
+                           _buffer(parents.codes), _buffer(parents.reached_bits), ctypes.byref(visited),
+                           ctypes.byref(found)):
+        return None, 0
+    return bool(found.value), visited.value
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the optional C backend of the generator, BFS and A*.")
+    parser.add_argument("--compiler", help="C compiler command (defaults to $CC or the one Python was built with)")
+    args = parser.parse_args()
+
+    print(f"Built {build(args.compiler)}")
+    set_backend("c")
+    print(f"Backend in effect: {backend()}")
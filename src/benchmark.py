@@ -0,0 +1,87 @@
+import time
+import argparse
+import accel
+from maze import generate_packed_maze, braid_maze
+from headless import load_solver
+
+# Solvers with a compiled fast path, by their name in `headless.SOLVERS`
+BENCHMARK_SOLVERS = ("bfs", "bfs-compact", "astar")
+
+def _best_time(function, repeat: int):
+    """
+    Runs a function `repeat` times and returns the fastest time in seconds with the last result.
+    """
+
+    best = float("inf")
+    for _ in range(repeat):
+        began = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - began)
+    return best, result
+
+
+def run_benchmark(sizes, backends=("python", "c"), braid: float = 0.1, seed: int = 0, repeat: int = 3):
+    """
+    Times the generator and the solvers with a compiled fast path on every backend and checks that
+    the backends agree: the same maze for the same seed, and the same path and visited cell count
+    from every solver.
+
+    Args:
+    - sizes (List[Tuple[int, int]]): The (cols, rows) of the mazes to time.
+    - backends (Sequence[str]): The backends to compare (see `accel.set_backend`).
+    - braid (float): The share of dead ends removed before solving, so the searches meet loops.
+    - seed (int): The seed of the mazes.
+    - repeat (int): The runs per measurement; the fastest one is kept.
+
+    Returns:
+    - rows (List[Dict]): One row per size, task and backend with "cells", "task", "backend" and
+      "seconds".
+    """
+
+    rows = []
+    previous = accel.set_backend("auto")
+    try:
+        for cols, maze_rows in sizes:
+            reference = {}
+            for backend in backends:
+                accel.set_backend(backend)
+                seconds, maze = _best_time(lambda: generate_packed_maze(cols, maze_rows, seed), repeat)
+                rows.append({"cells": len(maze), "task": "generate", "backend": backend, "seconds": seconds})
+                braid_maze(maze, braid, seed)
+                outputs = {"generate": bytes(maze.walls)}
+
+                for name in BENCHMARK_SOLVERS:
+                    solver = load_solver(name)
+                    seconds, outputs[name] = _best_time(lambda: solver(maze), repeat)
+                    rows.append({"cells": len(maze), "task": name, "backend": backend, "seconds": seconds})
+
+                # Every backend must reproduce the maze, paths and counts of the first one
+                for task, output in outputs.items():
+                    if reference.setdefault(task, output) != output:
+                        raise AssertionError(f"{task} differs between backends on a {cols}x{maze_rows} maze")
+    finally:
+        accel.set_backend(previous)
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the generator and solvers on the Python and C backends.")
+    parser.add_argument("--sizes", default="100x100,500x500,1000x1000", help="comma-separated COLSxROWS list")
+    parser.add_argument("--braid", type=float, default=0.1, help="share of dead ends removed before solving")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement, the fastest is kept")
+    args = parser.parse_args()
+
+    sizes = [tuple(int(side) for side in size.split("x")) for size in args.sizes.split(",")]
+    backends = ["python"]
+    if accel.available():
+        backends.append("c")
+    else:
+        print("C backend not built (python accel.py), timing the Python backend only")
+
+    rows = run_benchmark(sizes, backends, args.braid, args.seed, args.repeat)
+    python_seconds = {(row["cells"], row["task"]): row["seconds"] for row in rows if row["backend"] == "python"}
+    print(f"{'cells':>10}  {'task':<12}{'backend':<9}{'ms':>10}{'speedup':>9}")
+    for row in rows:
+        speedup = python_seconds[row["cells"], row["task"]] / row["seconds"]
+        print(f"{row['cells']:>10}  {row['task']:<12}{row['backend']:<9}{row['seconds'] * 1000:>10.2f}{speedup:>8.1f}x")
@@ -0,0 +1,228 @@
+import os
+import time
+import struct
+import hashlib
+from array import array
+from collections import OrderedDict
+
+# Entry file header: magic, format version, found flag, path length, visited cells, solve seconds, key length
+HEADER = struct.Struct("<4sHBqqdI")
+MAGIC = b"MZSC"
+VERSION = 1
+
+# Entries the in-memory cache holds unless told otherwise
+DEFAULT_CAPACITY = 1024
+
+class SolverCache:
+    """
+    Cache of solver results keyed by (maze content hash, algorithm, start, goal). Batch pipelines
+    solve the same maze with the same algorithm and endpoints again and again; a key match returns
+    the stored path and visited count without searching.
+
+    Entries are kept in an in-memory LRU and, when a directory is given, in one file per entry
+    there, so the results outlive the process and can be shared between jobs. Each entry also
+    remembers how long the original solve took, which is counted as saved time on every hit.
+
+    Attributes:
+    - capacity (int): The number of entries held in memory.
+    - directory (str): The directory of the on-disk store, or None for memory only.
+    - hits (int): Lookups answered from memory or disk.
+    - disk_hits (int): The hits that had to read the on-disk store.
+    - misses (int): Lookups that ran the solver.
+    - saved_seconds (float): The solve time of the original searches the hits stood in for.
+    - solve_seconds (float): The time spent solving on misses.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, directory: str = None):
+        """
+        Creates an empty cache.
+
+        Args:
+        - capacity (int): The number of entries held in memory.
+        - directory (str): Optional directory for the on-disk store, created if missing.
+        """
+
+        self.capacity = max(1, capacity)
+        self.directory = directory
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+        # Entries (key -> (path, visited cells count, solve seconds)) in least recently used order
+        self._entries = OrderedDict()
+        self.reset_stats()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def reset_stats(self):
+        """
+        Resets the hit, miss and time counters.
+        """
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+        self.solve_seconds = 0.0
+
+    def cache_stats(self):
+        """
+        Returns the counters and the hit rate as a dictionary.
+        """
+
+        lookups = self.hits + self.misses
+        return {
+            "capacity": self.capacity,
+            "cached": len(self._entries),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "solve_seconds": self.solve_seconds,
+            "saved_seconds": self.saved_seconds,
+        }
+
+    @staticmethod
+    def key(maze_hash: str, algorithm: str, start: int, goal: int):
+        """
+        Returns the cache key of a query, e.g. with `maze.content_hash()` as `maze_hash`.
+        """
+
+        return f"{maze_hash}:{algorithm}:{start}:{goal}"
+
+    def _file(self, key: str):
+        """
+        Returns the file of an entry in the on-disk store.
+        """
+
+        return os.path.join(self.directory, hashlib.blake2b(key.encode(), digest_size=16).hexdigest() + ".sc")
+
+    def _read(self, key: str):
+        """
+        Reads an entry from the on-disk store, or returns None if it is missing or stores another key.
+        """
+
+        try:
+            with open(self._file(key), "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            return None
+        if len(data) < HEADER.size:
+            return None
+        magic, version, found, length, visited, seconds, key_size = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION or data[HEADER.size:HEADER.size + key_size] != key.encode():
+            return None
+        if not found:
+            return None, visited, seconds
+        path = array("q")
+        path.frombytes(data[HEADER.size + key_size:HEADER.size + key_size + 8 * length])
+        return path.tolist(), visited, seconds
+
+    def _write(self, key: str, entry):
+        """
+        Writes an entry to the on-disk store. The file is renamed into place, so concurrent jobs
+        never read a half-written entry.
+        """
+
+        path, visited, seconds = entry
+        encoded = key.encode()
+        name = self._file(key)
+        temporary = f"{name}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as file:
+            file.write(HEADER.pack(MAGIC, VERSION, path is not None, 0 if path is None else len(path), visited, seconds, len(encoded)))
+            file.write(encoded)
+            if path is not None:
+                file.write(array("q", path).tobytes())
+        os.replace(temporary, name)
+
+    def _remember(self, key: str, entry):
+        """
+        Stores an entry in memory, evicting the least recently used ones beyond the capacity.
+        """
+
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def get(self, key: str):
+        """
+        Looks up an entry in memory, then on disk, and counts the lookup.
+
+        Args:
+        - key (str): A key made by `key`.
+
+        Returns:
+        - entry (Tuple[List[int], int, float]): The path (None if the goal was unreachable), the
+          visited cells count and the original solve seconds, else None on a miss.
+        """
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        elif self.directory is not None:
+            entry = self._read(key)
+            if entry is not None:
+                self.disk_hits += 1
+                self._remember(key, entry)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.saved_seconds += entry[2]
+        return entry
+
+    def put(self, key: str, path, visited_cells_count: int, seconds: float):
+        """
+        Stores a solver result in memory and in the on-disk store.
+
+        Args:
+        - key (str): A key made by `key`.
+        - path (List[int]): The path found, or None.
+        - visited_cells_count (int): The visited cells count of the solve.
+        - seconds (float): How long the solve took.
+        """
+
+        entry = (path, visited_cells_count, seconds)
+        self._remember(key, entry)
+        if self.directory is not None:
+            self._write(key, entry)
+
+    def solve(self, maze, algorithm: str, start: int = 0, goal: int = None, maze_hash: str = None):
+        """
+        Returns the result of a headless solver, from the cache when the same maze was already solved
+        with the same algorithm and endpoints.
+
+        Args:
+        - maze (Maze): The packed maze.
+        - algorithm (str): One of the keys of `headless.SOLVERS`.
+        - start (int): The index of the start cell.
+        - goal (int): The index of the destination cell (defaults to the last cell).
+        - maze_hash (str): The content hash of the maze, if the caller already has it.
+
+        Returns:
+        - path (List[int]): The path found, else None.
+        - visited_cells_count (int): The visited cells count of the original solve.
+        """
+
+        if goal is None:
+            goal = len(maze) - 1
+        if maze_hash is None:
+            maze_hash = maze.content_hash()
+        key = self.key(maze_hash, algorithm, start, goal)
+        entry = self.get(key)
+        if entry is not None:
+            # Hand out a copy so callers cannot change the cached path
+            path, visited_cells_count, _ = entry
+            return (None if path is None else list(path)), visited_cells_count
+
+        # Imported on the first miss, like the solvers themselves
+        from headless import load_solver
+
+        solver = load_solver(algorithm)
+        began = time.perf_counter()
+        path, visited_cells_count = solver(maze, start, goal)
+        seconds = time.perf_counter() - began
+        self.solve_seconds += seconds
+        self.put(key, path, visited_cells_count, seconds)
+        return path, visited_cells_count
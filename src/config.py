@@ -1,20 +1,22 @@
-# Game Resolution
-RESOLUTION = WIDTH, HEIGHT = 1203, 724
-# Cells' size (pixel)
-TILE_SIZE = 40
-# Number of rows, columns
-cols, rows = 24, 18
-# Starting position of the maze (top left)
-MAZE_OFFSET = 240
-
-# Colors
-BACKGROUND_COLOR = "#1e1e1e"
-WALL_COLOR = "#f70067"
-BUTTON_COLOR = "#0d802b"
-START_END_CELL_COLOR = "#f70067"
-CELL_GENERATED_COLOR = "#1e1e1e"
-CELL_VISITED_COLOR = "#00FFFF"
-CELL_SOLUTION_COLOR = "#00FF00"
-
-# Font
-FONT = "Cambria"
+# Game Resolution
+RESOLUTION = WIDTH, HEIGHT = 1203, 724
+# Cells' size (pixel)
+TILE_SIZE = 40
+# Number of rows, columns
+cols, rows = 24, 18
+# Starting position of the maze (top left)
+MAZE_OFFSET = 240
+# Share of dead ends removed after generation to add loops (0 keeps the maze perfect)
+BRAID_FRACTION = 0
+
+# Colors
+BACKGROUND_COLOR = "#1e1e1e"
+WALL_COLOR = "#f70067"
+BUTTON_COLOR = "#0d802b"
+START_END_CELL_COLOR = "#f70067"
+CELL_GENERATED_COLOR = "#1e1e1e"
+CELL_VISITED_COLOR = "#00FFFF"
+CELL_SOLUTION_COLOR = "#00FF00"
+
+# Font
+FONT = "Cambria"
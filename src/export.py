@@ -0,0 +1,228 @@
+import sys
+from array import array
+
+# Type characters of the buffer formats used by the packed mazes and headless searches
+_NPY_KINDS = {"B": "u", "H": "u", "I": "u", "L": "u", "Q": "u",
+              "b": "i", "h": "i", "i": "i", "l": "i", "q": "i",
+              "f": "f", "d": "f"}
+
+class SearchResult:
+    """
+    The arrays a headless search leaves behind, handed over without copying. Pass one as `result`
+    to a headless solver (`bfs_search`, `astar_search`, `dijkstra_search`, ...) or to
+    `routing.distance_field`, and the search stores references to its own distance array and parent
+    table here and appends every cell it settles to `order` and the size of its frontier at that
+    moment to `frontier`. The arrays support the buffer protocol, so `view` and `to_numpy` wrap them
+    in place even for mazes with 10^7 cells. Solvers keep their parents as 2-bit `ParentCodes`: the
+    raw codes and reached bitmap are viewed in place as "parent_codes" and "reached" (encoding in
+    `ParentCodes`), and "parent" expands them into an index array, vectorized with NumPy.
+
+    Attributes:
+    - cols (int): The number of columns of the searched maze.
+    - rows (int): The number of rows of the searched maze.
+    - dist (array or None): The cost of every cell from the start (to the goal for distance fields),
+      -1 where unreached, or None for searches that track no costs (GBFS, DFS). Solvers use 32-bit
+      costs when the maze allows it (see `Maze.cost_typecode`).
+    - parent (ParentCodes or array or None): The cell every cell was reached from (the next step to
+      the goal for distance fields), -1 where there is none.
+    - order (array): The indices of the cells in the order the search settled them.
+    - frontier (array): The number of entries in the queue or open set when each cell of `order` was
+      settled.
+    """
+
+    def __init__(self):
+        self.cols = 0
+        self.rows = 0
+        self.dist = None
+        self.parent = None
+        self.order = array('l')
+        self.frontier = array('l')
+
+    def attach(self, maze, dist=None, parent=None):
+        """
+        Called by a search to hand over its arrays; any earlier contents are dropped.
+
+        Args:
+        - maze (Maze): The maze being searched.
+        - dist (array): The per-cell cost array of the search, if it has one.
+        - parent (ParentCodes or array): The parent table of the search.
+        """
+
+        self.cols, self.rows = maze.cols, maze.rows
+        self.dist = dist
+        self.parent = parent
+        del self.order[:]
+        del self.frontier[:]
+
+    def buffer(self, name: str):
+        """
+        Returns one of the arrays as an object supporting the buffer protocol, or None if the search
+        did not produce it. "parent" expands parent codes into parent indices (see
+        `ParentCodes.to_array`); "parent_codes" and "reached" are the `codes` and `reached_bits`
+        bytearrays of the parent codes themselves.
+
+        Args:
+        - name (str): "dist", "parent", "order", "frontier", "parent_codes" or "reached".
+        """
+
+        if name in ("parent_codes", "reached"):
+            if not hasattr(self.parent, "reached_bits"):
+                return None
+            return self.parent.codes if name == "parent_codes" else self.parent.reached_bits
+        buffer = getattr(self, name)
+        if hasattr(buffer, "to_array"):
+            return buffer.to_array()
+        return buffer
+
+    def view(self, name: str):
+        """
+        Returns a memoryview of one of the arrays, zero-copy except for "parent" expanded from parent
+        codes (see `buffer`). Per-cell arrays (`dist`, `parent`) are shaped (rows, cols); `order`,
+        `frontier` and the packed "parent_codes" and "reached" are one-dimensional.
+
+        Args:
+        - name (str): "dist", "parent", "order", "frontier", "parent_codes" or "reached".
+        """
+
+        buffer = self.buffer(name)
+        if buffer is None:
+            raise ValueError(f"The search did not produce {name!r}")
+        if name in ("order", "frontier", "parent_codes", "reached"):
+            return memoryview(buffer)
+        return grid_view(buffer, self.cols, self.rows)
+
+    def to_numpy(self, name: str):
+        """
+        Returns a NumPy array sharing memory with one of the arrays (see `view`).
+        """
+
+        return to_numpy(self.view(name))
+
+    def visit_rank(self):
+        """
+        Returns the position of every cell in the visit order, -1 for cells that were never settled.
+
+        Returns:
+        - rank (array): One entry per cell, in row-major order.
+        """
+
+        rank = array('l', [-1]) * (self.cols * self.rows)
+        for position, cell in enumerate(self.order):
+            rank[cell] = position
+        return rank
+
+
+def grid_view(buffer, cols: int, rows: int):
+    """
+    Returns a zero-copy (rows, cols) memoryview of a flat row-major per-cell buffer.
+
+    Args:
+    - buffer (bytes-like): A bytearray, array or any other object supporting the buffer protocol.
+    - cols (int): The number of columns.
+    - rows (int): The number of rows.
+    """
+
+    view = memoryview(buffer)
+    if len(view) != cols * rows:
+        raise ValueError(f"Expected {cols * rows} items, got {len(view)}")
+    return view.cast("B").cast(view.format, (rows, cols))
+
+
+def to_numpy(buffer):
+    """
+    Returns a NumPy array sharing memory with a buffer. NumPy is only needed for this function.
+
+    Args:
+    - buffer (bytes-like): Any object supporting the buffer protocol, e.g. a view from `grid_view`.
+    """
+
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("to_numpy requires NumPy (pip install numpy)") from None
+    return numpy.asarray(memoryview(buffer))
+
+
+def save_npy(path: str, buffer):
+    """
+    Writes a buffer to a `.npy` file that `numpy.load` reads back, keeping the shape of the view. The
+    header is built by hand and the data is written straight from the buffer, so NumPy is not needed
+    and the data is never copied into Python objects.
+
+    Args:
+    - path (str): The file to write.
+    - buffer (bytes-like): Any object supporting the buffer protocol, e.g. a view from `grid_view`.
+    """
+
+    view = memoryview(buffer)
+    kind = _NPY_KINDS.get(view.format)
+    if kind is None:
+        raise ValueError(f"Unsupported buffer format: {view.format!r}")
+    if view.itemsize == 1:
+        byteorder = "|"
+    else:
+        byteorder = "<" if sys.byteorder == "little" else ">"
+    shape = ", ".join(str(size) for size in view.shape) + ("," if view.ndim == 1 else "")
+    header = f"{{'descr': '{byteorder}{kind}{view.itemsize}', 'fortran_order': False, 'shape': ({shape}), }}"
+
+    # Version 1.0 layout: magic, version, header length, header padded so the data is 64-byte aligned
+    padding = -(10 + len(header) + 1) % 64
+    header = (header + " " * padding + "\n").encode("latin-1")
+    with open(path, "wb") as file:
+        file.write(b"\x93NUMPY\x01\x00")
+        file.write(len(header).to_bytes(2, "little"))
+        file.write(header)
+        file.write(view.cast("B"))
+
+
+def maze_columns(maze, result: SearchResult = None):
+    """
+    Returns a Parquet-friendly columnar layout of a maze: one row per cell, one flat buffer per
+    column. The wall and weight columns share memory with the maze and the search columns with the
+    result; only the coordinates, visit ranks and parents expanded from parent codes are computed.
+
+    Args:
+    - maze (Maze): The packed maze.
+    - result (SearchResult): Optional search result whose arrays are added as columns.
+
+    Returns:
+    - columns (Dict[str, bytes-like]): The columns "x", "y", "walls", "weight" and, with a result,
+      "dist", "parent" and "visit_rank".
+    """
+
+    cols, rows = maze.cols, maze.rows
+    y = array('l')
+    for row in range(rows):
+        y.extend(array('l', [row]) * cols)
+    columns = {
+        "x": array('l', range(cols)) * rows,
+        "y": y,
+        "walls": memoryview(maze.walls),
+        "weight": memoryview(maze.weights) if maze.weights is not None else memoryview(b"\x01" * len(maze)),
+    }
+    if result is not None:
+        for name in ("dist", "parent"):
+            buffer = result.buffer(name)
+            if buffer is not None:
+                columns[name] = memoryview(buffer)
+        columns["visit_rank"] = result.visit_rank()
+    return columns
+
+
+def save_parquet(path: str, columns):
+    """
+    Writes columns (e.g. from `maze_columns`) to a Parquet file. Requires NumPy and PyArrow, which
+    wrap the buffers without copying before the file is encoded.
+
+    Args:
+    - path (str): The file to write.
+    - columns (Dict[str, bytes-like]): Flat buffers of equal length by column name.
+    """
+
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("save_parquet requires PyArrow (pip install pyarrow)") from None
+    table = pyarrow.table({name: pyarrow.array(to_numpy(buffer)) for name, buffer in columns.items()})
+    pyarrow.parquet.write_table(table, path)
@@ -0,0 +1,143 @@
+import time
+from importlib import import_module
+from maze import generate_packed_maze, braid_maze
+
+# Headless solvers by name: (module, function). Modules are imported on first use, so starting a
+# worker only pays for the solver it runs, and nothing on this path ever loads pygame: the search
+# modules import pygame, config and the UI helpers inside their drawing solvers, import the modules
+# they only name in annotations under a `TYPE_CHECKING = False` guard (`typing` alone would double
+# their import time), and import helpers such as `accel` where they are first used.
+SOLVERS = {"dijkstra": ("search.dijkstra", "dijkstra_search"),
+           "astar": ("search.astar", "astar_search"),
+           "gbfs": ("search.gbfs", "gbfs_search"),
+           "bfs": ("search.bfs", "bfs_search"),
+           "bfs-compact": ("search.bfs", "compact_bfs_search"),
+           "dfs": ("search.dfs", "dfs_search"),
+           "bidirectional": ("search.bidirectionalbfs", "bidirectional_bfs_search"),
+           "idastar": ("search.idastar", "ida_star_search"),
+           "iddfs": ("search.iddfs", "iddfs_search")}
+
+def load_solver(name: str):
+    """
+    Imports and returns a headless solver by name.
+
+    Args:
+    - name (str): One of the keys of `SOLVERS`.
+
+    Returns:
+    - solver (Callable): The solver, called as solver(maze, start, goal).
+    """
+
+    if name not in SOLVERS:
+        raise ValueError(f"Unknown algorithm {name!r}, expected one of {', '.join(SOLVERS)}")
+    module_name, function_name = SOLVERS[name]
+    return getattr(import_module(module_name), function_name)
+
+
+def build_maze(cols: int, rows: int, seed: int = 0, braid: float = 0.0, max_weight: int = 1):
+    """
+    Generates the packed maze described by the command-line options.
+
+    Args:
+    - cols (int): The number of columns.
+    - rows (int): The number of rows.
+    - seed (int): The seed of the maze, its loops and its weights.
+    - braid (float): The share of dead ends removed.
+    - max_weight (int): Random cell weights up to this value (1 leaves the maze unweighted).
+
+    Returns:
+    - maze (Maze): The generated maze.
+    """
+
+    maze = generate_packed_maze(cols, rows, seed)
+    if braid > 0:
+        braid_maze(maze, braid, seed)
+    if max_weight > 1:
+        maze.randomize_weights(max_weight, seed)
+    return maze
+
+
+if __name__ == "__main__":
+    # Only the command line needs these, workers importing this module skip them
+    import json
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate and solve a packed maze without the UI.")
+    parser.add_argument("--cols", type=int, default=100)
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--braid", type=float, default=0.0, help="share of dead ends removed")
+    parser.add_argument("--max-weight", type=int, default=1, help="random cell weights up to this value")
+    parser.add_argument("--algorithm", choices=sorted(SOLVERS), default="astar")
+    parser.add_argument("--start", type=int, default=0)
+    parser.add_argument("--goal", type=int, default=-1, help="goal cell index (-1 for the last cell)")
+    parser.add_argument("--trace", help="write the search trace to this file for replay.py")
+    parser.add_argument("--batch", help="JSON lines file of queries; each line overrides the options above")
+    parser.add_argument("--cache-size", type=int, default=1024, help="solver results kept in memory in batch mode")
+    parser.add_argument("--cache-dir", help="directory of the on-disk solver result cache in batch mode")
+    args = parser.parse_args()
+
+    if args.batch is None:
+        maze = build_maze(args.cols, args.rows, args.seed, args.braid, args.max_weight)
+        goal = args.goal if args.goal >= 0 else len(maze) - 1
+
+        began = time.perf_counter()
+        if args.trace is None:
+            path, visited_cells_count = load_solver(args.algorithm)(maze, args.start, goal)
+        else:
+            from searchtrace import record_trace
+
+            trace, visited_cells_count = record_trace(maze, args.algorithm, args.start, goal)
+            path = list(trace.path) or None
+        elapsed = time.perf_counter() - began
+        if args.trace is not None:
+            trace.save(args.trace)
+        print(json.dumps({"algorithm": args.algorithm,
+                          "cost": None if path is None else maze.path_cost(path),
+                          "length": None if path is None else len(path),
+                          "visited": visited_cells_count,
+                          "ms": round(elapsed * 1000, 3)}))
+    else:
+        from cache import SolverCache
+
+        cache = SolverCache(args.cache_size, args.cache_dir)
+        defaults = {"cols": args.cols, "rows": args.rows, "seed": args.seed, "braid": args.braid,
+                    "max_weight": args.max_weight, "algorithm": args.algorithm, "start": args.start, "goal": args.goal}
+        # Mazes of the batch with their content hashes, by generation options
+        mazes = {}
+        queries = 0
+        began_batch = time.perf_counter()
+        with open(args.batch) as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                query = {**defaults, **json.loads(line)}
+                options = (query["cols"], query["rows"], query["seed"], query["braid"], query["max_weight"])
+                if options not in mazes:
+                    maze = build_maze(*options)
+                    mazes[options] = (maze, maze.content_hash())
+                maze, maze_hash = mazes[options]
+                goal = query["goal"] if query["goal"] >= 0 else len(maze) - 1
+
+                hits = cache.hits
+                began = time.perf_counter()
+                path, visited_cells_count = cache.solve(maze, query["algorithm"], query["start"], goal, maze_hash)
+                elapsed = time.perf_counter() - began
+                queries += 1
+                print(json.dumps({"algorithm": query["algorithm"],
+                                  "cost": None if path is None else maze.path_cost(path),
+                                  "length": None if path is None else len(path),
+                                  "visited": visited_cells_count,
+                                  "cached": cache.hits > hits,
+                                  "ms": round(elapsed * 1000, 3)}))
+
+        summary = cache.cache_stats()
+        print(json.dumps({"queries": queries,
+                          "mazes": len(mazes),
+                          "hits": summary["hits"],
+                          "disk_hits": summary["disk_hits"],
+                          "misses": summary["misses"],
+                          "hit_rate": round(summary["hit_rate"], 4),
+                          "solve_ms": round(summary["solve_seconds"] * 1000, 3),
+                          "saved_ms": round(summary["saved_seconds"] * 1000, 3),
+                          "total_ms": round((time.perf_counter() - began_batch) * 1000, 3)}))
@@ -0,0 +1,83 @@
+import os
+import sys
+import argparse
+import subprocess
+
+# Import-time budget of the headless entry point and its default solver, in milliseconds
+IMPORT_BUDGET_MS = 30
+
+# Code a short-lived worker runs before its first solve
+HEADLESS_IMPORT = "import headless; headless.load_solver('astar')"
+
+# Modules the headless path must never load
+FORBIDDEN = ("pygame",)
+
+def _run(code: str):
+    """
+    Runs `code` in a fresh interpreter with `-X importtime` and parses the report.
+
+    Returns:
+    - imports (List[Tuple[str, int, int, int]]): (module, depth, self us, cumulative us) for every
+      import, in the order the imports finished.
+    """
+
+    source_dir = os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=source_dir,
+                            capture_output=True, text=True, check=True)
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return imports
+
+
+def measure(code: str = HEADLESS_IMPORT, runs: int = 5):
+    """
+    Measures how long `code` spends importing modules, on top of what the interpreter imports at
+    startup anyway. The best of several runs is kept, which filters out noise from the machine.
+
+    Args:
+    - code (str): The Python code to run, e.g. "import headless".
+    - runs (int): The number of fresh interpreters to measure.
+
+    Returns:
+    - total_ms (float): The import time of the best run, in milliseconds.
+    - imports (List[Tuple[str, int, int, int]]): The imports of that run that startup does not do.
+    """
+
+    startup = {name for name, _, _, _ in _run("pass")}
+    best = None
+    for _ in range(runs):
+        imports = [entry for entry in _run(code) if entry[0] not in startup]
+        total = sum(cumulative for _, depth, _, cumulative in imports if depth == 0)
+        if best is None or total < best[0]:
+            best = (total, imports)
+    return best[0] / 1000, best[1]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the import time of the headless entry point against a budget.")
+    parser.add_argument("--code", default=HEADLESS_IMPORT, help="code whose imports are measured")
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="number of slowest modules listed")
+    args = parser.parse_args()
+
+    total_ms, imports = measure(args.code, args.runs)
+    print(f"{args.code}: {total_ms:.1f} ms of imports (budget {args.budget_ms:.0f} ms, best of {args.runs})")
+    for name, _, self_us, cumulative_us in sorted(imports, key=lambda entry: entry[2], reverse=True)[:args.top]:
+        print(f"  {self_us / 1000:7.2f} ms self {cumulative_us / 1000:7.2f} ms cumulative  {name}")
+
+    failures = []
+    loaded = {name.split(".")[0] for name, _, _, _ in imports}
+    for module in FORBIDDEN:
+        if module in loaded:
+            failures.append(f"{module} was imported")
+    if total_ms > args.budget_ms:
+        failures.append(f"over budget by {total_ms - args.budget_ms:.1f} ms")
+    for failure in failures:
+        print("FAIL:", failure)
+    sys.exit(1 if failures else 0)
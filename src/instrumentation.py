@@ -0,0 +1,294 @@
+import sys
+import time
+import threading
+from collections import Counter
+
+class SearchStats:
+    """
+    Collects hot-path counters and per-phase timings for a single maze solve.
+
+    Pass an instance to any solver through its `stats` argument. Solvers that receive no
+    collector fall back to `NULL_STATS`, whose hooks do nothing, so the instrumentation can
+    stay wired in permanently.
+
+    Attributes:
+    - pushes (int): Number of cells pushed onto the frontier (heap, queue or stack).
+    - pops (int): Number of entries popped from the frontier.
+    - stale_skips (int): Number of popped entries discarded because a better entry was already expanded.
+    - neighbor_checks (int): Number of neighbor candidates examined while expanding cells. Headless
+      solvers count every open passage out of an expanded cell; drawing solvers count the neighbors
+      returned by `Cell.check_neighbors_for_search`, which leaves out cells visited before, so their
+      counts are lower on the same maze.
+    - queue_high_water (int): The largest frontier size observed during the search.
+    - phase_times (dict): Seconds spent in each phase ('setup', 'search', 'reconstruct').
+    """
+
+    enabled = True
+
+    def __init__(self):
+        """
+        Initializes an empty collector with every counter set to zero.
+        """
+
+        self.pushes = 0
+        self.pops = 0
+        self.stale_skips = 0
+        self.neighbor_checks = 0
+        self.queue_high_water = 0
+        self.phase_times = {}
+
+        # Name and start time of the phase currently being timed
+        self._phase = None
+        self._phase_start = 0.0
+
+    def record_push(self, frontier_size: int):
+        """
+        Records one frontier push and updates the high-water mark.
+
+        Args:
+        - frontier_size (int): The size of the frontier after the push.
+        """
+
+        self.pushes += 1
+        if frontier_size > self.queue_high_water:
+            self.queue_high_water = frontier_size
+
+    def record_pop(self):
+        """
+        Records one frontier pop.
+        """
+
+        self.pops += 1
+
+    def record_stale(self):
+        """
+        Records one popped entry that was skipped as stale.
+        """
+
+        self.stale_skips += 1
+
+    def record_neighbors(self, count: int):
+        """
+        Records the number of neighbor candidates examined for one expanded cell (see
+        `neighbor_checks` for what counts as a candidate).
+
+        Args:
+        - count (int): The number of neighbors examined.
+        """
+
+        self.neighbor_checks += count
+
+    def begin_phase(self, name: str):
+        """
+        Starts timing a phase, closing the phase that is currently running (if any).
+
+        Args:
+        - name (str): The phase name, e.g. 'setup', 'search' or 'reconstruct'.
+        """
+
+        now = time.perf_counter()
+        self._close_phase(now)
+        self._phase = name
+        self._phase_start = now
+
+    def end_phase(self):
+        """
+        Stops timing the phase that is currently running.
+        """
+
+        self._close_phase(time.perf_counter())
+        self._phase = None
+
+    def _close_phase(self, now: float):
+        """
+        Adds the time elapsed in the running phase to its total.
+
+        Args:
+        - now (float): The current `time.perf_counter()` reading.
+        """
+
+        if self._phase is not None:
+            self.phase_times[self._phase] = self.phase_times.get(self._phase, 0.0) + now - self._phase_start
+
+    def as_dict(self):
+        """
+        Returns the collected counters and timings as a plain dictionary.
+
+        Returns:
+        - dict: Counter names mapped to their values, with 'phase_times' holding a copy of the phase timings.
+        """
+
+        return {"pushes": self.pushes,
+                "pops": self.pops,
+                "stale_skips": self.stale_skips,
+                "neighbor_checks": self.neighbor_checks,
+                "queue_high_water": self.queue_high_water,
+                "phase_times": dict(self.phase_times)}
+
+    def __repr__(self):
+        return f"SearchStats({self.as_dict()})"
+
+
+class NullStats(SearchStats):
+    """
+    A collector whose hooks do nothing. Solvers read `enabled` once during setup and skip the
+    per-event hooks entirely when it is False, so a disabled collector only costs one local
+    boolean test per event.
+    """
+
+    enabled = False
+
+    def record_push(self, frontier_size: int):
+        pass
+
+    def record_pop(self):
+        pass
+
+    def record_stale(self):
+        pass
+
+    def record_neighbors(self, count: int):
+        pass
+
+    def begin_phase(self, name: str):
+        pass
+
+    def end_phase(self):
+        pass
+
+
+# Shared no-op collector used by the solvers when no `stats` argument is given
+NULL_STATS = NullStats()
+
+
+class SamplingProfiler:
+    """
+    A low-overhead statistical profiler that samples the call stack of one thread at a fixed interval.
+
+    Attributes:
+    - interval (float): Seconds between two samples.
+    - samples (int): The number of samples taken.
+    - self_counts (Counter): How often each function was the innermost frame of a sample.
+    - total_counts (Counter): How often each function appeared anywhere on the sampled stack.
+    """
+
+    def __init__(self, interval: float = 0.001):
+        """
+        Initializes the profiler.
+
+        Args:
+        - interval (float): Seconds between two samples.
+        """
+
+        self.interval = interval
+        self.samples = 0
+        self.self_counts = Counter()
+        self.total_counts = Counter()
+        self._target_id = None
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """
+        Starts sampling the calling thread from a background thread.
+        """
+
+        self._target_id = threading.get_ident()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops sampling and waits for the background thread to finish.
+        """
+
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        """
+        The sampling loop executed by the background thread.
+        """
+
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self._target_id)
+            if frame is None:
+                continue
+            self.samples += 1
+
+            # The innermost frame gets the "self" sample, every function on the stack a "total" sample
+            self.self_counts[self._frame_key(frame)] += 1
+            seen = set()
+            while frame is not None:
+                key = self._frame_key(frame)
+                if key not in seen:
+                    seen.add(key)
+                    self.total_counts[key] += 1
+                frame = frame.f_back
+
+    @staticmethod
+    def _frame_key(frame):
+        code = frame.f_code
+        return f"{code.co_filename}:{code.co_firstlineno}({code.co_name})"
+
+    def report(self, limit: int = 25):
+        """
+        Formats the hottest functions as a text table.
+
+        Args:
+        - limit (int): The number of functions to list.
+
+        Returns:
+        - str: One line per function with its self and total sample share.
+        """
+
+        lines = [f"{self.samples} samples every {self.interval * 1000:.2f} ms",
+                 f"{'self %':>8} {'total %':>8}  function"]
+        total = max(self.samples, 1)
+        for key, count in self.self_counts.most_common(limit):
+            lines.append(f"{100 * count / total:8.1f} {100 * self.total_counts[key] / total:8.1f}  {key}")
+        return "\n".join(lines)
+
+
+def profile_solve(solver, *args, profiler: str = "cprofile", limit: int = 25, interval: float = 0.001, **kwargs):
+    """
+    Runs a single solve under a profiler and returns the solver result together with a text report.
+
+    Args:
+    - solver (callable): The solver function, e.g. `solve_maze_A_star`.
+    - *args: Positional arguments forwarded to the solver.
+    - profiler (str): 'cprofile' for deterministic profiling or 'sampling' for the statistical profiler.
+    - limit (int): The number of functions listed in the report.
+    - interval (float): Sampling interval in seconds (only used by the sampling profiler).
+    - **kwargs: Keyword arguments forwarded to the solver.
+
+    Returns:
+    - result: Whatever the solver returned.
+    - report (str): The profiler report.
+    """
+
+    if profiler == "cprofile":
+        # Imported here so that solvers importing this module do not pay for the profiler modules
+        import io
+        import cProfile
+        import pstats
+
+        prof = cProfile.Profile()
+        result = prof.runcall(solver, *args, **kwargs)
+        out = io.StringIO()
+        pstats.Stats(prof, stream=out).sort_stats("cumulative").print_stats(limit)
+        return result, out.getvalue()
+
+    if profiler == "sampling":
+        prof = SamplingProfiler(interval)
+        prof.start()
+        try:
+            result = solver(*args, **kwargs)
+        finally:
+            prof.stop()
+        return result, prof.report(limit)
+
+    raise ValueError(f"Unknown profiler: {profiler!r} (expected 'cprofile' or 'sampling')")
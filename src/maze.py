@@ -0,0 +1,530 @@
+from random import Random
+
+# Wall bits of a packed cell
+TOP, RIGHT, BOTTOM, LEFT = 1, 2, 4, 8
+ALL_WALLS = TOP | RIGHT | BOTTOM | LEFT
+
+# The wall on the other side of each wall, and the Cell.walls key of each wall bit
+OPPOSITE = {TOP: BOTTOM, RIGHT: LEFT, BOTTOM: TOP, LEFT: RIGHT}
+WALL_NAMES = {TOP: "top", RIGHT: "right", BOTTOM: "bottom", LEFT: "left"}
+
+class Maze:
+    """
+    A compact maze representation for grids far larger than the pygame window. Each cell is one
+    byte of wall bits in a row-major `bytearray` (index = x + y * cols), so a 10^7-cell maze takes
+    10 MB instead of the ~1 KB per `Cell` object of the visual grid.
+
+    Walls are always stored on both sides, exactly like `utils.remove_walls` does for `Cell`
+    objects, and the outer border is never opened, so neighbor lookups need no bounds checks.
+
+    Wall changes made through `remove_wall`, `add_wall` and `toggle_wall` are reported to every
+    listener registered with `add_listener`, and weight changes made through `set_weight` and
+    `randomize_weights` to every listener registered with `add_weight_listener`, which lets
+    incremental solvers repair their state instead of searching again from scratch.
+
+    Attributes:
+    - cols (int): The number of columns.
+    - rows (int): The number of rows.
+    - walls (bytearray): The wall bits (TOP, RIGHT, BOTTOM, LEFT) of every cell.
+    - weights (bytearray or None): The traversal cost (1-255) paid when stepping into each cell,
+      or None if every step costs 1.
+    """
+
+    def __init__(self, cols: int, rows: int, weights=None):
+        """
+        Initializes a maze with every wall standing.
+
+        Args:
+        - cols (int): The number of columns.
+        - rows (int): The number of rows.
+        - weights (bytes-like or None): Optional per-cell traversal costs, one byte per cell.
+        """
+
+        self.cols, self.rows = cols, rows
+        self.walls = bytearray([ALL_WALLS]) * (cols * rows)
+        self.weights = None
+        if weights is not None:
+            if len(weights) != cols * rows:
+                raise ValueError(f"Expected {cols * rows} weights, got {len(weights)}")
+            if 0 in weights:
+                raise ValueError("Cell weights must be between 1 and 255")
+            self.weights = bytearray(weights)
+
+        # Callbacks notified of wall changes and of weight changes
+        self._listeners = []
+        self._weight_listeners = []
+
+    def __len__(self):
+        return self.cols * self.rows
+
+    def index(self, x: int, y: int):
+        """
+        Returns the index of the cell at the given grid coordinates.
+        """
+
+        return x + y * self.cols
+
+    def coords(self, index: int):
+        """
+        Returns the (x, y) grid coordinates of the cell at the given index.
+        """
+
+        return index % self.cols, index // self.cols
+
+    def neighbor(self, index: int, wall: int):
+        """
+        Returns the index of the cell on the other side of a wall, or -1 at the border of the maze.
+
+        Args:
+        - index (int): The index of the cell.
+        - wall (int): One of TOP, RIGHT, BOTTOM or LEFT.
+        """
+
+        x, y = index % self.cols, index // self.cols
+        if wall == TOP:
+            return index - self.cols if y > 0 else -1
+        if wall == RIGHT:
+            return index + 1 if x < self.cols - 1 else -1
+        if wall == BOTTOM:
+            return index + self.cols if y < self.rows - 1 else -1
+        return index - 1 if x > 0 else -1
+
+    def _wall_between(self, a: int, b: int):
+        """
+        Returns the wall bit of cell `a` that separates it from the adjacent cell `b`.
+        """
+
+        if b == a - self.cols:
+            return TOP
+        if b == a + self.cols:
+            return BOTTOM
+        if b == a + 1 and b % self.cols != 0:
+            return RIGHT
+        if b == a - 1 and a % self.cols != 0:
+            return LEFT
+        raise ValueError(f"Cells {a} and {b} are not adjacent")
+
+    def open_neighbors(self, index: int):
+        """
+        Returns the indices of the adjacent cells that are not separated from the cell by a wall.
+        """
+
+        w = self.walls[index]
+        neighbors = []
+        if not w & TOP:
+            neighbors.append(index - self.cols)
+        if not w & RIGHT:
+            neighbors.append(index + 1)
+        if not w & BOTTOM:
+            neighbors.append(index + self.cols)
+        if not w & LEFT:
+            neighbors.append(index - 1)
+        return neighbors
+
+    def is_open(self, a: int, b: int):
+        """
+        Returns True if the adjacent cells `a` and `b` are not separated by a wall.
+        """
+
+        return not self.walls[a] & self._wall_between(a, b)
+
+    def remove_wall(self, a: int, b: int):
+        """
+        Removes the wall between two adjacent cells (on both sides).
+        """
+
+        wall = self._wall_between(a, b)
+        self.walls[a] &= ~wall
+        self.walls[b] &= ~OPPOSITE[wall]
+        if self._listeners:
+            self._notify(a, b, True)
+
+    def add_wall(self, a: int, b: int):
+        """
+        Puts back the wall between two adjacent cells (on both sides).
+        """
+
+        wall = self._wall_between(a, b)
+        self.walls[a] |= wall
+        self.walls[b] |= OPPOSITE[wall]
+        if self._listeners:
+            self._notify(a, b, False)
+
+    def toggle_wall(self, a: int, b: int):
+        """
+        Opens the wall between two adjacent cells if it stands, or puts it back if it is open.
+
+        Returns:
+        - bool: True if the cells are connected after the toggle.
+        """
+
+        if self.is_open(a, b):
+            self.add_wall(a, b)
+            return False
+        self.remove_wall(a, b)
+        return True
+
+    def add_listener(self, callback):
+        """
+        Registers a callback that is called as `callback(a, b, is_open)` after every wall change
+        between the adjacent cells `a` and `b`.
+        """
+
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        """
+        Unregisters a callback added with `add_listener`.
+        """
+
+        self._listeners.remove(callback)
+
+    def _notify(self, a: int, b: int, is_open: bool):
+        """
+        Reports a wall change to every registered listener.
+        """
+
+        for callback in self._listeners:
+            callback(a, b, is_open)
+
+    def add_weight_listener(self, callback):
+        """
+        Registers a callback that is called as `callback(index, old_weight, weight)` after the cost of
+        stepping into the cell `index` changed.
+        """
+
+        self._weight_listeners.append(callback)
+
+    def remove_weight_listener(self, callback):
+        """
+        Unregisters a callback added with `add_weight_listener`.
+        """
+
+        self._weight_listeners.remove(callback)
+
+    def _notify_weight(self, index: int, old_weight: int, weight: int):
+        """
+        Reports a weight change to every registered weight listener.
+        """
+
+        for callback in self._weight_listeners:
+            callback(index, old_weight, weight)
+
+    def weight(self, index: int):
+        """
+        Returns the cost of stepping into the cell at the given index.
+        """
+
+        return 1 if self.weights is None else self.weights[index]
+
+    def set_weight(self, index: int, weight: int):
+        """
+        Sets the cost of stepping into a cell, switching the maze to weighted mode if needed.
+
+        Args:
+        - index (int): The index of the cell.
+        - weight (int): The traversal cost, between 1 and 255.
+        """
+
+        if not 1 <= weight <= 255:
+            raise ValueError("Cell weights must be between 1 and 255")
+        old_weight = self.weight(index)
+        if self.weights is None:
+            self.weights = bytearray([1]) * len(self)
+        self.weights[index] = weight
+        if self._weight_listeners and weight != old_weight:
+            self._notify_weight(index, old_weight, weight)
+
+    def randomize_weights(self, max_weight: int, seed=None):
+        """
+        Assigns every cell a random traversal cost between 1 and `max_weight`.
+
+        Args:
+        - max_weight (int): The largest cost, at most 255.
+        - seed: Optional seed for reproducible weights.
+        """
+
+        if not 1 <= max_weight <= 255:
+            raise ValueError("Cell weights must be between 1 and 255")
+        rng = Random(seed)
+        old_weights = self.weights
+        self.weights = bytearray(rng.randint(1, max_weight) for _ in range(len(self)))
+
+        # Report every cell whose cost changed
+        if self._weight_listeners:
+            for index, weight in enumerate(self.weights):
+                old_weight = 1 if old_weights is None else old_weights[index]
+                if weight != old_weight:
+                    self._notify_weight(index, old_weight, weight)
+
+    def min_weight(self):
+        """
+        Returns the smallest traversal cost in the maze, which keeps weighted heuristics admissible.
+        """
+
+        return 1 if self.weights is None else min(self.weights)
+
+    def max_weight(self):
+        """
+        Returns the largest traversal cost in the maze.
+        """
+
+        return 1 if self.weights is None else max(self.weights)
+
+    def cost_typecode(self, max_weight: int = 255):
+        """
+        Returns the array type code for per-cell path costs: 'i' (4 bytes) when a path through every
+        cell costs less than 2^31, else 'q' (8 bytes).
+
+        Args:
+        - max_weight (int): The largest cost of one step; the largest possible weight by default, and
+          1 for unweighted mazes or searches that ignore weights.
+        """
+
+        if self.weights is None:
+            max_weight = 1
+        return 'i' if len(self) * max_weight < 2 ** 31 else 'q'
+
+    def path_cost(self, path: list[int]):
+        """
+        Returns the total cost of a path given as a list of cell indices (the start cell is free).
+        """
+
+        if self.weights is None:
+            return len(path) - 1
+        return sum(self.weights[i] for i in path[1:])
+
+    def content_hash(self):
+        """
+        Returns a digest of the size, walls and weights of the maze. Mazes with equal hashes have the
+        same cells, so solver results can be shared between them. The packed arrays are hashed in
+        one pass at memory speed (about 1 ms per 10^6 cells), so the hash is recomputed on every call
+        rather than tracked through wall changes.
+
+        Returns:
+        - digest (str): 32 hex characters.
+        """
+
+        # Imported here to keep hashlib off the import path of the headless solvers
+        import hashlib
+
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(b"%d,%d,%d;" % (self.cols, self.rows, self.weights is not None))
+        digest.update(self.walls)
+        if self.weights is not None:
+            digest.update(self.weights)
+        return digest.hexdigest()
+
+    def walls_view(self):
+        """
+        Returns a zero-copy (rows, cols) memoryview of the wall bytes. `numpy.asarray` wraps it
+        without copying, and writes through it change the maze without notifying listeners.
+        """
+
+        return memoryview(self.walls).cast("B", (self.rows, self.cols))
+
+    def weights_view(self):
+        """
+        Returns a zero-copy (rows, cols) memoryview of the weight bytes, or None for an unweighted maze.
+        """
+
+        if self.weights is None:
+            return None
+        return memoryview(self.weights).cast("B", (self.rows, self.cols))
+
+    @classmethod
+    def from_bytes(cls, cols: int, rows: int, walls, weights=None):
+        """
+        Creates a maze from raw wall bytes (and optional weight bytes), e.g. received from another process.
+
+        Args:
+        - cols (int): The number of columns.
+        - rows (int): The number of rows.
+        - walls (bytes-like): One byte of wall bits per cell.
+        - weights (bytes-like or None): Optional per-cell traversal costs.
+
+        Returns:
+        - Maze: The maze, holding its own copy of the data.
+        """
+
+        if len(walls) != cols * rows:
+            raise ValueError(f"Expected {cols * rows} wall bytes, got {len(walls)}")
+        maze = cls(cols, rows, weights)
+        maze.walls[:] = walls
+        return maze
+
+    @classmethod
+    def from_cells(cls, grid_cells, cols: int, rows: int):
+        """
+        Packs the walls and weights of a list of `Cell` objects into a new maze.
+
+        Args:
+        - grid_cells (List[Cell]): The cells of the visual grid, in row-major order.
+        - cols (int): The number of columns of the grid.
+        - rows (int): The number of rows of the grid.
+
+        Returns:
+        - Maze: The packed maze.
+        """
+
+        maze = cls(cols, rows)
+        for i, cell in enumerate(grid_cells):
+            bits = 0
+            for wall, name in WALL_NAMES.items():
+                if cell.walls[name]:
+                    bits |= wall
+            maze.walls[i] = bits
+        if any(cell.weight != 1 for cell in grid_cells):
+            maze.weights = bytearray(cell.weight for cell in grid_cells)
+        return maze
+
+    def apply_to_cells(self, grid_cells):
+        """
+        Copies the walls and weights of the maze onto a list of `Cell` objects so the maze can be drawn.
+
+        Args:
+        - grid_cells (List[Cell]): The cells of the visual grid, in row-major order.
+        """
+
+        for i, cell in enumerate(grid_cells):
+            bits = self.walls[i]
+            cell.walls = {name: bool(bits & wall) for wall, name in WALL_NAMES.items()}
+            cell.weight = self.weight(i)
+            cell.generated = True
+
+
+def generate_packed_maze(cols: int, rows: int, seed=None, start: int = 0):
+    """
+    Generate a perfect maze with the recursive backtracking algorithm, like `utils.generate_maze`,
+    but directly on a packed `Maze` and without drawing. When the C backend of `accel.py` is built,
+    the carving runs there on the same random draws, so the maze is the same either way.
+
+    Args:
+    - cols (int): The number of columns.
+    - rows (int): The number of rows.
+    - seed: Optional seed for a reproducible maze.
+    - start (int): The index of the cell the carving starts from.
+
+    Returns:
+    - maze (Maze): The generated maze.
+    """
+
+    import accel
+
+    maze = Maze(cols, rows)
+    rng = Random(seed)
+
+    # The compiled backend, when built, carves the same maze from the same random draws
+    if accel.generate(maze, rng, start):
+        return maze
+
+    walls = maze.walls
+    generated = bytearray(cols * rows)
+    generated[start] = 1
+    stack = [start]
+
+    while stack:
+        current = stack[-1]
+        x, y = current % cols, current // cols
+
+        # Collect the neighbors that have not been generated yet, with the wall towards each of them
+        options = []
+        if y > 0 and not generated[current - cols]:
+            options.append((current - cols, TOP))
+        if x < cols - 1 and not generated[current + 1]:
+            options.append((current + 1, RIGHT))
+        if y < rows - 1 and not generated[current + cols]:
+            options.append((current + cols, BOTTOM))
+        if x > 0 and not generated[current - 1]:
+            options.append((current - 1, LEFT))
+
+        if options:
+            # Carve into a random neighbor and continue from there
+            next_cell, wall = options[rng.randrange(len(options))]
+            walls[current] &= ~wall
+            walls[next_cell] &= ~OPPOSITE[wall]
+            generated[next_cell] = 1
+            stack.append(next_cell)
+        else:
+            # Dead end: backtrack
+            stack.pop()
+
+    return maze
+
+def reconstruct_packed_path(parent, start: int, goal: int):
+    """
+    Reconstruct the path from the start cell to the goal cell using a parent array of cell indices.
+
+    Args:
+    - parent (Sequence[int]): The index of the cell each visited cell was reached from.
+    - start (int): The index of the start cell.
+    - goal (int): The index of the goal cell.
+
+    Returns:
+    - path (List[int]): The cell indices from start to goal.
+    """
+
+    path = [goal]
+    while path[-1] != start:
+        path.append(parent[path[-1]])
+    path.reverse()
+    return path
+
+def braid_maze(maze: Maze, fraction: float, seed=None):
+    """
+    Turn a perfect maze into a braided one by knocking down one wall of a fraction of its dead ends,
+    which adds loops so that several routes lead to the destination. The maze is modified in place
+    in a single linear pass over the packed walls.
+
+    Each dead end is opened with probability `fraction`. Walls leading into another dead end are
+    preferred, because removing them clears two dead ends at once; a dead end that was already
+    opened by an earlier cell of the pass is skipped.
+
+    Args:
+    - maze (Maze): The packed maze to braid.
+    - fraction (float): The share of dead ends to remove, between 0 (perfect maze) and 1 (no dead ends).
+    - seed: Optional seed for a reproducible result.
+
+    Returns:
+    - removed (int): The number of walls removed.
+    """
+
+    if not 0 <= fraction <= 1:
+        raise ValueError("fraction must be between 0 and 1")
+
+    rng = Random(seed)
+    cols, rows = maze.cols, maze.rows
+    walls = maze.walls
+    notify = bool(maze._listeners)
+
+    # Wall bytes of a dead end: every wall but one is standing
+    dead_ends = {ALL_WALLS & ~wall for wall in OPPOSITE}
+    removed = 0
+
+    for i in range(cols * rows):
+        w = walls[i]
+        if w not in dead_ends or rng.random() >= fraction:
+            continue
+        x, y = i % cols, i // cols
+
+        # Standing inner walls, split by whether the cell behind them is a dead end too
+        candidates, preferred = [], []
+        for wall, offset, inside in ((TOP, -cols, y > 0), (RIGHT, 1, x < cols - 1),
+                                     (BOTTOM, cols, y < rows - 1), (LEFT, -1, x > 0)):
+            if inside and w & wall:
+                candidates.append((i + offset, wall))
+                if walls[i + offset] in dead_ends:
+                    preferred.append((i + offset, wall))
+        options = preferred or candidates
+        if not options:
+            continue
+
+        # Knock the chosen wall down on both sides
+        j, wall = options[rng.randrange(len(options))]
+        walls[i] &= ~wall
+        walls[j] &= ~OPPOSITE[wall]
+        removed += 1
+        if notify:
+            maze._notify(i, j, True)
+
+    return removed
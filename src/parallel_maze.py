@@ -0,0 +1,183 @@
+import math
+import argparse
+import time
+from random import Random
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from maze import Maze, TOP, RIGHT, BOTTOM, LEFT, ALL_WALLS
+
+# Regions per worker: several per worker evens out the load when some regions carve slower
+REGIONS_PER_WORKER = 4
+
+def _carve_region(walls, cols: int, x0: int, y0: int, x1: int, y1: int, seed: int):
+    """
+    Carves a perfect maze inside one rectangular region with the recursive backtracking algorithm
+    of `generate_packed_maze`. Only walls between two cells of the region are opened, so regions can
+    be carved concurrently into the same wall array.
+
+    Args:
+    - walls (bytearray or memoryview): The wall bytes of the whole maze.
+    - cols (int): The number of columns of the whole maze.
+    - x0, y0, x1, y1 (int): The bounds of the region, with x1 and y1 exclusive.
+    - seed (int): The seed of the region.
+    """
+
+    rng = Random(seed)
+    width, height = x1 - x0, y1 - y0
+    origin = x0 + y0 * cols
+
+    # The backtracker works on region-local indices; `generated` only covers the region
+    generated = bytearray(width * height)
+    generated[0] = 1
+    stack = [0]
+
+    while stack:
+        current = stack[-1]
+        x, y = current % width, current // width
+
+        # Collect the neighbors that have not been generated yet, with the wall towards each of them
+        options = []
+        if y > 0 and not generated[current - width]:
+            options.append((current - width, TOP, BOTTOM))
+        if x < width - 1 and not generated[current + 1]:
+            options.append((current + 1, RIGHT, LEFT))
+        if y < height - 1 and not generated[current + width]:
+            options.append((current + width, BOTTOM, TOP))
+        if x > 0 and not generated[current - 1]:
+            options.append((current - 1, LEFT, RIGHT))
+
+        if options:
+            # Carve into a random neighbor and continue from there
+            next_cell, wall, opposite = options[rng.randrange(len(options))]
+            a = origin + x + y * cols
+            b = origin + next_cell % width + next_cell // width * cols
+            walls[a] &= ~wall
+            walls[b] &= ~opposite
+            generated[next_cell] = 1
+            stack.append(next_cell)
+        else:
+            # Dead end: backtrack
+            stack.pop()
+
+
+def _carve_job(name: str, cols: int, region):
+    """
+    Carves one region into the shared wall array in a worker process.
+    """
+
+    memory = shared_memory.SharedMemory(name=name)
+    try:
+        _carve_region(memory.buf, cols, *region)
+    finally:
+        memory.close()
+
+
+def _regions(cols: int, rows: int, workers: int):
+    """
+    Cuts the maze into a grid of about `REGIONS_PER_WORKER * workers` rectangular regions.
+
+    Returns:
+    - region_cols (int): The number of regions per row.
+    - region_rows (int): The number of regions per column.
+    - bounds (List[Tuple[int, int, int, int]]): The (x0, y0, x1, y1) bounds of every region, row by row.
+    """
+
+    side = math.ceil(math.sqrt(REGIONS_PER_WORKER * workers))
+    region_cols, region_rows = min(side, cols), min(side, rows)
+    xs = [cols * i // region_cols for i in range(region_cols + 1)]
+    ys = [rows * j // region_rows for j in range(region_rows + 1)]
+    bounds = [(xs[i], ys[j], xs[i + 1], ys[j + 1]) for j in range(region_rows) for i in range(region_cols)]
+    return region_cols, region_rows, bounds
+
+
+def generate_parallel_maze(cols: int, rows: int, seed=None, workers: int = 1):
+    """
+    Generate a perfect maze on several cores. The maze is cut into rectangular regions that worker
+    processes carve independently, each with its own seed, straight into a shared-memory wall array.
+    Every region is then a spanning tree of its own cells, and a randomized Kruskal pass over the
+    region grid picks a spanning tree of regions; opening one random wall along the border of each
+    picked pair of regions joins the region trees into a single spanning tree, i.e. a perfect maze.
+
+    The region grid and all seeds are derived from `seed` and `workers`, so the output is the same
+    for the same pair no matter how the regions are scheduled.
+
+    Args:
+    - cols (int): The number of columns.
+    - rows (int): The number of rows.
+    - seed: Optional seed for a reproducible maze.
+    - workers (int): The number of worker processes; 1 carves the regions in this process.
+
+    Returns:
+    - maze (Maze): The generated maze.
+    """
+
+    rng = Random(seed)
+    region_cols, region_rows, bounds = _regions(cols, rows, workers)
+    jobs = [region + (rng.getrandbits(64),) for region in bounds]
+    n = cols * rows
+
+    if workers <= 1:
+        walls = bytearray([ALL_WALLS]) * n
+        for job in jobs:
+            _carve_region(walls, cols, *job)
+    else:
+        memory = shared_memory.SharedMemory(create=True, size=n)
+        try:
+            memory.buf[:n] = bytearray([ALL_WALLS]) * n
+            with ProcessPoolExecutor(workers) as pool:
+                # Collect the results so errors in the workers are raised here
+                list(pool.map(_carve_job, [memory.name] * len(jobs), [cols] * len(jobs), jobs))
+            walls = bytearray(memory.buf[:n])
+        finally:
+            memory.close()
+            memory.unlink()
+
+    # Randomized Kruskal over the region grid: every accepted border becomes one opening
+    borders = []
+    for j in range(region_rows):
+        for i in range(region_cols):
+            region = i + j * region_cols
+            if i < region_cols - 1:
+                borders.append((region, region + 1, RIGHT))
+            if j < region_rows - 1:
+                borders.append((region, region + region_cols, BOTTOM))
+    rng.shuffle(borders)
+
+    parent = list(range(len(bounds)))
+    def find(region):
+        while parent[region] != region:
+            parent[region] = parent[parent[region]]
+            region = parent[region]
+        return region
+
+    for a, b, side in borders:
+        ra, rb = find(a), find(b)
+        if ra == rb:
+            continue
+        parent[rb] = ra
+        ax0, ay0, ax1, ay1 = bounds[a]
+        if side == RIGHT:
+            # Vertical border: open a random cell of the right edge of `a` towards `b`
+            cell = ax1 - 1 + rng.randrange(ay0, ay1) * cols
+            walls[cell] &= ~RIGHT
+            walls[cell + 1] &= ~LEFT
+        else:
+            # Horizontal border: open a random cell of the bottom edge of `a` towards `b`
+            cell = rng.randrange(ax0, ax1) + (ay1 - 1) * cols
+            walls[cell] &= ~BOTTOM
+            walls[cell + cols] &= ~TOP
+
+    return Maze.from_bytes(cols, rows, walls)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a large maze on several cores.")
+    parser.add_argument("--cols", type=int, default=2000)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    began = time.perf_counter()
+    maze = generate_parallel_maze(args.cols, args.rows, args.seed, args.workers)
+    print(f"{len(maze)} cells with {args.workers} worker(s) in {time.perf_counter() - began:.2f} s")
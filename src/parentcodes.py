@@ -0,0 +1,184 @@
+from array import array
+from maze import TOP, RIGHT, BOTTOM, LEFT
+
+# Direction codes, in the order of the `directions` tuples of the solvers: the code of a cell names
+# the side its parent lies on
+CODE_TOP, CODE_RIGHT, CODE_BOTTOM, CODE_LEFT = 0, 1, 2, 3
+
+def parent_moves(cols: int):
+    """
+    Returns the (wall, offset, code) triple of each step of a search on a grid with `cols` columns:
+    the wall crossed, the offset of the cell behind it and the code that cell stores for its parent
+    (stepping through TOP leaves the parent below the new cell, and so on).
+    """
+
+    return ((TOP, -cols, CODE_BOTTOM), (RIGHT, 1, CODE_LEFT), (BOTTOM, cols, CODE_TOP), (LEFT, -1, CODE_RIGHT))
+
+
+class ParentCodes:
+    """
+    Parent bookkeeping for searches on grids too large for a parent array. A cell's parent is always
+    one of its four neighbors, so it is stored as a 2-bit direction code, four cells per byte, next to
+    a bitmap of the cells reached so far. Together they take 3 bits per cell, e.g. 37.5 MB for a
+    10^8-cell maze, where an array of indices takes 800 MB and a dictionary over 100 bytes per cell.
+
+    The code of cell i sits in bits 2 * (i % 4) and up of `codes[i // 4]`: CODE_TOP, CODE_RIGHT,
+    CODE_BOTTOM or CODE_LEFT for a parent at i - cols, i + 1, i + cols or i - 1. Cell i is reached
+    when bit i % 8 of `reached_bits[i // 8]` is set; the codes of unreached cells are meaningless.
+
+    Codes are only written once per cell, when the cell is first reached, which fits Breadth-First
+    Search. Searches that improve a cell's parent later (A*, Dijkstra) clear the old code first, with
+    `set` or the last line below. Both bytearrays are public so hot loops can inline the bit
+    operations, with shift = (cell & 3) << 1:
+
+        reached_bits[cell >> 3] & (1 << (cell & 7))
+        codes[cell >> 2] |= code << ((cell & 3) << 1)
+        codes[cell >> 2] = codes[cell >> 2] & ~(3 << shift) | code << shift
+
+    The roots of a search (its start, and the goal of a bidirectional search) are marked with
+    `reach` and have no parent.
+
+    Attributes:
+    - cols (int): The number of columns of the grid.
+    - size (int): The number of cells.
+    - codes (bytearray): The direction code of every cell, 2 bits each, lowest bits first.
+    - reached_bits (bytearray): One bit per cell, set once the cell has been reached.
+    """
+
+    def __init__(self, cols: int, size: int):
+        """
+        Creates the bookkeeping for a grid with no cell reached yet.
+
+        Args:
+        - cols (int): The number of columns of the grid.
+        - size (int): The number of cells of the grid.
+        """
+
+        self.cols = cols
+        self.size = size
+        self.codes = bytearray((size + 3) // 4)
+        self.reached_bits = bytearray((size + 7) // 8)
+
+        # Cells reached without a parent
+        self._roots = []
+
+        # Offset from a cell to its parent for every code
+        self._offsets = (-cols, 1, cols, -1)
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def nbytes(self):
+        """
+        The memory taken by the codes and the bitmap, in bytes.
+        """
+
+        return len(self.codes) + len(self.reached_bits)
+
+    def reach(self, cell: int):
+        """
+        Marks a cell as reached without a parent, e.g. the start of a search.
+        """
+
+        self.reached_bits[cell >> 3] |= 1 << (cell & 7)
+        self._roots.append(cell)
+
+    def reached(self, cell: int):
+        """
+        Returns True if the cell has been reached.
+        """
+
+        return bool(self.reached_bits[cell >> 3] & (1 << (cell & 7)))
+
+    def set(self, cell: int, code: int):
+        """
+        Marks a cell as reached and stores the direction of its parent, replacing any earlier one.
+
+        Args:
+        - cell (int): The index of the cell.
+        - code (int): CODE_TOP, CODE_RIGHT, CODE_BOTTOM or CODE_LEFT.
+        """
+
+        shift = (cell & 3) << 1
+        self.codes[cell >> 2] = self.codes[cell >> 2] & ~(3 << shift) | code << shift
+        self.reached_bits[cell >> 3] |= 1 << (cell & 7)
+
+    def code(self, cell: int):
+        """
+        Returns the direction code stored for a cell.
+        """
+
+        return self.codes[cell >> 2] >> ((cell & 3) << 1) & 3
+
+    def __getitem__(self, cell: int):
+        """
+        Returns the index of the parent of a cell, or -1 if the cell was not reached or is a root.
+        """
+
+        if not self.reached(cell) or cell in self._roots:
+            return -1
+        return cell + self._offsets[self.code(cell)]
+
+    def to_array(self):
+        """
+        Expands the codes into the parent indices a parent array would hold, -1 for cells that were
+        not reached and for roots. The expansion is vectorized with NumPy when it is installed and
+        falls back to a Python loop otherwise. The array takes 8 bytes per cell, so it is meant for
+        exporting a search, not for running one.
+
+        Returns:
+        - parent (array): The index of the parent of every cell, type code 'q'.
+        """
+
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+
+        parent = array('q')
+        if numpy is not None:
+            # Unpack the four codes of every byte and the eight reached bits of every byte
+            packed = numpy.frombuffer(self.codes, dtype=numpy.uint8)
+            codes = numpy.empty((len(packed), 4), dtype=numpy.uint8)
+            for slot in range(4):
+                codes[:, slot] = packed >> (slot << 1) & 3
+            reached = numpy.frombuffer(self.reached_bits, dtype=numpy.uint8)
+            reached = numpy.unpackbits(reached, bitorder="little")
+            cells = numpy.flatnonzero(reached[:self.size])
+            expanded = numpy.full(self.size, -1, dtype=numpy.int64)
+            expanded[cells] = cells + numpy.array(self._offsets, dtype=numpy.int64)[codes.reshape(-1)[cells]]
+            parent.frombytes(expanded.tobytes())
+        else:
+            parent.extend([-1] * self.size)
+            codes, reached, offsets = self.codes, self.reached_bits, self._offsets
+            for cell in range(self.size):
+                if reached[cell >> 3] & (1 << (cell & 7)):
+                    parent[cell] = cell + offsets[codes[cell >> 2] >> ((cell & 3) << 1) & 3]
+        for cell in self._roots:
+            parent[cell] = -1
+        return parent
+
+    def path(self, start: int, goal: int):
+        """
+        Reconstructs the path from the start cell to the goal cell by walking the codes back from the
+        goal. Only the path itself is materialized.
+
+        Args:
+        - start (int): The index of the start cell.
+        - goal (int): The index of the goal cell.
+
+        Returns:
+        - path (List[int]): The cell indices from start to goal else None if the goal was not reached.
+        """
+
+        if not self.reached(goal):
+            return None
+        codes, offsets = self.codes, self._offsets
+        path = [goal]
+        current = goal
+        while current != start:
+            current += offsets[codes[current >> 2] >> ((current & 3) << 1) & 3]
+            path.append(current)
+        path.reverse()
+        return path
@@ -0,0 +1,221 @@
+from __future__ import annotations
+import time
+import threading
+from array import array
+from config import *
+from maze import Maze
+from export import SearchResult
+from searchtrace import SearchTrace
+from replay import TraceView
+from headless import load_solver
+
+# pygame is only imported once a race is drawn
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import pygame
+
+# The algorithms of a race: (label, name in `headless.SOLVERS`)
+RACE_ALGORITHMS = (("BFS", "bfs"),
+                   ("DFS", "dfs"),
+                   ("BIDIRECTIONAL BFS", "bidirectional"),
+                   ("A STAR", "astar"),
+                   ("GBFS", "gbfs"))
+
+# Steps every lane shows per second unless told otherwise, and the frame rate of a race
+RACE_SPEED = 200
+RACE_FPS = 60
+
+# Longest frame time made up for in one update, so a stalled frame never triggers a burst of painting
+MAX_FRAME_MS = 50
+
+# Height of the text above each lane, in pixels
+LABEL_HEIGHT = 44
+
+class RaceLane:
+    """
+    One algorithm of a race. Its headless solver runs in a background thread against its own
+    `SearchResult`, and the lane's `TraceView` shares the arrays the solver appends to, so the view
+    shows the progress of the search while it is still running.
+
+    Attributes:
+    - label (str): The name shown above the lane.
+    - algorithm (str): The name of the solver in `headless.SOLVERS`.
+    - rect (pygame.Rect): The area of the screen given to the lane.
+    - trace (SearchTrace): The growing trace of the search.
+    - view (TraceView): The incremental renderer of the trace.
+    - done (bool): Whether the solver has finished.
+    - seconds (float): The CPU time of the solver thread, once done.
+    - visited (int): The visited cells count returned by the solver, once done.
+    """
+
+    def __init__(self, label: str, algorithm: str, maze: Maze, start: int, goal: int, rect: pygame.Rect):
+        self.label = label
+        self.algorithm = algorithm
+        self.rect = rect
+        self.result = SearchResult()
+        self.trace = SearchTrace(maze.cols, maze.rows, label, start, goal, self.result.order, self.result.frontier,
+                                 walls=bytes(maze.walls))
+        self.view = TraceView(self.trace, rect.width, rect.height - LABEL_HEIGHT)
+        self.done = False
+        self.seconds = None
+        self.visited = None
+
+        # Imported here rather than in the thread, so the first frames do not wait on the import lock
+        self._solver = load_solver(algorithm)
+
+        # Daemon thread: closing the window does not wait for a long search
+        self._thread = threading.Thread(target=self._run, args=(maze,), daemon=True)
+
+    def start(self):
+        """
+        Starts the solver in its background thread.
+        """
+
+        self._thread.start()
+
+    def _run(self, maze: Maze):
+        """
+        Runs the solver; only this thread writes to the result and the trace.
+        """
+
+        # Thread CPU time, so the other lanes running at the same time do not count against this one
+        began = time.thread_time()
+        path, visited_cells_count = self._solver(maze, self.trace.start, self.trace.goal, result=self.result)
+        self.seconds = time.thread_time() - began
+        self.visited = visited_cells_count
+        self.trace.path = array('l', path or ())
+        self.done = True
+
+
+class Race:
+    """
+    Runs several solvers on the same maze at once and draws each one in its own viewport. The solvers
+    compute in background threads; every frame the main loop calls `update`, which lets each lane
+    show a fixed number of new steps, and `draw`. The work per frame is therefore bounded by the
+    speed, not by the size of the maze, and the frame rate stays steady while the solvers run.
+
+    Attributes:
+    - lanes (List[RaceLane]): One lane per algorithm.
+    - speed (int): The steps every lane shows per second.
+    """
+
+    def __init__(self, maze: Maze, area: pygame.Rect, start: int = 0, goal: int = None, speed: int = RACE_SPEED,
+                 algorithms=RACE_ALGORITHMS):
+        """
+        Lays out the lanes in a grid inside `area` and starts every solver.
+
+        Args:
+        - maze (Maze): The packed maze to solve.
+        - area (pygame.Rect): The area of the screen given to the race.
+        - start (int): The index of the start cell.
+        - goal (int): The index of the destination cell (defaults to the last cell).
+        - speed (int): The steps every lane shows per second.
+        - algorithms (Sequence[Tuple[str, str]]): The (label, solver name) pairs to race.
+        """
+
+        import pygame
+
+        if goal is None:
+            goal = len(maze) - 1
+        self.speed = speed
+        self._pending = 0.0
+        self._font = pygame.font.SysFont(FONT, size=15, bold=True)
+
+        # Grid of lanes: as few rows as possible with lanes no wider than they are tall
+        columns = min(len(algorithms), 3)
+        rows = -(-len(algorithms) // columns)
+        width, height = area.width // columns, area.height // rows
+        self.lanes = []
+        for i, (label, algorithm) in enumerate(algorithms):
+            rect = pygame.Rect(area.x + i % columns * width, area.y + i // columns * height, width - 6, height - 6)
+            self.lanes.append(RaceLane(label, algorithm, maze, start, goal, rect))
+        for lane in self.lanes:
+            lane.start()
+
+    @property
+    def finished(self):
+        """
+        Whether every solver has finished and every lane shows its whole search.
+        """
+
+        return all(lane.done and lane.view.step == len(lane.trace) for lane in self.lanes)
+
+    def update(self, elapsed_ms: float):
+        """
+        Moves every lane forward by the steps due after `elapsed_ms` milliseconds, as far as its
+        solver has got.
+        """
+
+        self._pending += self.speed * min(elapsed_ms, MAX_FRAME_MS) / 1000
+        steps = int(self._pending)
+        self._pending -= steps
+        for lane in self.lanes:
+            lane.view.advance(steps)
+
+    def draw(self, sc: pygame.Surface):
+        """
+        Draws every lane with its label, progress and, once finished, its timing.
+        """
+
+        white = "#FFFFFF"
+        for lane in self.lanes:
+            x, y = lane.rect.topleft
+            sc.blit(self._font.render(lane.label, True, white), (x, y))
+            status = f"EXPLORED: {lane.view.step}"
+            if lane.done:
+                length = len(lane.trace.path)
+                status += f" / {lane.visited}   PATH: {length if length else '-'}   {lane.seconds * 1000:.1f} MS"
+            else:
+                status += "   RUNNING"
+            sc.blit(self._font.render(status, True, white), (x, y + 20))
+            lane.view.draw(sc, lane.rect.move(0, LABEL_HEIGHT).clip(lane.rect))
+
+
+if __name__ == "__main__":
+    import argparse
+    import pygame
+    from headless import build_maze
+    from utils import draw_text_of_running_alg
+
+    parser = argparse.ArgumentParser(description="Race the solvers against each other on one maze.")
+    parser.add_argument("--cols", type=int, default=cols)
+    parser.add_argument("--rows", type=int, default=rows)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--braid", type=float, default=BRAID_FRACTION, help="share of dead ends removed")
+    parser.add_argument("--speed", type=int, default=RACE_SPEED, help="steps every lane shows per second")
+    args = parser.parse_args()
+
+    pygame.display.init()
+    pygame.font.init()
+    sc = pygame.display.set_mode(RESOLUTION)
+    clock = pygame.time.Clock()
+    area = pygame.Rect(MAZE_OFFSET, 2, WIDTH - MAZE_OFFSET - 2, HEIGHT - 4)
+
+    maze = build_maze(args.cols, args.rows, args.seed, args.braid)
+    race = Race(maze, area, speed=args.speed)
+    elapsed_ms = 0
+
+    # Keys: up/down double or halve the speed, R races again on a new maze
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                exit()
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_UP:
+                    race.speed *= 2
+                elif event.key == pygame.K_DOWN:
+                    race.speed = max(1, race.speed // 2)
+                elif event.key == pygame.K_r:
+                    args.seed += 1
+                    maze = build_maze(args.cols, args.rows, args.seed, args.braid)
+                    race = Race(maze, area, speed=race.speed)
+
+        race.update(elapsed_ms)
+        sc.fill(pygame.Color(BACKGROUND_COLOR))
+        race.draw(sc)
+        draw_text_of_running_alg(sc, "RACE", FONT, 17, 20, 230, "#FFFFFF")
+        draw_text_of_running_alg(sc, f"SPEED: {race.speed} STEPS/S", FONT, 17, 20, 260, "#FFFFFF")
+        draw_text_of_running_alg(sc, f"FPS: {clock.get_fps():.0f}", FONT, 17, 20, 290, "#FFFFFF")
+
+        pygame.display.flip()
+        elapsed_ms = clock.tick(RACE_FPS)
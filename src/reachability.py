@@ -0,0 +1,155 @@
+from array import array
+from maze import Maze, TOP, RIGHT, BOTTOM, LEFT
+
+class ReachabilityIndex:
+    """
+    Connected-component index of a packed maze that answers "is the goal reachable at all?" without
+    searching, so solvers can give up on unreachable goals immediately instead of exhausting the
+    component of the start first.
+
+    Components are labeled once with a flood fill, which leaves every cell pointing straight at the
+    root of its component. The labels are then kept as a union-find forest: removing a wall merges
+    the two components in near-constant time. Adding a wall may split a component, which union-find
+    cannot undo, so the index is only marked stale and labeled again on the next query.
+
+    Attributes:
+    - maze (Maze): The maze being indexed.
+    - component_count (int): The number of connected components (refreshed by the next query after a
+      wall was added).
+    - rebuilds (int): The number of full labeling passes so far.
+    """
+
+    def __init__(self, maze: Maze):
+        """
+        Labels the components of the maze and subscribes the index to its wall changes.
+
+        Args:
+        - maze (Maze): The packed maze.
+        """
+
+        self.maze = maze
+        self.component_count = 0
+        self.rebuilds = 0
+        self._parent = None
+        self._size = None
+        self._stale = True
+        self.rebuild()
+        maze.add_listener(self._on_wall_change)
+
+    def close(self):
+        """
+        Unsubscribes the index from the wall changes of the maze.
+        """
+
+        self.maze.remove_listener(self._on_wall_change)
+
+    def rebuild(self):
+        """
+        Labels every connected component with a flood fill. Each cell's parent is set to the first cell
+        of its component, so every lookup right after a rebuild is a single array read.
+        """
+
+        maze = self.maze
+        n = len(maze)
+        cols = maze.cols
+        walls = maze.walls
+        directions = ((TOP, -cols), (RIGHT, 1), (BOTTOM, cols), (LEFT, -1))
+
+        # -1 marks cells not labeled yet; only roots carry a meaningful size
+        parent = array('l', [-1]) * n
+        size = array('l', [0]) * n
+        count = 0
+
+        for root in range(n):
+            if parent[root] != -1:
+                continue
+            count += 1
+            parent[root] = root
+            stack = [root]
+            members = 1
+            while stack:
+                u = stack.pop()
+                w = walls[u]
+                for wall, offset in directions:
+                    if w & wall:
+                        continue
+                    v = u + offset
+                    if parent[v] == -1:
+                        parent[v] = root
+                        stack.append(v)
+                        members += 1
+            size[root] = members
+
+        self._parent = parent
+        self._size = size
+        self.component_count = count
+        self.rebuilds += 1
+        self._stale = False
+
+    def _on_wall_change(self, a: int, b: int, is_open: bool):
+        """
+        Maze listener: an opened wall merges two components, a closed wall marks the index stale.
+        """
+
+        if self._stale:
+            return
+        if is_open:
+            self._union(a, b)
+        else:
+            self._stale = True
+
+    def _find(self, index: int):
+        """
+        Returns the root of the component of a cell, halving the path on the way up.
+        """
+
+        parent = self._parent
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    def _union(self, a: int, b: int):
+        """
+        Merges the components of two cells, attaching the smaller tree below the larger one.
+        """
+
+        ra, rb = self._find(a), self._find(b)
+        if ra == rb:
+            return
+        size = self._size
+        if size[ra] < size[rb]:
+            ra, rb = rb, ra
+        self._parent[rb] = ra
+        size[ra] += size[rb]
+        self.component_count -= 1
+
+    def component(self, index: int):
+        """
+        Returns an id of the component containing a cell; two cells are connected iff their ids match.
+        Ids are only stable until the next wall change.
+        """
+
+        if self._stale:
+            self.rebuild()
+        return self._find(index)
+
+    def component_size(self, index: int):
+        """
+        Returns the number of cells in the component containing a cell.
+        """
+
+        return self._size[self.component(index)]
+
+    def reachable(self, a: int, b: int):
+        """
+        Returns True if a path exists between two cells.
+
+        Args:
+        - a (int): The index of the first cell.
+        - b (int): The index of the second cell.
+        """
+
+        if self._stale:
+            self.rebuild()
+        return self._find(a) == self._find(b)
@@ -0,0 +1,582 @@
+import os
+import sys
+import time
+import heapq
+import argparse
+import tempfile
+import tracemalloc
+from random import Random
+from collections import deque
+from importlib import import_module
+from importlib.util import find_spec
+import accel
+import config
+from maze import Maze, RIGHT, LEFT, generate_packed_maze, braid_maze
+from parallel_maze import generate_parallel_maze
+from headless import load_solver
+
+# The size of the grid of the UI, the only size the drawing solvers run on
+UI_SIZE = (config.cols, config.rows)
+
+# Sizes of the matrix as (cols, rows): degenerate grids, then growing mazes
+SIZES = ((1, 1), (1, 9), (9, 1), (2, 2), (17, 13), UI_SIZE, (64, 48), (200, 150))
+QUICK_SIZES = ((1, 1), (1, 9), (9, 1), (2, 2), (17, 13), UI_SIZE, (64, 48))
+
+# Queries per maze: the corners plus random (start, goal) pairs drawn from the seed
+RANDOM_QUERIES = 4
+
+# Time budget of one query: a fixed allowance for tiny mazes plus a multiple of the baseline, a plain
+# BFS over the whole maze timed in the same run (see `baseline_seconds`), so the budgets follow the
+# speed of the machine. The multiples are about three times the largest ratio measured on the Python
+# backend, so a slower hot loop fails the check. Solvers without a multiple are not timed
+TIME_BASE_MS = 25
+TIME_FACTOR = {"default": 8, "dijkstra": 12, "astar": 15, "hpastar": 80, "dstarlite": 40, "tiled-bfs": 25,
+               "tiled-astar": 30, "batchbfs": 90, "idastar": 750, "iddfs": 1700}
+
+# Memory budget of one query (peak of Python allocations): a fixed allowance plus bytes per cell,
+# about two and a half times the largest peak measured; it covers the per-cell arrays of the solver
+# and the path. Solvers without a budget are not measured
+MEMORY_BASE_KB = 256
+MEMORY_BYTES_PER_CELL = {"default": 80, "bfs-compact": 32, "hpastar": 320, "batchbfs": 120}
+
+# The largest maze the iterative deepening solvers are checked on: they repeat their search once per
+# step of the path, and exhaust the whole component before giving up on an unreachable goal
+ITERATIVE_MAX_CELLS = 1000
+
+def _split_maze(maze: Maze):
+    """
+    Stands the walls back up along the middle column boundary, cutting the maze in two components.
+    """
+
+    x = maze.cols // 2
+    if x == 0:
+        return maze
+    for y in range(maze.rows):
+        a = maze.index(x - 1, y)
+        maze.walls[a] |= RIGHT
+        maze.walls[a + 1] |= LEFT
+    return maze
+
+
+def _braided(cols: int, rows: int, seed: int):
+    """
+    Generates a maze with half of its dead ends opened into loops.
+    """
+
+    maze = generate_packed_maze(cols, rows, seed)
+    braid_maze(maze, 0.5, seed)
+    return maze
+
+
+def _weighted(cols: int, rows: int, seed: int):
+    """
+    Generates a braided maze with random cell weights from 1 to 9.
+    """
+
+    maze = _braided(cols, rows, seed)
+    maze.randomize_weights(9, seed)
+    return maze
+
+
+# Generators of the matrix: name -> function(cols, rows, seed) returning a packed maze
+GENERATORS = {
+    "backtracker": lambda cols, rows, seed: generate_packed_maze(cols, rows, seed),
+    "parallel": lambda cols, rows, seed: generate_parallel_maze(cols, rows, seed, workers=1),
+    "braided": _braided,
+    "weighted": _weighted,
+    "split": lambda cols, rows, seed: _split_maze(_braided(cols, rows, seed)),
+}
+
+
+def _hpastar(maze: Maze, start: int, goal: int):
+    """
+    Answers one query with a fresh `HierarchicalPathfinder`, so its cluster tables are built too.
+    """
+
+    from search.hpastar import HierarchicalPathfinder
+
+    pathfinder = HierarchicalPathfinder(maze, cluster_size=8)
+    try:
+        return pathfinder.solve(start, goal)
+    finally:
+        pathfinder.close()
+
+
+def _dstarlite(maze: Maze, start: int, goal: int):
+    """
+    Answers one query with a fresh `DStarLite` planner.
+    """
+
+    from search.dstarlite import DStarLite
+
+    planner = DStarLite(maze, start, goal)
+    try:
+        return planner.plan()
+    finally:
+        planner.close()
+
+
+def _tiled(solver_name: str):
+    """
+    Wraps a tiled solver so it runs on a copy of the maze written to a temporary tile file.
+    """
+
+    def solve(maze: Maze, start: int, goal: int):
+        from tiles import write_tiled, TiledMaze
+        from search import tiled
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "maze.tiles")
+            write_tiled(maze, path, tile_size=16)
+            tiles = TiledMaze(path)
+            try:
+                return getattr(tiled, solver_name)(tiles, start, goal)
+            finally:
+                tiles.close()
+
+    return solve
+
+
+def _registered(name: str, **options):
+    """
+    Wraps a solver of `headless.SOLVERS`, imported on first use.
+    """
+
+    def solve(maze: Maze, start: int, goal: int):
+        return load_solver(name)(maze, start, goal, **options)
+
+    return solve
+
+
+def _iterative(name: str):
+    """
+    Wraps an iterative deepening solver of `headless.SOLVERS` with a transposition table as large as
+    the maze, which keeps the loops of braided mazes from making every iteration exponential.
+    """
+
+    def solve(maze: Maze, start: int, goal: int):
+        return load_solver(name)(maze, start, goal, transposition_size=len(maze))
+
+    return solve
+
+
+def _distance_field(maze: Maze, start: int, goal: int):
+    """
+    Answers one query by following the next hops of a `routing.distance_field` towards the goal.
+    """
+
+    from routing import distance_field
+
+    _, next_hop, visited_cells_count = distance_field(maze, goal, [start])
+    path = next_hop.path(goal, start)
+    if path is not None:
+        path.reverse()
+    return path, visited_cells_count
+
+
+def _batch_bfs(maze: Maze, start: int, goal: int):
+    """
+    Answers one query with a batch of one maze in `search.batchbfs`.
+    """
+
+    from search.batchbfs import stack_mazes, batch_bfs, batch_path
+
+    walls = stack_mazes([maze])
+    dist, _, explored = batch_bfs(walls, start, goal)
+    return batch_path(walls, dist, 0, goal), int(explored[0])
+
+
+# The screen the drawing solvers draw on, opened on first use
+_screen = None
+
+def _drawing(module_name: str, function_name: str):
+    """
+    Wraps a drawing solver of the UI so it answers a corner to corner query on a packed maze. The
+    solver runs on a grid of cells built from the maze and draws on a screen of SDL's dummy video
+    driver unless a display is already open; its animation delays are skipped.
+    """
+
+    def solve(maze: Maze, start: int, goal: int):
+        global _screen
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        import pygame
+        from cell import Cell
+
+        if _screen is None:
+            pygame.init()
+            _screen = pygame.display.get_surface() or pygame.display.set_mode(config.RESOLUTION)
+        grid_cells = [Cell(col, row) for row in range(maze.rows) for col in range(maze.cols)]
+        maze.apply_to_cells(grid_cells)
+        solver = getattr(import_module(module_name), function_name)
+        delay, pygame.time.delay = pygame.time.delay, lambda milliseconds: None
+        try:
+            path, visited_cells_count = solver(grid_cells, _screen)
+        finally:
+            pygame.time.delay = delay
+        return ([cell.x + cell.y * maze.cols for cell in path] if path is not None else None), visited_cells_count
+
+    return solve
+
+
+# Solvers of the matrix: name -> (function(maze, start, goal) returning (path, visited), guarantee).
+# "cheapest" paths must have the lowest total weight, "shortest" ones the fewest cells (the solver
+# ignores weights) and "any" path only has to be valid
+SOLVERS = {
+    "dijkstra": (_registered("dijkstra"), "cheapest"),
+    "astar": (_registered("astar"), "cheapest"),
+    "gbfs": (_registered("gbfs"), "any"),
+    "bfs": (_registered("bfs"), "shortest"),
+    "bfs-compact": (_registered("bfs-compact"), "shortest"),
+    "dfs": (_registered("dfs"), "any"),
+    "bidirectional": (_registered("bidirectional"), "shortest"),
+    "idastar": (_iterative("idastar"), "shortest"),
+    "iddfs": (_iterative("iddfs"), "shortest"),
+    "hpastar": (_hpastar, "cheapest"),
+    "dstarlite": (_dstarlite, "cheapest"),
+    "tiled-bfs": (_tiled("tiled_bfs_search"), "shortest"),
+    "tiled-astar": (_tiled("tiled_astar_search"), "cheapest"),
+    "distance-field": (_distance_field, "cheapest"),
+    "batchbfs": (_batch_bfs, "shortest"),
+    "draw-bfs": (_drawing("search.bfs", "solve_maze_BFS"), "shortest"),
+    "draw-dfs": (_drawing("search.dfs", "solve_maze_DFS"), "any"),
+    "draw-bidirectional": (_drawing("search.bidirectionalbfs", "solve_maze_bidirectional_BFS"), "shortest"),
+    "draw-astar": (_drawing("search.astar", "solve_maze_A_star"), "cheapest"),
+    "draw-gbfs": (_drawing("search.gbfs", "solve_maze_greedy_bfs"), "any"),
+    "draw-idastar": (_drawing("search.idastar", "solve_maze_IDA_star"), "shortest"),
+    "draw-iddfs": (_drawing("search.iddfs", "solve_maze_IDDFS"), "shortest"),
+}
+
+# Solvers with a compiled fast path, checked on every available backend
+ACCELERATED = ("astar", "bfs", "bfs-compact")
+
+# Solvers that only run on the UI grid, solvers limited to small mazes, and the optional packages
+# solvers need
+DRAWING = tuple(name for name in SOLVERS if name.startswith("draw-"))
+ITERATIVE = ("idastar", "iddfs")
+REQUIRES = {"batchbfs": "numpy", **{name: "pygame" for name in DRAWING}}
+
+def available_solvers():
+    """
+    Returns the names of the solvers of `SOLVERS` whose optional packages are installed.
+    """
+
+    return [name for name in SOLVERS if name not in REQUIRES or find_spec(REQUIRES[name]) is not None]
+
+
+def applies(solver_name: str, maze: Maze, start: int, goal: int):
+    """
+    Returns True if a solver is checked on a query: drawing solvers only answer corner to corner
+    queries on the UI grid, and iterative deepening solvers only run on small mazes.
+    """
+
+    if solver_name in DRAWING:
+        return (maze.cols, maze.rows) == UI_SIZE and (start, goal) == (0, len(maze) - 1)
+    if solver_name in ITERATIVE:
+        return len(maze) <= ITERATIVE_MAX_CELLS
+    return True
+
+
+def reference_distances(maze: Maze, start: int):
+    """
+    Computes the fewest steps and the lowest cost from the start to every cell with a plain BFS and
+    a plain heap-based Dijkstra over `Maze.open_neighbors`, sharing no code with the solvers.
+
+    Returns:
+    - steps (List[int]): The fewest steps to every cell, -1 where unreachable.
+    - costs (List[int]): The lowest cost to every cell (stepping into a cell costs its weight).
+    """
+
+    n = len(maze)
+    steps = _plain_bfs(maze, start)
+    if maze.weights is None:
+        return steps, steps
+    costs = [-1] * n
+    heap = [(0, start)]
+    while heap:
+        cost, current = heapq.heappop(heap)
+        if costs[current] >= 0:
+            continue
+        costs[current] = cost
+        for neighbor in maze.open_neighbors(current):
+            if costs[neighbor] < 0:
+                heapq.heappush(heap, (cost + maze.weights[neighbor], neighbor))
+    return steps, costs
+
+
+def _plain_bfs(maze: Maze, start: int):
+    """
+    Returns the fewest steps from the start to every cell, -1 where unreachable.
+    """
+
+    steps = [-1] * len(maze)
+    steps[start] = 0
+    queue = deque([start])
+    while queue:
+        current = queue.popleft()
+        for neighbor in maze.open_neighbors(current):
+            if steps[neighbor] < 0:
+                steps[neighbor] = steps[current] + 1
+                queue.append(neighbor)
+    return steps
+
+
+def baseline_seconds(maze: Maze, repeat: int = 3):
+    """
+    Times the baseline of the time budgets: the plain BFS of `reference_distances` run from the
+    first cell of every component until the whole maze is covered, the fastest of `repeat` runs.
+    Measured on every maze of the run, it scales the budgets with the speed of the machine at that
+    moment instead of comparing against fixed times.
+    """
+
+    best = float("inf")
+    for _ in range(repeat):
+        began = time.perf_counter()
+        seen = bytearray(len(maze))
+        for root in range(len(maze)):
+            if not seen[root]:
+                for cell, steps in enumerate(_plain_bfs(maze, root)):
+                    if steps >= 0:
+                        seen[cell] = 1
+        best = min(best, time.perf_counter() - began)
+    return best
+
+
+def path_problem(maze: Maze, path, start: int, goal: int):
+    """
+    Checks that a path runs from the start to the goal through open walls without visiting a cell
+    twice.
+
+    Returns:
+    - problem (str): A description of the first problem found, or None for a valid path.
+    """
+
+    if not path:
+        return "empty path"
+    if path[0] != start or path[-1] != goal:
+        return f"path runs from {path[0]} to {path[-1]} instead of {start} to {goal}"
+    if len(set(path)) != len(path):
+        return "path visits a cell twice"
+    for a, b in zip(path, path[1:]):
+        if not 0 <= b < len(maze):
+            return f"path leaves the maze at {b}"
+        try:
+            if not maze.is_open(a, b):
+                return f"path crosses the wall between {a} and {b}"
+        except ValueError:
+            return f"path jumps from {a} to {b}"
+    return None
+
+
+def _queries(maze: Maze, seed: int):
+    """
+    Returns the (start, goal) pairs checked on a maze: corner to corner, the reverse, a cell to
+    itself and random pairs.
+    """
+
+    n = len(maze)
+    rng = Random(seed)
+    queries = [(0, n - 1), (n - 1, 0), (n // 2, n // 2)]
+    queries.extend((rng.randrange(n), rng.randrange(n)) for _ in range(RANDOM_QUERIES))
+    return queries
+
+
+def _measure(solver, maze: Maze, start: int, goal: int, measure_memory: bool):
+    """
+    Runs one query, timed, and once more under tracemalloc when memory is measured.
+
+    Returns:
+    - output (Tuple): The (path, visited_cells_count) of the solver.
+    - seconds (float): The time of the untraced run.
+    - peak (int): The peak of Python allocations in bytes, or 0 when not measured.
+    """
+
+    began = time.perf_counter()
+    output = solver(maze, start, goal)
+    seconds = time.perf_counter() - began
+    peak = 0
+    if measure_memory:
+        tracemalloc.start()
+        try:
+            solver(maze, start, goal)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return output, seconds, peak
+
+
+def check_case(maze: Maze, solver_name: str, start: int, goal: int, reference, measure_memory: bool = True,
+               baseline: float = None):
+    """
+    Runs one solver on one query and checks its answer and its budgets.
+
+    Args:
+    - maze (Maze): The packed maze.
+    - solver_name (str): One of the keys of `SOLVERS`.
+    - start (int): The index of the start cell.
+    - goal (int): The index of the destination cell.
+    - reference (Tuple[List[int], List[int]]): The `reference_distances` from the start.
+    - measure_memory (bool): Run the query a second time under tracemalloc.
+    - baseline (float): The `baseline_seconds` of the maze (measured here when not given).
+
+    Returns:
+    - problems (List[str]): Everything wrong with the answer or the budgets, empty if nothing is.
+    - output (Tuple): The (path, visited_cells_count) of the solver.
+    - seconds (float): The time of the query.
+    - peak (int): The peak of Python allocations in bytes.
+    """
+
+    solver, guarantee = SOLVERS[solver_name]
+    memory_per_cell = MEMORY_BYTES_PER_CELL.get(solver_name, None if solver_name in DRAWING else MEMORY_BYTES_PER_CELL["default"])
+    output, seconds, peak = _measure(solver, maze, start, goal, measure_memory and memory_per_cell is not None)
+    path = output[0]
+    steps, costs = reference
+    problems = []
+
+    # Correctness: a valid path exactly when the goal is reachable, as short or cheap as promised
+    if steps[goal] < 0:
+        if path is not None:
+            problems.append("returned a path to an unreachable goal")
+    elif path is None:
+        problems.append("found no path to a reachable goal")
+    else:
+        problem = path_problem(maze, path, start, goal)
+        if problem is not None:
+            problems.append(problem)
+        elif guarantee == "shortest" and len(path) - 1 != steps[goal]:
+            problems.append(f"path has {len(path) - 1} steps, the shortest has {steps[goal]}")
+        elif guarantee == "cheapest" and maze.path_cost(path) != costs[goal]:
+            problems.append(f"path costs {maze.path_cost(path)}, the cheapest costs {costs[goal]}")
+
+    # Performance: time relative to the baseline of the maze, memory scaled by its size
+    factor = TIME_FACTOR.get(solver_name, None if solver_name in DRAWING else TIME_FACTOR["default"])
+    if factor is not None:
+        if baseline is None:
+            baseline = baseline_seconds(maze)
+        time_budget = TIME_BASE_MS / 1000 + factor * baseline
+        if seconds > time_budget:
+            problems.append(f"took {seconds * 1000:.1f} ms, budget {time_budget * 1000:.1f} ms "
+                            f"({factor} x {baseline * 1000:.1f} ms baseline)")
+    if memory_per_cell is not None:
+        memory_budget = MEMORY_BASE_KB * 1024 + memory_per_cell * len(maze)
+        if peak > memory_budget:
+            problems.append(f"allocated {peak / 1024:.0f} KB, budget {memory_budget / 1024:.0f} KB")
+    return problems, output, seconds, peak
+
+
+def describe_failure(row):
+    """
+    Formats a failing row of `run_matrix` as one line.
+    """
+
+    return (f"{row['solver']} ({row['backend']}) on {row['generator']} {row['cols']}x{row['rows']} "
+            f"seed {row['seed']}, {row['start']} -> {row['goal']}: {'; '.join(row['problems'])}")
+
+
+def run_matrix(generators=None, solvers=None, sizes=SIZES, seeds=(0, 1), backends=None, measure_memory: bool = True,
+               progress=None):
+    """
+    Checks every solver on every query of seeded mazes from every generator and size, as far as the
+    solver `applies`. Solvers with a compiled fast path run on every backend, and the backends must
+    agree on the path and the visited cell count.
+
+    Args:
+    - generators (Iterable[str]): Keys of `GENERATORS` (defaults to all).
+    - solvers (Iterable[str]): Keys of `SOLVERS` (defaults to the `available_solvers`).
+    - sizes (Iterable[Tuple[int, int]]): The (cols, rows) of the mazes.
+    - seeds (Iterable[int]): The seeds of the mazes and their random queries.
+    - backends (Iterable[str]): The backends of the accelerated solvers (defaults to "python" plus
+      "c" when it is built).
+    - measure_memory (bool): Check the memory budgets too (doubles the run time).
+    - progress (Callable): Optional callback called with a one-line summary after every maze.
+
+    Returns:
+    - results (List[Dict]): One row per checked query with "generator", "solver", "backend",
+      "cols", "rows", "seed", "start", "goal", "seconds", "baseline", "peak" and "problems".
+    """
+
+    generators = list(generators or GENERATORS)
+    solvers = list(solvers or available_solvers())
+    if backends is None:
+        backends = ["python", "c"] if accel.available() else ["python"]
+
+    results = []
+    previous = accel.set_backend("auto")
+    try:
+        # Warm up every solver and backend, so imports and library loading stay out of the timings
+        warm_up = generate_packed_maze(2, 2, 0)
+        for solver_name in solvers:
+            if not applies(solver_name, warm_up, 0, 3):
+                continue
+            for backend in (backends if solver_name in ACCELERATED else ["auto"]):
+                accel.set_backend(backend)
+                SOLVERS[solver_name][0](warm_up, 0, 3)
+
+        for generator in generators:
+            for cols, rows in sizes:
+                for seed in seeds:
+                    maze = GENERATORS[generator](cols, rows, seed)
+                    queries = _queries(maze, seed)
+                    references = {start: reference_distances(maze, start) for start, _ in queries}
+                    baseline = baseline_seconds(maze)
+                    failures = 0
+                    for solver_name in solvers:
+                        for backend in (backends if solver_name in ACCELERATED else ["auto"]):
+                            accel.set_backend(backend)
+                            for start, goal in queries:
+                                if not applies(solver_name, maze, start, goal):
+                                    continue
+                                problems, output, seconds, peak = check_case(maze, solver_name, start, goal,
+                                                                             references[start], measure_memory,
+                                                                             baseline)
+                                # The first backend is the reference of the others
+                                if backend != backends[0] and backend != "auto":
+                                    accel.set_backend(backends[0])
+                                    if SOLVERS[solver_name][0](maze, start, goal) != output:
+                                        problems.append(f"differs from the {backends[0]} backend")
+                                failures += bool(problems)
+                                results.append({"generator": generator, "solver": solver_name, "backend": backend,
+                                                "cols": cols, "rows": rows, "seed": seed, "start": start,
+                                                "goal": goal, "seconds": seconds, "baseline": baseline, "peak": peak,
+                                                "problems": problems})
+                    if progress is not None:
+                        progress(f"{generator:<12}{cols:>4}x{rows:<4} seed {seed}: "
+                                 f"{'ok' if not failures else f'{failures} failing queries'}")
+    finally:
+        accel.set_backend(previous)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check every solver for valid, optimal paths within time and memory budgets.")
+    parser.add_argument("--generators", nargs="+", choices=sorted(GENERATORS), help="defaults to all")
+    parser.add_argument("--solvers", nargs="+", choices=sorted(SOLVERS), help="defaults to all whose packages are installed")
+    parser.add_argument("--seeds", type=int, default=2, help="number of seeds per generator and size")
+    parser.add_argument("--quick", action="store_true", help="skip the largest size")
+    parser.add_argument("--no-memory", action="store_true", help="skip the memory budgets (twice as fast)")
+    parser.add_argument("--verbose", action="store_true", help="print a line per maze")
+    args = parser.parse_args()
+
+    began = time.perf_counter()
+    results = run_matrix(args.generators, args.solvers, QUICK_SIZES if args.quick else SIZES, range(args.seeds),
+                         measure_memory=not args.no_memory, progress=print if args.verbose else None)
+    failed = [row for row in results if row["problems"]]
+
+    # Typical and slowest time per cell, slowest time relative to the baseline and largest allocation
+    # per cell of every solver and backend, over the mazes large enough for the per-cell cost to
+    # outweigh the fixed one
+    print(f"{'solver':<20}{'backend':<9}{'queries':>8}{'failed':>8}{'us/cell':>9}{'max us/cell':>13}"
+          f"{'max x base':>12}{'max B/cell':>12}")
+    for solver_name in args.solvers or available_solvers():
+        for backend in sorted({row["backend"] for row in results if row["solver"] == solver_name}):
+            rows = [row for row in results if row["solver"] == solver_name and row["backend"] == backend]
+            large = [row for row in rows if row["cols"] * row["rows"] >= 400] or rows
+            us_per_cell = sorted(row["seconds"] * 1e6 / (row["cols"] * row["rows"]) for row in large)
+            ratio = max(row["seconds"] / row["baseline"] for row in large)
+            bytes_per_cell = max(row["peak"] / (row["cols"] * row["rows"]) for row in large)
+            print(f"{solver_name:<20}{backend:<9}{len(rows):>8}{sum(bool(row['problems']) for row in rows):>8}"
+                  f"{us_per_cell[len(us_per_cell) // 2]:>9.2f}{us_per_cell[-1]:>13.2f}{ratio:>12.1f}{bytes_per_cell:>12.1f}")
+
+    for row in failed:
+        print(f"FAIL {describe_failure(row)}")
+    print(f"{len(results)} queries, {len(failed)} failed, {time.perf_counter() - began:.1f} s")
+    sys.exit(1 if failed else 0)
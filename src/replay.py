@@ -0,0 +1,252 @@
+from __future__ import annotations
+from config import *
+from maze import TOP, RIGHT, BOTTOM, LEFT
+from searchtrace import SearchTrace
+
+# pygame is only imported once a view is created, so traces can be loaded without it
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import pygame
+
+# Fewest steps between two keyframes, and the most keyframes kept for one trace
+KEYFRAME_INTERVAL = 256
+MAX_KEYFRAMES = 64
+
+class TraceView:
+    """
+    Renders a recorded search step by step without running it again. Playing forward only paints the
+    cells settled since the last frame onto an off-screen surface, so a frame costs the same however
+    far the replay has got. Every `interval` steps a copy of the surface is kept as a keyframe; jumping
+    to any step restores the nearest keyframe before it and paints the few steps in between.
+
+    The trace may still be growing while it is shown, e.g. when it shares the arrays of a search
+    running in another thread; the view then simply stops at the last step recorded so far.
+
+    Attributes:
+    - trace (SearchTrace): The trace being replayed.
+    - step (int): The number of settled cells shown.
+    - cell_size (int): The side of a cell in pixels.
+    - interval (int): The number of steps between two keyframes.
+    - surface (pygame.Surface): The rendered maze at `step`.
+    """
+
+    def __init__(self, trace: SearchTrace, width: int, height: int):
+        """
+        Prepares the view and draws the walls of the maze.
+
+        Args:
+        - trace (SearchTrace): The trace to replay.
+        - width (int): The width in pixels available to the view.
+        - height (int): The height in pixels available to the view.
+        """
+
+        import pygame
+
+        self.trace = trace
+        self.cell_size = max(1, min(width // trace.cols, height // trace.rows))
+        self.interval = max(KEYFRAME_INTERVAL, -(-len(trace) // MAX_KEYFRAMES))
+
+        # Walls are only drawn when cells are large enough to show them; fills stay inside the walls
+        size = self.cell_size
+        self._line = max(1, size // 8) if trace.walls is not None and size >= 3 else 0
+        self._inset = (self._line + 1) // 2
+
+        base = pygame.Surface((trace.cols * size, trace.rows * size))
+        base.fill(pygame.Color(CELL_GENERATED_COLOR))
+        if self._line:
+            self._draw_walls(base)
+
+        # Keyframe k shows the maze after k * interval steps
+        self._keyframes = [base]
+        self.surface = base.copy()
+        self.step = 0
+        self._path_drawn = False
+
+    def _draw_walls(self, surface: pygame.Surface):
+        """
+        Draws the walls of every cell onto a surface.
+        """
+
+        import pygame
+
+        size, line, cols = self.cell_size, self._line, self.trace.cols
+        color = pygame.Color(WALL_COLOR)
+        for index, w in enumerate(self.trace.walls):
+            x, y = index % cols * size, index // cols * size
+            if w & TOP:
+                pygame.draw.line(surface, color, (x, y), (x + size, y), line)
+            if w & RIGHT:
+                pygame.draw.line(surface, color, (x + size, y), (x + size, y + size), line)
+            if w & BOTTOM:
+                pygame.draw.line(surface, color, (x, y + size), (x + size, y + size), line)
+            if w & LEFT:
+                pygame.draw.line(surface, color, (x, y), (x, y + size), line)
+
+    def _fill(self, cells, color: str):
+        """
+        Paints cells onto the current surface.
+        """
+
+        import pygame
+
+        size, inset, cols = self.cell_size, self._inset, self.trace.cols
+        color = pygame.Color(color)
+        fill = self.surface.fill
+        side = max(1, size - 2 * inset)
+        for index in cells:
+            fill(color, (index % cols * size + inset, index // cols * size + inset, side, side))
+
+    def __len__(self):
+        return len(self.trace)
+
+    @property
+    def frontier_size(self):
+        """
+        The frontier size when the last shown cell was settled.
+        """
+
+        frontier = self.trace.frontier
+        return frontier[self.step - 1] if 0 < self.step <= len(frontier) else 0
+
+    def advance(self, steps: int):
+        """
+        Shows `steps` more settled cells, and the path once the whole trace is shown.
+
+        Args:
+        - steps (int): The number of steps to move forward.
+        """
+
+        trace, interval = self.trace, self.interval
+        target = min(len(trace), self.step + steps)
+        while self.step < target:
+            # Paint up to the next keyframe boundary and keep a copy of the surface there
+            boundary = (self.step // interval + 1) * interval
+            end = min(target, boundary)
+            self._fill(trace.order[self.step:end], CELL_VISITED_COLOR)
+            self.step = end
+            if end == boundary and len(self._keyframes) == end // interval:
+                self._keyframes.append(self.surface.copy())
+                # A trace that is still growing can outrun the budget: keep every other keyframe
+                if len(self._keyframes) > MAX_KEYFRAMES:
+                    self._keyframes = self._keyframes[::2]
+                    self.interval = interval = interval * 2
+
+        # The path is only known once the search has finished
+        if self.step == len(trace) and trace.path and not self._path_drawn:
+            self._fill(trace.path, CELL_SOLUTION_COLOR)
+            self._path_drawn = True
+
+    def seek(self, step: int):
+        """
+        Shows the maze after `step` settled cells, from the nearest keyframe at or before it.
+
+        Args:
+        - step (int): The step to show, clamped to the length of the trace.
+        """
+
+        step = max(0, min(len(self.trace), step))
+        if step == self.step:
+            return
+        if self.step <= step <= self.step + self.interval and not self._path_drawn:
+            self.advance(step - self.step)
+            return
+        keyframe = min(step // self.interval, len(self._keyframes) - 1)
+        self.surface = self._keyframes[keyframe].copy()
+        self.step = keyframe * self.interval
+        self._path_drawn = False
+        self.advance(step - self.step)
+
+    def draw(self, sc: pygame.Surface, rect: pygame.Rect):
+        """
+        Draws the current state into a rectangle of the screen, scaled down if the maze does not fit,
+        with the start and destination cells marked.
+
+        Args:
+        - sc (pygame.Surface): The screen.
+        - rect (pygame.Rect): The area of the screen given to the view.
+        """
+
+        import pygame
+
+        surface = self.surface
+        scale = min(1.0, rect.width / surface.get_width(), rect.height / surface.get_height())
+        if scale < 1.0:
+            surface = pygame.transform.scale(surface, (int(surface.get_width() * scale), int(surface.get_height() * scale)))
+        sc.blit(surface, rect.topleft)
+
+        # Start and destination markers, drawn on the screen so they stay out of the keyframes
+        size = max(2, int(self.cell_size * scale))
+        cols = self.trace.cols
+        color = pygame.Color(START_END_CELL_COLOR)
+        for index in (self.trace.start, self.trace.goal):
+            x = rect.x + int(index % cols * self.cell_size * scale)
+            y = rect.y + int(index // cols * self.cell_size * scale)
+            pygame.draw.rect(sc, color, (x, y, size, size))
+
+
+if __name__ == "__main__":
+    import argparse
+    import pygame
+    from utils import draw_text_of_running_alg
+
+    parser = argparse.ArgumentParser(description="Replay a recorded search trace.")
+    parser.add_argument("trace", help="a trace file written by SearchTrace.save or headless.py --trace")
+    parser.add_argument("--speed", type=int, default=500, help="steps shown per second")
+    args = parser.parse_args()
+
+    trace = SearchTrace.load(args.trace)
+    pygame.display.init()
+    pygame.font.init()
+    sc = pygame.display.set_mode(RESOLUTION)
+    clock = pygame.time.Clock()
+
+    area = pygame.Rect(MAZE_OFFSET, 2, WIDTH - MAZE_OFFSET - 2, HEIGHT - 4)
+    view = TraceView(trace, area.width, area.height)
+    speed = args.speed
+    playing = True
+    pending = 0.0
+    jump = max(1, len(trace) // 100)
+    elapsed_ms = 0
+
+    # Keys: space plays or pauses, left/right jump by 1% of the trace, up/down double or halve the
+    # speed, home/end go to the first or last step and 0-9 jump to that tenth of the trace
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                exit()
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    playing = not playing
+                elif event.key == pygame.K_RIGHT:
+                    view.seek(view.step + jump)
+                elif event.key == pygame.K_LEFT:
+                    view.seek(view.step - jump)
+                elif event.key == pygame.K_UP:
+                    speed *= 2
+                elif event.key == pygame.K_DOWN:
+                    speed = max(1, speed // 2)
+                elif event.key == pygame.K_HOME:
+                    view.seek(0)
+                elif event.key == pygame.K_END:
+                    view.seek(len(trace))
+                elif pygame.K_0 <= event.key <= pygame.K_9:
+                    view.seek(len(trace) * (event.key - pygame.K_0) // 10)
+
+        # Move forward by the steps due since the last frame
+        if playing and view.step < len(trace):
+            pending += speed * elapsed_ms / 1000
+            steps = int(pending)
+            pending -= steps
+            view.advance(steps)
+
+        sc.fill(pygame.Color(BACKGROUND_COLOR))
+        view.draw(sc, area)
+        draw_text_of_running_alg(sc, "REPLAY: " + trace.algorithm.upper(), FONT, 17, 20, 230, "#FFFFFF")
+        draw_text_of_running_alg(sc, f"STEP: {view.step} / {len(trace)}", FONT, 17, 20, 260, "#FFFFFF")
+        draw_text_of_running_alg(sc, f"FRONTIER: {view.frontier_size}", FONT, 17, 20, 290, "#FFFFFF")
+        draw_text_of_running_alg(sc, f"SPEED: {speed} STEPS/S", FONT, 17, 20, 320, "#FFFFFF")
+        if view.step == len(trace):
+            draw_text_of_running_alg(sc, f"PATH: {len(trace.path)} CELLS", FONT, 17, 20, 350, "#FFFFFF")
+
+        pygame.display.flip()
+        elapsed_ms = clock.tick(60)
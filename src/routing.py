@@ -0,0 +1,307 @@
+import time
+import random
+import argparse
+from array import array
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from maze import Maze, generate_packed_maze, braid_maze
+from parentcodes import ParentCodes, parent_moves
+from search.dijkstra import dijkstra_search, multi_target_search
+from instrumentation import SearchStats, NULL_STATS
+from export import SearchResult
+
+def distance_field(maze: Maze, goal: int, starts=None, stats: SearchStats = None, result: SearchResult = None):
+    """
+    Computes the cost of reaching a goal from every cell with one reverse search rooted at the goal,
+    together with the next step to take from each cell. Any number of agents heading for the same
+    goal can then read their path off the field instead of searching themselves.
+
+    Unweighted mazes use a plain BFS; weighted mazes use the bucket queue of `dijkstra_search`.
+    Stepping into a cell costs its weight, so going from a cell to its next step costs the weight of
+    the next step. The next steps are the parents of the reverse search tree, kept as `ParentCodes`
+    rooted at the goal, so `next_hop.path(goal, cell)` reversed is the path from a cell to the goal.
+
+    Args:
+    - maze (Maze): The packed maze, optionally with cell weights.
+    - goal (int): The index of the goal cell the field points to.
+    - starts (Iterable[int]): Optional cells after whose settlement the search stops early; without
+      them the whole component of the goal is covered.
+    - stats (SearchStats): Optional collector for hot-path counters and phase timings.
+    - result (SearchResult): Optional object that receives the field and the visit order without copying.
+
+    Returns:
+    - dist (array): The cost from every cell to the goal, -1 for cells the search did not reach.
+    - next_hop (ParentCodes): The next cell on a cheapest path to the goal (`next_hop[cell]`), -1 for
+      the goal and unreached cells.
+    - visited_cells_count (int): The number of cells settled.
+    """
+
+    # Fall back to the no-op collector; hooks are skipped entirely when it is disabled
+    if stats is None:
+        stats = NULL_STATS
+    record = stats.enabled
+    stats.begin_phase("setup")
+
+    n = len(maze)
+    walls = maze.walls
+    weights = maze.weights
+
+    # Wall, neighbor offset and the code the neighbor stores for the current cell, its next step
+    moves = parent_moves(maze.cols)
+
+    dist = array(maze.cost_typecode(maze.max_weight()), [-1]) * n
+    next_hop = ParentCodes(maze.cols, n)
+    codes = next_hop.codes
+    reached = next_hop.reached_bits
+    dist[goal] = 0
+    next_hop.reach(goal)
+
+    # Hand the field to the caller; settled cells are appended to its visit order,
+    # together with the size of the frontier at that moment
+    order = None
+    frontier = None
+    if result is not None:
+        result.attach(maze, dist, next_hop)
+        order = result.order
+        frontier = result.frontier
+
+    # Cells still to be settled before the search may stop
+    remaining = set(starts) if starts is not None else None
+    if remaining is not None:
+        remaining.discard(goal)
+    visited_cells_count = 0
+
+    stats.begin_phase("search")
+    if weights is None:
+        # Unit costs: distances are final as soon as a cell is discovered
+        queue = deque([goal])
+        if record:
+            stats.record_push(len(queue))
+        while queue and (remaining is None or remaining):
+            current = queue.popleft()
+            if record:
+                stats.record_pop()
+            visited_cells_count += 1
+            if order is not None:
+                order.append(current)
+                frontier.append(len(queue))
+            d = dist[current] + 1
+            w = walls[current]
+            for wall, offset, code in moves:
+                if w & wall:
+                    continue
+                neighbor = current + offset
+                if record:
+                    stats.record_neighbors(1)
+                if dist[neighbor] != -1:
+                    continue
+                dist[neighbor] = d
+                codes[neighbor >> 2] |= code << ((neighbor & 3) << 1)
+                reached[neighbor >> 3] |= 1 << (neighbor & 7)
+                queue.append(neighbor)
+                if record:
+                    stats.record_push(len(queue))
+                if remaining is not None:
+                    remaining.discard(neighbor)
+    else:
+        # Weighted costs: circular bucket queue, entries of settled cells are stale
+        settled = bytearray(n)
+        width = maze.max_weight() + 1
+        buckets = [[] for _ in range(width)]
+        buckets[0].append(goal)
+        queued = 1
+        if record:
+            stats.record_push(queued)
+        d = 0
+        while queued and (remaining is None or remaining):
+            bucket = buckets[d % width]
+            while not bucket:
+                d += 1
+                bucket = buckets[d % width]
+            current = bucket.pop()
+            queued -= 1
+            if record:
+                stats.record_pop()
+            if settled[current]:
+                if record:
+                    stats.record_stale()
+                continue
+            settled[current] = 1
+            visited_cells_count += 1
+            if order is not None:
+                order.append(current)
+                frontier.append(queued)
+            if remaining is not None:
+                remaining.discard(current)
+
+            # Reaching `current` from a neighbor costs the weight of `current`
+            new_dist = d + weights[current]
+            w = walls[current]
+            for wall, offset, code in moves:
+                if w & wall:
+                    continue
+                neighbor = current + offset
+                if record:
+                    stats.record_neighbors(1)
+                if settled[neighbor]:
+                    continue
+                old = dist[neighbor]
+                if old == -1:
+                    # First discovery: the code slot is still empty
+                    codes[neighbor >> 2] |= code << ((neighbor & 3) << 1)
+                    reached[neighbor >> 3] |= 1 << (neighbor & 7)
+                elif new_dist < old:
+                    shift = (neighbor & 3) << 1
+                    codes[neighbor >> 2] = codes[neighbor >> 2] & ~(3 << shift) | code << shift
+                else:
+                    continue
+                dist[neighbor] = new_dist
+                buckets[new_dist % width].append(neighbor)
+                queued += 1
+                if record:
+                    stats.record_push(queued)
+
+    stats.end_phase()
+    return dist, next_hop, visited_cells_count
+
+
+def _route_group(maze: Maze, kind: str, root: int, queries):
+    """
+    Routes a group of agents that share a start or a goal with one search.
+
+    Args:
+    - maze (Maze): The packed maze.
+    - kind (str): "start" if the agents share their start cell `root`, "goal" if they share their goal.
+    - root (int): The shared cell.
+    - queries (List[Tuple[int, int]]): (agent id, other endpoint) pairs.
+
+    Returns:
+    - routes (List[Tuple[int, List[int]]]): (agent id, path or None) pairs.
+    - visited_cells_count (int): The number of cells settled by the shared search.
+    """
+
+    if kind == "start":
+        # One forward search tree from the shared start
+        paths, visited_cells_count = multi_target_search(maze, root, [goal for _, goal in queries])
+        return [(agent, paths[goal]) for agent, goal in queries], visited_cells_count
+
+    # One reverse distance field towards the shared goal; every agent follows its next hops
+    dist, next_hop, visited_cells_count = distance_field(maze, root, [start for _, start in queries])
+    routes = []
+    for agent, start in queries:
+        path = next_hop.path(root, start)
+        if path is not None:
+            path.reverse()
+        routes.append((agent, path))
+    return routes, visited_cells_count
+
+
+# The maze of a worker process, unpacked once by `_init_worker` instead of pickled with every group
+_worker_maze = None
+
+def _init_worker(cols: int, rows: int, walls: bytes, weights):
+    """
+    Process pool initializer: rebuilds the shared maze in the worker.
+    """
+
+    global _worker_maze
+    _worker_maze = Maze.from_bytes(cols, rows, walls, weights)
+
+
+def _worker_group(job):
+    """
+    Routes one group in a worker process (see `_route_group`).
+    """
+
+    kind, root, queries = job
+    return _route_group(_worker_maze, kind, root, queries)
+
+
+def route_agents(maze: Maze, agents, workers: int = 1):
+    """
+    Routes many agents, each with its own start and goal, through the same maze while sharing the
+    search work between them.
+
+    Agents are grouped by shared endpoint: each agent joins the group of its start or of its goal,
+    whichever more agents share. A start group is answered by one forward multi-target search, a
+    goal group by one reverse distance field that every agent of the group reads its path off, and
+    both stop as soon as all their agents are settled. Groups are independent, so with several
+    workers they are spread over a process pool that receives the maze only once per worker.
+
+    Args:
+    - maze (Maze): The packed maze, optionally with cell weights.
+    - agents (Sequence[Tuple[int, int]]): The (start, goal) cell indices of every agent.
+    - workers (int): The number of worker processes; 1 routes every group in this process.
+
+    Returns:
+    - paths (List[List[int]]): The cheapest path of every agent, in the order of `agents`, or None
+      where the goal is unreachable.
+    - visited_cells_count (int): The total number of cells settled by all shared searches.
+    """
+
+    # Assign every agent to the larger of its start and goal groups (ties favor the goal)
+    start_counts = Counter(start for start, _ in agents)
+    goal_counts = Counter(goal for _, goal in agents)
+    groups = {}
+    for agent, (start, goal) in enumerate(agents):
+        if start_counts[start] > goal_counts[goal]:
+            groups.setdefault(("start", start), []).append((agent, goal))
+        else:
+            groups.setdefault(("goal", goal), []).append((agent, start))
+
+    # Largest groups first, so the slowest searches do not end up last in the pool
+    jobs = sorted(((kind, root, queries) for (kind, root), queries in groups.items()),
+                  key=lambda job: len(job[2]), reverse=True)
+
+    paths = [None] * len(agents)
+    visited_cells_count = 0
+    if workers <= 1:
+        results = (_route_group(maze, kind, root, queries) for kind, root, queries in jobs)
+        for routes, settled in results:
+            visited_cells_count += settled
+            for agent, path in routes:
+                paths[agent] = path
+        return paths, visited_cells_count
+
+    weights = None if maze.weights is None else bytes(maze.weights)
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(maze.cols, maze.rows, bytes(maze.walls), weights)) as pool:
+        chunksize = max(1, len(jobs) // (workers * 8))
+        for routes, settled in pool.map(_worker_group, jobs, chunksize=chunksize):
+            visited_cells_count += settled
+            for agent, path in routes:
+                paths[agent] = path
+    return paths, visited_cells_count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure many-to-many routing throughput.")
+    parser.add_argument("--size", type=int, default=1000, help="side length of the square maze")
+    parser.add_argument("--agents", type=int, default=10000)
+    parser.add_argument("--goals", type=int, default=16, help="number of distinct goals the agents share")
+    parser.add_argument("--braid", type=float, default=0.1, help="share of dead ends removed")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--baseline", type=int, default=20,
+                        help="agents solved one by one with dijkstra_search to estimate the baseline")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    maze = generate_packed_maze(args.size, args.size, args.seed)
+    braid_maze(maze, args.braid, args.seed)
+    rng = random.Random(args.seed)
+    goals = [rng.randrange(len(maze)) for _ in range(args.goals)]
+    agents = [(rng.randrange(len(maze)), rng.choice(goals)) for _ in range(args.agents)]
+
+    began = time.perf_counter()
+    paths, visited_cells_count = route_agents(maze, agents, args.workers)
+    elapsed = time.perf_counter() - began
+    print(f"route_agents: {len(agents)} agents, {args.goals} goals, {len(maze)} cells, {args.workers} worker(s)")
+    print(f"  {elapsed:.2f} s, {len(agents) / elapsed:.0f} agents/s, {visited_cells_count} cells settled")
+
+    if args.baseline > 0:
+        began = time.perf_counter()
+        for start, goal in agents[:args.baseline]:
+            dijkstra_search(maze, start, goal)
+        per_agent = (time.perf_counter() - began) / args.baseline
+        print(f"dijkstra_search per agent: {per_agent * 1000:.1f} ms, "
+              f"{1 / per_agent:.0f} agents/s, ~{per_agent * len(agents):.0f} s for all agents")
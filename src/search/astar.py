@@ -1,115 +1,295 @@
-import pygame
-import heapq  # For priority queue functionality
-from config import *
-from typing import List
-from cell import Cell
-from utils import reconstruct_path, manhattan_distance, draw_text_of_running_alg, draw_button
-
-def solve_maze_A_star(grid_cells: List[Cell], sc: pygame.Surface):
-    """
-    Solve the maze using the A* algorithm, which combines features of both Dijkstra's 
-    algorithm and greedy best-first search. The function uses a priority queue to explore the 
-    grid cells and applies the Manhattan distance heuristic to guide the search towards the 
-    destination.
-
-    Args:
-    - grid_cells (List[Cell]): A list of all cells in the maze, each cell is an object with 
-      properties such as neighbors, coordinates, and methods for search and drawing.
-    - sc (pygame.Surface): The pygame screen surface used for drawing the maze and visualizing 
-      the search process.
-
-    Returns:
-    - path (List{Cell}): A list of cells representing the solution path from the start to the 
-      destination else None
-    - visited_cells_count (int): The total number of cells visited during the search.
-    """
-
-    # Define the start and destination cells
-    start_cell = grid_cells[0]
-    destination_cell = grid_cells[-1]
-
-    # Counter to track number of visited cells
-    visited_cells_count = 0
-
-    # Priority queue for the open set (stores cells to be evaluated) (holds tuples of (f_cost, id, cell))
-    open_set = []
-    heapq.heappush(open_set, (0, id(start_cell), start_cell))
-
-    # G cost: actual distance from start to current cell
-    g_cost = {cell: float('inf') for cell in grid_cells}
-    # Initialize g_cost for all cells as infinity
-    g_cost[start_cell] = 0  # G cost for the start cell is 0
-
-    # F cost: G cost + heuristic (estimated distance to goal)
-    f_cost = {cell: float('inf') for cell in grid_cells}
-    # Initialize f_cost for all cells as infinity
-    f_cost[start_cell] = manhattan_distance(start_cell, destination_cell)  
-    # F cost for the start cell is the heuristic to the destination
-
-    # Initialize visited set; parent dictionary for path reconstruction
-    parent = {}
-    parent[start_cell] = None
-    visited = set()
-
-    # Main loop for A* search
-    while open_set:
-        # Pop the cell with the lowest f_cost from the priority queue
-        _, _, current_cell = heapq.heappop(open_set)
-        # Mark the current cell as visited
-        current_cell.visited = True
-        visited_cells_count += 1
-
-        # If we reached the destination, reconstruct the path
-        if current_cell == destination_cell:
-            path = reconstruct_path(sc, parent, start_cell, destination_cell)
-            return path, visited_cells_count
-
-        # Redraw the entire maze on each iteration to keep all cells visible
-        for cell in grid_cells:
-            cell.draw(sc)
-
-        # Draw the visited cell
-        current_cell.draw(sc)
-
-        # Display the current state of the algorithm
-        draw_text_of_running_alg(sc, "RUNNING: A Star", FONT, 17, 20, 230, "#FFFFFF")
-        draw_text_of_running_alg(sc, "CELLS EXPLORED: " + str(visited_cells_count), FONT, 17, 20, 260, "#FFFFFF")
-
-        # Draw buttons
-        draw_button(sc, "GENERATE MAZE", 20, 300, BUTTON_COLOR)
-        draw_button(sc, "BFS", 20, 400, BUTTON_COLOR)
-        draw_button(sc, "DFS", 20, 350, BUTTON_COLOR)
-        draw_button(sc, "BIDIRECTIONAL BFS", 20, 450, BUTTON_COLOR)
-        draw_button(sc, "A STAR", 20, 500, BUTTON_COLOR)
-        draw_button(sc, "GBFS", 20, 550, BUTTON_COLOR)
-        
-        # Delay for visualization purposes
-        pygame.time.delay(60)
-        pygame.display.flip()
-
-        # Mark the current cell as visited
-        visited.add(current_cell)
-
-        # Explore neighbors of the current cell
-        neighbors = current_cell.check_neighbors_for_search(grid_cells)
-        for neighbor in neighbors:
-            # Skip visited cells
-            if neighbor in visited:
-                continue
-
-            # Tentative g_cost (distance to neighbor through current)
-            tentative_g_cost = g_cost[current_cell] + 1  # Distance between adjacent cells is 1
-            # If a shorter path is found
-            if tentative_g_cost < g_cost[neighbor]:
-                # Set the current cell as the parent of the neighbor
-                parent[neighbor] = current_cell
-                # Update g_cost for the neighbor
-                g_cost[neighbor] = tentative_g_cost
-                # Update f_cost with the new g_cost and heuristic (Manhattan distance)
-                f_cost[neighbor] = g_cost[neighbor] + manhattan_distance(neighbor, destination_cell)
-
-                # Add the neighbor to the open_set if it's not already there
-                if neighbor not in [item[2] for item in open_set]:
-                    heapq.heappush(open_set, (f_cost[neighbor], id(neighbor), neighbor))
-    
-    return None, visited_cells_count
+from __future__ import annotations
+import heapq  # For priority queue functionality
+from array import array
+from maze import Maze
+from instrumentation import SearchStats, NULL_STATS
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import pygame
+    from cell import Cell
+    from reachability import ReachabilityIndex
+    from export import SearchResult
+
+def solve_maze_A_star(grid_cells: list[Cell], sc: pygame.Surface, stats: SearchStats = None):
+    """
+    Solve the maze using the A* algorithm, which combines features of both Dijkstra's 
+    algorithm and greedy best-first search. The function uses a priority queue to explore the 
+    grid cells and applies the Manhattan distance heuristic to guide the search towards the 
+    destination. Stepping into a cell costs its `weight`; the heuristic is scaled by the smallest 
+    weight in the grid so it never overestimates the remaining cost.
+
+    Args:
+    - grid_cells (List[Cell]): A list of all cells in the maze, each cell is an object with 
+      properties such as neighbors, coordinates, and methods for search and drawing.
+    - sc (pygame.Surface): The pygame screen surface used for drawing the maze and visualizing 
+      the search process.
+    - stats (SearchStats): Optional collector for hot-path counters and phase timings.
+
+    Returns:
+    - path (List{Cell}): A list of cells representing the cheapest path from the start to the 
+      destination else None
+    - visited_cells_count (int): The total number of cells visited during the search.
+    """
+
+    import pygame
+    from utils import reconstruct_path, manhattan_distance, draw_text_of_running_alg, draw_button
+    from config import FONT, BUTTON_COLOR
+
+    # Fall back to the no-op collector; hooks are skipped entirely when it is disabled
+    if stats is None:
+        stats = NULL_STATS
+    record = stats.enabled
+    stats.begin_phase("setup")
+
+    # Define the start and destination cells
+    start_cell = grid_cells[0]
+    destination_cell = grid_cells[-1]
+
+    # Smallest step cost, used to keep the Manhattan heuristic admissible on weighted grids
+    min_weight = min(cell.weight for cell in grid_cells)
+
+    # Counter to track number of visited cells
+    visited_cells_count = 0
+
+    # Priority queue for the open set (stores cells to be evaluated) (holds tuples of (f_cost, id, cell))
+    open_set = []
+    heapq.heappush(open_set, (0, id(start_cell), start_cell))
+    if record:
+        stats.record_push(len(open_set))
+
+    # G cost: actual distance from start to current cell
+    g_cost = {cell: float('inf') for cell in grid_cells}
+    # Initialize g_cost for all cells as infinity
+    g_cost[start_cell] = 0  # G cost for the start cell is 0
+
+    # F cost: G cost + heuristic (estimated distance to goal)
+    f_cost = {cell: float('inf') for cell in grid_cells}
+    # Initialize f_cost for all cells as infinity
+    f_cost[start_cell] = manhattan_distance(start_cell, destination_cell) * min_weight
+    # F cost for the start cell is the heuristic to the destination
+
+    # Initialize visited set; parent dictionary for path reconstruction
+    parent = {}
+    parent[start_cell] = None
+    visited = set()
+
+    # Main loop for A* search
+    stats.begin_phase("search")
+    while open_set:
+        # Pop the cell with the lowest f_cost from the priority queue
+        _, _, current_cell = heapq.heappop(open_set)
+        if record:
+            stats.record_pop()
+
+        # Skip stale entries: the cell was already expanded through a cheaper entry
+        if current_cell in visited:
+            if record:
+                stats.record_stale()
+            continue
+
+        # Mark the current cell as visited
+        current_cell.visited = True
+        visited_cells_count += 1
+
+        # If we reached the destination, reconstruct the path
+        if current_cell == destination_cell:
+            stats.begin_phase("reconstruct")
+            path = reconstruct_path(sc, parent, start_cell, destination_cell)
+            stats.end_phase()
+            return path, visited_cells_count
+
+        # Redraw the entire maze on each iteration to keep all cells visible
+        for cell in grid_cells:
+            cell.draw(sc)
+
+        # Draw the visited cell
+        current_cell.draw(sc)
+
+        # Display the current state of the algorithm
+        draw_text_of_running_alg(sc, "RUNNING: A Star", FONT, 17, 20, 230, "#FFFFFF")
+        draw_text_of_running_alg(sc, "CELLS EXPLORED: " + str(visited_cells_count), FONT, 17, 20, 260, "#FFFFFF")
+
+        # Draw buttons
+        draw_button(sc, "GENERATE MAZE", 20, 300, BUTTON_COLOR)
+        draw_button(sc, "BFS", 20, 400, BUTTON_COLOR)
+        draw_button(sc, "DFS", 20, 350, BUTTON_COLOR)
+        draw_button(sc, "BIDIRECTIONAL BFS", 20, 450, BUTTON_COLOR)
+        draw_button(sc, "A STAR", 20, 500, BUTTON_COLOR)
+        draw_button(sc, "GBFS", 20, 550, BUTTON_COLOR)
+        
+        # Delay for visualization purposes
+        pygame.time.delay(60)
+        pygame.display.flip()
+
+        # Mark the current cell as visited
+        visited.add(current_cell)
+
+        # Explore neighbors of the current cell
+        neighbors = current_cell.check_neighbors_for_search(grid_cells)
+        if record:
+            stats.record_neighbors(len(neighbors))
+        for neighbor in neighbors:
+            # Skip visited cells
+            if neighbor in visited:
+                continue
+
+            # Tentative g_cost (distance to neighbor through current)
+            tentative_g_cost = g_cost[current_cell] + neighbor.weight  # Cost of stepping into the neighbor
+            # If a shorter path is found
+            if tentative_g_cost < g_cost[neighbor]:
+                # Set the current cell as the parent of the neighbor
+                parent[neighbor] = current_cell
+                # Update g_cost for the neighbor
+                g_cost[neighbor] = tentative_g_cost
+                # Update f_cost with the new g_cost and heuristic (Manhattan distance)
+                f_cost[neighbor] = g_cost[neighbor] + manhattan_distance(neighbor, destination_cell) * min_weight
+
+                # Push the improved entry; an older entry for the neighbor becomes stale and is skipped when popped
+                heapq.heappush(open_set, (f_cost[neighbor], id(neighbor), neighbor))
+                if record:
+                    stats.record_push(len(open_set))
+    
+    stats.end_phase()
+    return None, visited_cells_count
+
+def astar_search(maze: Maze, start: int = 0, goal: int = None, stats: SearchStats = None, reachability: ReachabilityIndex = None,
+                 result: SearchResult = None):
+    """
+    Solve a packed maze using the A* algorithm, without drawing. Stepping into a cell costs its
+    weight, and the Manhattan heuristic is scaled by the smallest weight in the maze so it stays
+    admissible. Heap entries are (f cost, h cost, index) tuples, so ties on f are broken towards
+    the cell closest to the goal. Without `stats` or `result`, the search runs in the C backend of
+    `accel.py` when it is built, with identical results.
+
+    Args:
+    - maze (Maze): The packed maze, optionally with cell weights.
+    - start (int): The index of the start cell.
+    - goal (int): The index of the destination cell (defaults to the last cell).
+    - stats (SearchStats): Optional collector for hot-path counters and phase timings.
+    - reachability (ReachabilityIndex): Optional component index used to reject unreachable goals
+      without searching.
+    - result (SearchResult): Optional object that receives the search arrays and the visit order
+      without copying.
+
+    Returns:
+    - path (List[int]): The cell indices of a cheapest path from start to goal else None
+    - visited_cells_count (int): The total number of cells expanded during the search.
+    """
+
+    # Fall back to the no-op collector; hooks are skipped entirely when it is disabled
+    if stats is None:
+        stats = NULL_STATS
+    record = stats.enabled
+    stats.begin_phase("setup")
+
+    n = len(maze)
+    if goal is None:
+        goal = n - 1
+
+    # Give up at once when the index puts the goal in another component
+    if reachability is not None and not reachability.reachable(start, goal):
+        stats.end_phase()
+        return None, 0
+
+    import accel
+    from parentcodes import ParentCodes, parent_moves
+
+    # Hand the whole search to the compiled backend when it is built and nothing is recorded
+    if result is None and not record and accel.backend() == "c":
+        parents = ParentCodes(maze.cols, n)
+        found, visited_cells_count = accel.astar(maze, start, goal, parents)
+        if found is not None:
+            stats.end_phase()
+            return (parents.path(start, goal) if found else None), visited_cells_count
+        # The backend failed part way through and may have left codes behind, so drop the table
+        # before the Python loop allocates its own
+        del parents
+
+    cols = maze.cols
+    walls = maze.walls
+    # Unweighted mazes step at cost 1 without a weights buffer
+    weights = maze.weights
+    min_weight = maze.min_weight()
+    goal_x, goal_y = goal % cols, goal // cols
+
+    # Wall, neighbor offset and the code the neighbor stores for the current cell
+    moves = parent_moves(cols)
+
+    # G cost (-1 means not reached yet) and parent codes. The heuristic is consistent, so a cell is
+    # expanded once, through the entry carrying its final g cost, and needs no closed array
+    g_cost = array(maze.cost_typecode(), [-1]) * n
+    parents = ParentCodes(cols, n)
+    codes = parents.codes
+    reached = parents.reached_bits
+
+    # Hand the search arrays to the caller; settled cells are appended to its visit order,
+    # together with the size of the frontier at that moment
+    order = None
+    frontier = None
+    if result is not None:
+        result.attach(maze, g_cost, parents)
+        order = result.order
+        frontier = result.frontier
+
+    g_cost[start] = 0
+    parents.reach(start)
+    h = (abs(start % cols - goal_x) + abs(start // cols - goal_y)) * min_weight
+    open_set = [(h, h, start)]
+    if record:
+        stats.record_push(len(open_set))
+
+    # Counter to track number of expanded cells
+    visited_cells_count = 0
+
+    # Main loop for A* search
+    stats.begin_phase("search")
+    found = False
+    while open_set:
+        f, h, current = heapq.heappop(open_set)
+        if record:
+            stats.record_pop()
+
+        # Skip stale entries: the cell was already expanded through a cheaper entry
+        g = f - h
+        if g != g_cost[current]:
+            if record:
+                stats.record_stale()
+            continue
+        visited_cells_count += 1
+        if order is not None:
+            order.append(current)
+            frontier.append(len(open_set))
+
+        # If we reached the destination, stop and reconstruct the path
+        if current == goal:
+            found = True
+            break
+
+        # Relax every open neighbor; expanded neighbors never get cheaper, so they fail the test
+        w = walls[current]
+        for wall, offset, code in moves:
+            if w & wall:
+                continue
+            neighbor = current + offset
+            if record:
+                stats.record_neighbors(1)
+            tentative_g_cost = g + (1 if weights is None else weights[neighbor])
+            if g_cost[neighbor] < 0 or tentative_g_cost < g_cost[neighbor]:
+                g_cost[neighbor] = tentative_g_cost
+                shift = (neighbor & 3) << 1
+                codes[neighbor >> 2] = codes[neighbor >> 2] & ~(3 << shift) | code << shift
+                reached[neighbor >> 3] |= 1 << (neighbor & 7)
+                h = (abs(neighbor % cols - goal_x) + abs(neighbor // cols - goal_y)) * min_weight
+                heapq.heappush(open_set, (tentative_g_cost + h, h, neighbor))
+                if record:
+                    stats.record_push(len(open_set))
+
+    if not found:
+        stats.end_phase()
+        return None, visited_cells_count
+
+    stats.begin_phase("reconstruct")
+    path = parents.path(start, goal)
+    stats.end_phase()
+    return path, visited_cells_count
@@ -0,0 +1,184 @@
+import time
+import argparse
+from maze import TOP, RIGHT, BOTTOM, LEFT, generate_packed_maze
+
+def _numpy():
+    """
+    Imports NumPy, which only the batched solver needs.
+    """
+
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("batch_bfs requires NumPy (pip install numpy)") from None
+    return numpy
+
+
+def stack_mazes(mazes):
+    """
+    Stacks packed mazes of the same size into one wall tensor.
+
+    Args:
+    - mazes (List[Maze]): The mazes, all with the same number of columns and rows.
+
+    Returns:
+    - walls (numpy.ndarray): A (K, rows, cols) uint8 array of wall bits, maze k in walls[k].
+    """
+
+    numpy = _numpy()
+    if not mazes:
+        raise ValueError("Expected at least one maze")
+    cols, rows = mazes[0].cols, mazes[0].rows
+    for maze in mazes:
+        if maze.cols != cols or maze.rows != rows:
+            raise ValueError(f"Expected {cols}x{rows} mazes, got {maze.cols}x{maze.rows}")
+    # One join copies every wall array; the bytearray keeps the tensor writable
+    walls = bytearray(b"".join(maze.walls for maze in mazes))
+    return numpy.frombuffer(walls, dtype=numpy.uint8).reshape(len(mazes), rows, cols)
+
+
+def batch_bfs(walls, starts=0, goals=None):
+    """
+    Solve K mazes of the same size at once with a Breadth-First Search that advances every maze by
+    one level per step. The frontiers of all mazes are kept together in one array of global cell
+    indices (maze * rows * cols + cell), so each level costs a handful of NumPy operations on the
+    frontier instead of a Python loop iteration per cell, and the per-maze interpreter overhead that
+    dominates small mazes is paid once per level for the whole batch. A maze stops expanding at the
+    level where its goal is reached, and the batch ends when every frontier is empty.
+
+    Mazes are laid out back to back, which relies on the packed-maze invariant that border walls are
+    never opened: no step can leave its maze.
+
+    Args:
+    - walls (numpy.ndarray): A (K, rows, cols) array of wall bits, e.g. from `stack_mazes`.
+    - starts (int or Sequence[int]): The start cell index, shared or one per maze.
+    - goals (int or Sequence[int]): The goal cell index, shared or one per maze (defaults to the
+      last cell).
+
+    Returns:
+    - dist (numpy.ndarray): A (K, rows, cols) int32 array of BFS distances from the start, -1 for
+      cells that were not reached.
+    - path_lengths (numpy.ndarray): The number of cells on a shortest path of every maze, -1 where
+      the goal is unreachable.
+    - explored (numpy.ndarray): The number of cells every maze reached, i.e. the cells no farther
+      from the start than the goal (a cell-by-cell BFS dequeues at most this many).
+    """
+
+    numpy = _numpy()
+    walls = numpy.asarray(walls, dtype=numpy.uint8)
+    count, rows, cols = walls.shape
+    n = rows * cols
+    flat = walls.reshape(-1)
+    if goals is None:
+        goals = n - 1
+
+    # Global indices of every start and goal cell
+    base = numpy.arange(count, dtype=numpy.int64) * n
+    start_cells = base + numpy.broadcast_to(numpy.asarray(starts, dtype=numpy.int64), (count,))
+    goal_cells = base + numpy.broadcast_to(numpy.asarray(goals, dtype=numpy.int64), (count,))
+
+    dist = numpy.full(count * n, -1, dtype=numpy.int32)
+    dist[start_cells] = 0
+    finished = start_cells == goal_cells
+    frontier = start_cells[~finished]
+
+    # Offsets of the neighbor behind each wall
+    directions = ((TOP, -cols), (RIGHT, 1), (BOTTOM, cols), (LEFT, -1))
+
+    # Main loop: expand the whole frontier of every unfinished maze by one level
+    level = 0
+    while frontier.size:
+        level += 1
+        w = flat[frontier]
+        reached = numpy.concatenate([frontier[(w & wall) == 0] + offset for wall, offset in directions])
+        reached = reached[dist[reached] < 0]
+
+        # Two frontier cells of a braided maze can reach the same cell; keep it once. Every candidate
+        # writes a distinct negative stamp into `dist` and the last writer of a cell claims it. This
+        # is linear, unlike sorting the level, and needs no scratch array next to `dist`
+        stamps = numpy.arange(-2, -2 - reached.size, -1, dtype=numpy.int32)
+        dist[reached] = stamps
+        reached = reached[dist[reached] == stamps]
+        dist[reached] = level
+
+        # Mazes whose goal was reached at this level stop expanding
+        done = dist[goal_cells] >= 0
+        if numpy.count_nonzero(done) > numpy.count_nonzero(finished):
+            finished = done
+            reached = reached[~finished[reached // n]]
+        frontier = reached
+
+    goal_dist = dist[goal_cells].astype(numpy.int64)
+    path_lengths = numpy.where(goal_dist >= 0, goal_dist + 1, -1)
+    explored = numpy.count_nonzero(dist.reshape(count, n) >= 0, axis=1)
+    return dist.reshape(count, rows, cols), path_lengths, explored
+
+
+def batch_path(walls, dist, k: int, goal: int = None):
+    """
+    Reconstructs a shortest path of one maze of a batch by walking the distances down from the goal.
+
+    Args:
+    - walls (numpy.ndarray): The (K, rows, cols) wall tensor passed to `batch_bfs`.
+    - dist (numpy.ndarray): The distances returned by `batch_bfs`.
+    - k (int): The index of the maze in the batch.
+    - goal (int): The goal cell index used for this maze (defaults to the last cell).
+
+    Returns:
+    - path (List[int]): The cell indices of a shortest path from start to goal else None
+    """
+
+    cols = walls.shape[2]
+    w = walls[k].reshape(-1).tolist()
+    d = dist[k].reshape(-1).tolist()
+    if goal is None:
+        goal = len(d) - 1
+    if d[goal] < 0:
+        return None
+    directions = ((TOP, -cols), (RIGHT, 1), (BOTTOM, cols), (LEFT, -1))
+
+    path = [goal]
+    current = goal
+    while d[current]:
+        for wall, offset in directions:
+            if not w[current] & wall and d[current + offset] == d[current] - 1:
+                current += offset
+                break
+        path.append(current)
+    path.reverse()
+    return path
+
+
+if __name__ == "__main__":
+    import accel
+    from search.bfs import bfs_search
+
+    parser = argparse.ArgumentParser(description="Compare batched BFS with solving small mazes one by one.")
+    parser.add_argument("--cols", type=int, default=24)
+    parser.add_argument("--rows", type=int, default=18)
+    parser.add_argument("--count", type=int, default=10000, help="number of mazes in the batch")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--backend", choices=accel.BACKENDS, default="python",
+                        help="backend of bfs_search, the one-by-one baseline")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement, the fastest is kept")
+    args = parser.parse_args()
+
+    accel.set_backend(args.backend)
+    mazes = [generate_packed_maze(args.cols, args.rows, args.seed + k) for k in range(args.count)]
+
+    batched = looped = float("inf")
+    for _ in range(args.repeat):
+        began = time.perf_counter()
+        walls = stack_mazes(mazes)
+        dist, path_lengths, explored = batch_bfs(walls)
+        batched = min(batched, time.perf_counter() - began)
+
+        began = time.perf_counter()
+        lengths = [len(bfs_search(maze)[0]) for maze in mazes]
+        looped = min(looped, time.perf_counter() - began)
+
+    if lengths != path_lengths.tolist():
+        raise SystemExit("Path lengths differ between the batched and the looped solver")
+    print(f"{args.count} mazes of {args.cols}x{args.rows}: batched {batched:.3f} s "
+          f"({args.count / batched:,.0f} mazes/s), bfs_search on the {accel.backend()} backend {looped:.3f} s "
+          f"({args.count / looped:,.0f} mazes/s), {looped / batched:.1f}x")
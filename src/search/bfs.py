@@ -1,88 +1,277 @@
-import pygame
-from config import *
-from typing import List
-from cell import Cell
-from utils import draw_text_of_running_alg, reconstruct_path, draw_button
-
-def solve_maze_BFS(grid_cells: List[Cell], sc: pygame.Surface):
-    """
-    Solve the maze using Breadth-First Search (BFS).
-
-    The function performs BFS to explore all possible paths from the starting cell (first element in 
-    grid_cells) to the destination cell (last element in grid_cells). It visualizes the search process
-    by updating the display (using pygame) as the search progresses, and once the destination is reached, 
-    the function reconstructs and returns the path from start to destination.
-
-    Args:
-    - grid_cells (List[Cell]): A list of all the cells in the maze, each cell is an object with properties
-      such as neighbors, visited status, and methods to check neighbors and draw itself.
-    - sc (pygame.Surface): The pygame screen surface used for drawing the maze and visualizing the search 
-      process.
-
-    Returns:
-    - path (List[Cell]): the path from the starting point of the maze to the destination cell else None
-    - visited_cells_count (int): The total number of cells visited during the search.
-    """
-    # Define the start and destination cells
-    start_cell = grid_cells[0]
-    destination_cell = grid_cells[-1]
-
-    # Initialize needed structures for BFS and path reconstucting
-    queue = []
-    visited = set()
-    parent = {}
-    queue.append(start_cell)
-    visited.add(start_cell)
-    parent[start_cell] = None
-
-    # Counter to track number of visited cells
-    visited_cells_count = 0
-
-    # Main BFS loop
-    while queue:
-        # Dequeue the first cell and mark it as visited
-        current_cell = queue.pop(0)
-        current_cell.visited = True
-        visited_cells_count += 1
-
-        # Delay for visualization purposes
-        pygame.time.delay(60) 
-        pygame.display.flip()
-
-        # Redraw the entire maze on each iteration to keep all cells visible
-        for cell in grid_cells:
-            cell.draw(sc)
-
-        # Display current state of the algorithm
-        draw_text_of_running_alg(sc, "RUNNING: BFS", FONT, 17, 20, 230, "#FFFFFF")
-        draw_text_of_running_alg(sc, "CELLS EXPLORED: " + str(visited_cells_count), FONT, 17, 20, 260, "#FFFFFF")
-
-        # Display buttons
-        draw_button(sc, "GENERATE MAZE", 20, 300, BUTTON_COLOR)
-        draw_button(sc, "BFS", 20, 400, BUTTON_COLOR)
-        draw_button(sc, "DFS", 20, 350, BUTTON_COLOR)
-        draw_button(sc, "BIDIRECTIONAL BFS", 20, 450, BUTTON_COLOR)
-        draw_button(sc, "A STAR", 20, 500, BUTTON_COLOR)
-        draw_button(sc, "GBFS", 20, 550, BUTTON_COLOR)
-
-        # Draw the visited cell
-        current_cell.draw(sc)
-
-        # Check if the current cell is the destination
-        if current_cell == destination_cell:
-            # If destination is reached, reconstruct and return the path
-            path = reconstruct_path(sc, parent, start_cell, destination_cell)
-            return path, visited_cells_count
-
-        # Check neighbors and expand the BFS search
-        neighbors = current_cell.check_neighbors_for_search(grid_cells)
-        for neighbor in neighbors:
-            if neighbor not in visited:
-                # Enqueue the neighbor for later exploration
-                queue.append(neighbor)
-                # Mark neighbor as visited
-                visited.add(neighbor)
-                # Set current cell as the parent of this neighbor
-                parent[neighbor] = current_cell 
-    
-    return None, visited_cells_count
+from __future__ import annotations
+from collections import deque
+from array import array
+from maze import Maze
+from instrumentation import SearchStats, NULL_STATS
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import pygame
+    from cell import Cell
+    from reachability import ReachabilityIndex
+    from export import SearchResult
+
+def solve_maze_BFS(grid_cells: list[Cell], sc: pygame.Surface, stats: SearchStats = None):
+    """
+    Solve the maze using Breadth-First Search (BFS).
+
+    The function performs BFS to explore all possible paths from the starting cell (first element in 
+    grid_cells) to the destination cell (last element in grid_cells). It visualizes the search process
+    by updating the display (using pygame) as the search progresses, and once the destination is reached, 
+    the function reconstructs and returns the path from start to destination.
+
+    Args:
+    - grid_cells (List[Cell]): A list of all the cells in the maze, each cell is an object with properties
+      such as neighbors, visited status, and methods to check neighbors and draw itself.
+    - sc (pygame.Surface): The pygame screen surface used for drawing the maze and visualizing the search 
+      process.
+    - stats (SearchStats): Optional collector for hot-path counters and phase timings.
+
+    Returns:
+    - path (List[Cell]): the path from the starting point of the maze to the destination cell else None
+    - visited_cells_count (int): The total number of cells visited during the search.
+    """
+
+    import pygame
+    from utils import draw_text_of_running_alg, reconstruct_path, draw_button
+    from config import FONT, BUTTON_COLOR
+
+    # Fall back to the no-op collector; hooks are skipped entirely when it is disabled
+    if stats is None:
+        stats = NULL_STATS
+    record = stats.enabled
+    stats.begin_phase("setup")
+
+    # Define the start and destination cells
+    start_cell = grid_cells[0]
+    destination_cell = grid_cells[-1]
+
+    # Initialize needed structures for BFS and path reconstucting
+    queue = []
+    visited = set()
+    parent = {}
+    queue.append(start_cell)
+    if record:
+        stats.record_push(len(queue))
+    visited.add(start_cell)
+    parent[start_cell] = None
+
+    # Counter to track number of visited cells
+    visited_cells_count = 0
+
+    # Main BFS loop
+    stats.begin_phase("search")
+    while queue:
+        # Dequeue the first cell and mark it as visited
+        current_cell = queue.pop(0)
+        if record:
+            stats.record_pop()
+        current_cell.visited = True
+        visited_cells_count += 1
+
+        # Delay for visualization purposes
+        pygame.time.delay(60) 
+        pygame.display.flip()
+
+        # Redraw the entire maze on each iteration to keep all cells visible
+        for cell in grid_cells:
+            cell.draw(sc)
+
+        # Display current state of the algorithm
+        draw_text_of_running_alg(sc, "RUNNING: BFS", FONT, 17, 20, 230, "#FFFFFF")
+        draw_text_of_running_alg(sc, "CELLS EXPLORED: " + str(visited_cells_count), FONT, 17, 20, 260, "#FFFFFF")
+
+        # Display buttons
+        draw_button(sc, "GENERATE MAZE", 20, 300, BUTTON_COLOR)
+        draw_button(sc, "BFS", 20, 400, BUTTON_COLOR)
+        draw_button(sc, "DFS", 20, 350, BUTTON_COLOR)
+        draw_button(sc, "BIDIRECTIONAL BFS", 20, 450, BUTTON_COLOR)
+        draw_button(sc, "A STAR", 20, 500, BUTTON_COLOR)
+        draw_button(sc, "GBFS", 20, 550, BUTTON_COLOR)
+
+        # Draw the visited cell
+        current_cell.draw(sc)
+
+        # Check if the current cell is the destination
+        if current_cell == destination_cell:
+            # If destination is reached, reconstruct and return the path
+            stats.begin_phase("reconstruct")
+            path = reconstruct_path(sc, parent, start_cell, destination_cell)
+            stats.end_phase()
+            return path, visited_cells_count
+
+        # Check neighbors and expand the BFS search
+        neighbors = current_cell.check_neighbors_for_search(grid_cells)
+        if record:
+            stats.record_neighbors(len(neighbors))
+        for neighbor in neighbors:
+            if neighbor not in visited:
+                # Enqueue the neighbor for later exploration
+                queue.append(neighbor)
+                if record:
+                    stats.record_push(len(queue))
+                # Mark neighbor as visited
+                visited.add(neighbor)
+                # Set current cell as the parent of this neighbor
+                parent[neighbor] = current_cell 
+    
+    stats.end_phase()
+    return None, visited_cells_count
+
+def bfs_search(maze: Maze, start: int = 0, goal: int = None, stats: SearchStats = None, reachability: ReachabilityIndex = None,
+               result: SearchResult = None, distances: bool = True):
+    """
+    Solve a packed maze using Breadth-First Search, without drawing. Cell weights are ignored, so the
+    path has the fewest cells rather than the lowest cost. Cells are marked when they are queued, as
+    in `solve_maze_BFS`, so each cell is queued at most once. Without `stats` or `result`, the search
+    runs in the C backend of `accel.py` when it is built, with identical results.
+
+    Args:
+    - maze (Maze): The packed maze.
+    - start (int): The index of the start cell.
+    - goal (int): The index of the destination cell (defaults to the last cell).
+    - stats (SearchStats): Optional collector for hot-path counters and phase timings.
+    - reachability (ReachabilityIndex): Optional component index used to reject unreachable goals
+      without searching.
+    - result (SearchResult): Optional object that receives the search arrays and the visit order
+      without copying.
+    - distances (bool): Whether to keep a distance array for `result`; without it the search state is
+      the parent codes alone (see `compact_bfs_search`).
+
+    Returns:
+    - path (List[int]): The cell indices of a shortest path from start to goal else None
+    - visited_cells_count (int): The total number of cells visited during the search.
+    """
+
+    # Fall back to the no-op collector; hooks are skipped entirely when it is disabled
+    if stats is None:
+        stats = NULL_STATS
+    record = stats.enabled
+    stats.begin_phase("setup")
+
+    n = len(maze)
+    if goal is None:
+        goal = n - 1
+
+    # Give up at once when the index puts the goal in another component
+    if reachability is not None and not reachability.reachable(start, goal):
+        stats.end_phase()
+        return None, 0
+
+    import accel
+    from parentcodes import ParentCodes, parent_moves
+
+    # Hand the whole search to the compiled backend when it is built and nothing is recorded
+    if result is None and not record and accel.backend() == "c":
+        parents = ParentCodes(maze.cols, n)
+        found, visited_cells_count = accel.bfs(maze, start, goal, parents)
+        if found is not None:
+            stats.end_phase()
+            return (parents.path(start, goal) if found else None), visited_cells_count
+        # The backend failed part way through and may have left codes behind, so drop the table
+        # before the Python loop allocates its own
+        del parents
+
+    walls = maze.walls
+
+    # Wall, neighbor offset and the code the neighbor stores for the current cell
+    moves = parent_moves(maze.cols)
+
+    # Reached bitmap and parent codes, and the distance array if it is kept
+    parents = ParentCodes(maze.cols, n)
+    codes = parents.codes
+    reached = parents.reached_bits
+    dist = array(maze.cost_typecode(1), [-1]) * n if distances else None
+
+    # Hand the search arrays to the caller; visited cells are appended to its visit order,
+    # together with the size of the frontier at that moment
+    order = None
+    frontier = None
+    if result is not None:
+        result.attach(maze, dist, parents)
+        order = result.order
+        frontier = result.frontier
+
+    if dist is not None:
+        dist[start] = 0
+    parents.reach(start)
+    queue = deque([start])
+    if record:
+        stats.record_push(len(queue))
+
+    # Counter to track number of visited cells
+    visited_cells_count = 0
+
+    # Main BFS loop
+    stats.begin_phase("search")
+    found = False
+    while queue:
+        current = queue.popleft()
+        if record:
+            stats.record_pop()
+        visited_cells_count += 1
+        if order is not None:
+            order.append(current)
+            frontier.append(len(queue))
+
+        # If we reached the destination, stop and reconstruct the path
+        if current == goal:
+            found = True
+            break
+
+        # Queue every open neighbor that was not reached before, recording where it came from
+        if dist is not None:
+            d = dist[current] + 1
+        w = walls[current]
+        for wall, offset, code in moves:
+            if w & wall:
+                continue
+            neighbor = current + offset
+            if record:
+                stats.record_neighbors(1)
+            bit = 1 << (neighbor & 7)
+            if reached[neighbor >> 3] & bit:
+                continue
+            reached[neighbor >> 3] |= bit
+            codes[neighbor >> 2] |= code << ((neighbor & 3) << 1)
+            if dist is not None:
+                dist[neighbor] = d
+            queue.append(neighbor)
+            if record:
+                stats.record_push(len(queue))
+
+    if not found:
+        stats.end_phase()
+        return None, visited_cells_count
+
+    stats.begin_phase("reconstruct")
+    path = parents.path(start, goal)
+    stats.end_phase()
+    return path, visited_cells_count
+
+def compact_bfs_search(maze: Maze, start: int = 0, goal: int = None, stats: SearchStats = None,
+                       reachability: ReachabilityIndex = None, result: SearchResult = None):
+    """
+    Solve a packed maze using Breadth-First Search like `bfs_search`, but with the search state kept in
+    its `ParentCodes` table alone, without a distance array. Apart from the walls of the maze and the
+    queue, the search takes 3 bits per cell instead of 4.4 bytes, which is what makes mazes with 10^8
+    cells solvable in one process. The path is reconstructed by walking the direction codes back
+    from the goal, and is the same path `bfs_search` returns. Like `bfs_search`, it runs in the C
+    backend of `accel.py` when it is built and nothing is recorded.
+
+    Args:
+    - maze (Maze): The packed maze.
+    - start (int): The index of the start cell.
+    - goal (int): The index of the destination cell (defaults to the last cell).
+    - stats (SearchStats): Optional collector for hot-path counters and phase timings.
+    - reachability (ReachabilityIndex): Optional component index used to reject unreachable goals
+      without searching.
+    - result (SearchResult): Optional object that receives the parent codes and the visit order
+      without copying; the search keeps no distances, so its `dist` stays None.
+
+    Returns:
+    - path (List[int]): The cell indices of a shortest path from start to goal else None
+    - visited_cells_count (int): The total number of cells visited during the search.
+    """
+
+    return bfs_search(maze, start, goal, stats, reachability, result, distances=False)
@@ -1,116 +1,270 @@
-import pygame
-from config import *
-from cell import Cell
-from typing import List
-from utils import draw_text_of_running_alg, reconstruct_bidirectional_path, draw_button
-
-def solve_maze_bidirectional_BFS(grid_cells: List[Cell], sc: pygame.Surface):
-    """
-    Solve the maze using the bidirectional BFS search algorithm, which simultaneously searches 
-    from both the start and destination cells. If the searches meet, the path is reconstructed.
-
-    Args:
-    - grid_cells (List[Cell]): List of all grid cells in the maze.
-    - sc (pygame.Surface): The screen surface for drawing the maze.
-
-    Returns:
-    - full_path (List[Cell]): The reconstructed path from the start to the destination once the 
-      searches meet (if no path is found, return None).
-    """
-    
-    # Define the start and destination cells
-    start_cell = grid_cells[0]
-    destination_cell = grid_cells[-1]
-
-    # Two sets, two queues and two paent dicts to track the search from the start and the end and path visualization
-    start_queue = []
-    end_queue = []
-    start_visited = set()
-    end_visited = set()
-    start_parent = {}
-    end_parent = {}
-
-    # Counter to track number of visited cells
-    visited_cells_count = 0
-
-    # Initialize queues and visited sets for both ends
-    start_queue.append(start_cell)
-    start_visited.add(start_cell)
-    start_parent[start_cell] = None
-
-    end_queue.append(destination_cell)
-    end_visited.add(destination_cell)
-    end_parent[destination_cell] = None
-
-    # Main Bidirectional Search loop
-    while start_queue and end_queue:
-
-        # Process BFS from start side
-        if start_queue:
-            current_start_cell = start_queue.pop(0)
-            current_start_cell.visited = True
-            visited_cells_count += 1
-
-            # Delay for visualization purposes
-            pygame.time.delay(40)
-            pygame.display.flip()
-
-            # Redraw the entire maze
-            for cell in grid_cells:
-                cell.draw(sc)
-            current_start_cell.draw(sc)
-
-            # Check neighbors and continue exploring
-            neighbors_start = current_start_cell.check_neighbors_for_search(grid_cells)
-            for neighbor in neighbors_start:
-                if neighbor not in start_visited:
-                    start_queue.append(neighbor)
-                    start_visited.add(neighbor)
-                    start_parent[neighbor] = current_start_cell
-
-                # Check if the search meets the end side
-                if neighbor in end_visited:
-                    full_path = reconstruct_bidirectional_path(sc, start_parent, end_parent, neighbor, start_cell, destination_cell)
-                    return full_path, visited_cells_count
-
-        # Process BFS from the end side and continue exploring
-        if end_queue:
-            current_end_cell = end_queue.pop(0)
-            current_end_cell.visited = True
-            visited_cells_count += 1
-
-            # Delay for visualization purposes
-            pygame.time.delay(60)
-            pygame.display.flip()
-
-            # Redraw the entire maze
-            for cell in grid_cells:
-                cell.draw(sc)
-            current_end_cell.draw(sc)
-
-            # Check neighbors
-            neighbors_end = current_end_cell.check_neighbors_for_search(grid_cells)
-            for neighbor in neighbors_end:
-                if neighbor not in end_visited:
-                    end_queue.append(neighbor)
-                    end_visited.add(neighbor)
-                    end_parent[neighbor] = current_end_cell
-
-                # Check if the search meets the start side
-                if neighbor in start_visited:
-                    full_path = reconstruct_bidirectional_path(sc, start_parent, end_parent, neighbor, start_cell, destination_cell)
-                    return full_path, visited_cells_count
-        
-        # Display the current state of the algorithm
-        draw_text_of_running_alg(sc, "RUNNING: DFS", FONT, 17, 20, 230, "#FFFFFF")
-        draw_text_of_running_alg(sc, "CELLS EXPLORED: " + str(visited_cells_count), FONT, 17, 20, 260, "#FFFFFF")
-
-        # Display buttons
-        draw_button(sc, "GENERATE MAZE", 20, 300, BUTTON_COLOR)
-        draw_button(sc, "BFS", 20, 400, BUTTON_COLOR)
-        draw_button(sc, "DFS", 20, 350, BUTTON_COLOR)
-        draw_button(sc, "BIDIRECTIONAL BFS", 20, 450, BUTTON_COLOR)
-        draw_button(sc, "A STAR", 20, 500, BUTTON_COLOR)
-        draw_button(sc, "GBFS", 20, 550, BUTTON_COLOR)
-    
-    return None, visited_cells_count
\ No newline at end of file
+from __future__ import annotations
+from array import array
+from maze import Maze
+from instrumentation import SearchStats, NULL_STATS
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import pygame
+    from cell import Cell
+    from reachability import ReachabilityIndex
+    from export import SearchResult
+
+def _open_neighbors(cell: Cell, grid_cells: list[Cell]):
+    """
+    Returns the neighbors of a cell that no wall separates it from, whether they were visited or not.
+    """
+
+    neighbors = []
+    for x, y, wall, opposite in ((cell.x, cell.y - 1, "top", "bottom"), (cell.x + 1, cell.y, "right", "left"),
+                                 (cell.x, cell.y + 1, "bottom", "top"), (cell.x - 1, cell.y, "left", "right")):
+        neighbor = cell.check_cell(grid_cells, x, y)
+        if neighbor and not cell.walls[wall] and not neighbor.walls[opposite]:
+            neighbors.append(neighbor)
+    return neighbors
+
+def solve_maze_bidirectional_BFS(grid_cells: list[Cell], sc: pygame.Surface, stats: SearchStats = None):
+    """
+    Solve the maze using the bidirectional BFS search algorithm, which simultaneously searches 
+    from both the start and destination cells. Like `bidirectional_bfs_search`, the two searches
+    take turns expanding one whole level, always the side with the smaller frontier, and the level
+    in which they first touch is finished before the shortest connection found in it is kept, so the
+    path is a shortest one.
+
+    Args:
+    - grid_cells (List[Cell]): List of all grid cells in the maze.
+    - sc (pygame.Surface): The screen surface for drawing the maze.
+    - stats (SearchStats): Optional collector for hot-path counters and phase timings. The queue 
+      high-water mark covers both frontiers together.
+
+    Returns:
+    - full_path (List[Cell]): The reconstructed path from the start to the destination once the 
+      searches meet (if no path is found, return None).
+    - visited_cells_count (int): The total number of cells expanded by both searches.
+    """
+
+    import pygame
+    from utils import draw_text_of_running_alg, reconstruct_bidirectional_path, draw_button
+    from config import FONT, BUTTON_COLOR
+
+    # Fall back to the no-op collector; hooks are skipped entirely when it is disabled
+    if stats is None:
+        stats = NULL_STATS
+    record = stats.enabled
+    stats.begin_phase("setup")
+
+    # Define the start and destination cells
+    start_cell = grid_cells[0]
+    destination_cell = grid_cells[-1]
+
+    # Parent and distance dictionaries of both sides (index 0 from the start, 1 from the destination)
+    parents = ({start_cell: None}, {destination_cell: None})
+    dists = ({start_cell: 0}, {destination_cell: 0})
+    levels = [[start_cell], [destination_cell]]
+    if record:
+        stats.record_push(1)
+        stats.record_push(2)
+
+    # Counter to track number of visited cells
+    visited_cells_count = 0
+
+    # Best connection so far: (edges on the path, cell on the start side, cell on the destination side)
+    best = (0, start_cell, destination_cell) if start_cell == destination_cell else None
+
+    # Main loop: expand one whole level of the smaller frontier
+    stats.begin_phase("search")
+    while best is None and levels[0] and levels[1]:
+        side = 0 if len(levels[0]) <= len(levels[1]) else 1
+        other = 1 - side
+        next_level = []
+        for current_cell in levels[side]:
+            if record:
+                stats.record_pop()
+            current_cell.visited = True
+            visited_cells_count += 1
+
+            # Delay for visualization purposes
+            pygame.time.delay(40)
+            pygame.display.flip()
+
+            # Redraw the entire maze
+            for cell in grid_cells:
+                cell.draw(sc)
+            current_cell.draw(sc)
+
+            # Queue the unseen neighbors; a neighbor seen by the other side is a connection
+            neighbors = _open_neighbors(current_cell, grid_cells)
+            if record:
+                stats.record_neighbors(len(neighbors))
+            d = dists[side][current_cell] + 1
+            for neighbor in neighbors:
+                if neighbor in dists[other]:
+                    edges = d + dists[other][neighbor]
+                    if best is None or edges < best[0]:
+                        best = (edges, current_cell, neighbor) if side == 0 else (edges, neighbor, current_cell)
+                elif neighbor not in dists[side]:
+                    dists[side][neighbor] = d
+                    parents[side][neighbor] = current_cell
+                    next_level.append(neighbor)
+                    if record:
+                        stats.record_push(len(next_level) + len(levels[other]))
+        levels[side] = next_level
+
+        # Display the current state of the algorithm
+        draw_text_of_running_alg(sc, "RUNNING: BIDIRECTIONAL BFS", FONT, 17, 20, 230, "#FFFFFF")
+        draw_text_of_running_alg(sc, "CELLS EXPLORED: " + str(visited_cells_count), FONT, 17, 20, 260, "#FFFFFF")
+
+        # Display buttons
+        draw_button(sc, "GENERATE MAZE", 20, 300, BUTTON_COLOR)
+        draw_button(sc, "BFS", 20, 400, BUTTON_COLOR)
+        draw_button(sc, "DFS", 20, 350, BUTTON_COLOR)
+        draw_button(sc, "BIDIRECTIONAL BFS", 20, 450, BUTTON_COLOR)
+        draw_button(sc, "A STAR", 20, 500, BUTTON_COLOR)
+        draw_button(sc, "GBFS", 20, 550, BUTTON_COLOR)
+
+    if best is None:
+        stats.end_phase()
+        return None, visited_cells_count
+
+    # Join the halves at the start-side cell of the connection, whose next step is the other cell
+    stats.begin_phase("reconstruct")
+    _, meeting_cell, next_cell = best
+    if next_cell is not meeting_cell:
+        parents[1][meeting_cell] = next_cell
+    full_path = reconstruct_bidirectional_path(sc, parents[0], parents[1], meeting_cell, start_cell, destination_cell)
+    stats.end_phase()
+    return full_path, visited_cells_count
+
+def bidirectional_bfs_search(maze: Maze, start: int = 0, goal: int = None, stats: SearchStats = None,
+                             reachability: ReachabilityIndex = None, result: SearchResult = None):
+    """
+    Solve a packed maze using bidirectional BFS, without drawing. The two searches take turns
+    expanding one whole level, always the side with the smaller frontier. A meeting is not accepted
+    at the first touching pair of cells: the level in which the searches first touch is finished
+    and the shortest connection found in it is kept, which makes the path a shortest one. Cell
+    weights are ignored.
+
+    Args:
+    - maze (Maze): The packed maze.
+    - start (int): The index of the start cell.
+    - goal (int): The index of the destination cell (defaults to the last cell).
+    - stats (SearchStats): Optional collector for hot-path counters and phase timings. The queue
+      high-water mark covers both frontiers together.
+    - reachability (ReachabilityIndex): Optional component index used to reject unreachable goals
+      without searching.
+    - result (SearchResult): Optional object that receives the search arrays and the visit order
+      without copying. Parents of cells reached from the goal side point towards the goal.
+
+    Returns:
+    - path (List[int]): The cell indices of a shortest path from start to goal else None
+    - visited_cells_count (int): The total number of cells expanded by both searches.
+    """
+
+    # Fall back to the no-op collector; hooks are skipped entirely when it is disabled
+    if stats is None:
+        stats = NULL_STATS
+    record = stats.enabled
+    stats.begin_phase("setup")
+
+    n = len(maze)
+    if goal is None:
+        goal = n - 1
+
+    # Give up at once when the index puts the goal in another component
+    if reachability is not None and not reachability.reachable(start, goal):
+        stats.end_phase()
+        return None, 0
+
+    from parentcodes import ParentCodes, parent_moves
+
+    walls = maze.walls
+
+    # Wall, neighbor offset and the code the neighbor stores for the current cell
+    moves = parent_moves(maze.cols)
+
+    # Side of every reached cell (1 from the start, 2 from the goal), its distance from the root of
+    # that side and the direction of the cell it was reached from
+    side = bytearray(n)
+    dist = array(maze.cost_typecode(1), [-1]) * n
+    parents = ParentCodes(maze.cols, n)
+    codes = parents.codes
+    reached = parents.reached_bits
+
+    # Hand the search arrays to the caller; expanded cells are appended to its visit order,
+    # together with the size of both frontiers at that moment
+    order = None
+    frontier = None
+    if result is not None:
+        result.attach(maze, dist, parents)
+        order = result.order
+        frontier = result.frontier
+
+    side[start], dist[start] = 1, 0
+    side[goal], dist[goal] = 2, 0
+    parents.reach(start)
+    parents.reach(goal)
+    levels = [None, [start], [goal]]
+    if record:
+        stats.record_push(1)
+        stats.record_push(2)
+
+    # Counter to track number of expanded cells
+    visited_cells_count = 0
+
+    # Best connection so far: (edges on the path, cell on the start side, cell on the goal side)
+    best = (0, start, goal) if start == goal else None
+
+    # Main loop: expand one whole level of the smaller frontier
+    stats.begin_phase("search")
+    while best is None and levels[1] and levels[2]:
+        s = 1 if len(levels[1]) <= len(levels[2]) else 2
+        other = 3 - s
+        level, waiting = levels[s], len(levels[other])
+        next_level = []
+        for position, current in enumerate(level):
+            if record:
+                stats.record_pop()
+            visited_cells_count += 1
+            if order is not None:
+                order.append(current)
+                frontier.append(len(level) - position - 1 + len(next_level) + waiting)
+
+            d = dist[current] + 1
+            w = walls[current]
+            for wall, offset, code in moves:
+                if w & wall:
+                    continue
+                neighbor = current + offset
+                if record:
+                    stats.record_neighbors(1)
+                owner = side[neighbor]
+                if owner == other:
+                    # The searches touch: keep the shortest connection of this level
+                    edges = d + dist[neighbor]
+                    if best is None or edges < best[0]:
+                        best = (edges, current, neighbor) if s == 1 else (edges, neighbor, current)
+                elif not owner:
+                    side[neighbor] = s
+                    dist[neighbor] = d
+                    reached[neighbor >> 3] |= 1 << (neighbor & 7)
+                    codes[neighbor >> 2] |= code << ((neighbor & 3) << 1)
+                    next_level.append(neighbor)
+                    if record:
+                        stats.record_push(len(next_level) + waiting)
+        levels[s] = next_level
+
+    if best is None:
+        stats.end_phase()
+        return None, visited_cells_count
+
+    # Join the half from the start with the half walked back from the goal
+    stats.begin_phase("reconstruct")
+    _, a, b = best
+    path = parents.path(start, a)
+    if b != a:
+        while b != goal:
+            path.append(b)
+            b = parents[b]
+        path.append(goal)
+    stats.end_phase()
+    return path, visited_cells_count
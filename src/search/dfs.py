@@ -1,87 +1,223 @@
-import pygame
-from cell import Cell
-from typing import List
-from config import *
-from utils import draw_text_of_running_alg, reconstruct_path, draw_button
-
-def solve_maze_DFS(grid_cells: List[Cell], sc: pygame.Surface):
-    """
-    Solve the maze using Depth-First Search (DFS), which explores as far as possible
-    along each branch before backtracking. DFS uses a stack to manage the traversal 
-    and explores deeper into the maze with each step.
-
-    Args:
-    - grid_cells (list): A list of all cells in the maze, where each cell is an object 
-      with properties like coordinates and neighbors, and methods for drawing and searching.
-    - sc (pygame.Surface): The pygame screen surface used for drawing and visualizing 
-      the maze and DFS traversal process.
-
-    Returns:
-    - path (list or None): A list of cells representing the solution path from the 
-      start to the destination if found, otherwise returns None.
-    - visited_cells_count (int): The total number of cells visited during the search.
-    """
-
-    # Define the start and destination cells
-    start_cell = grid_cells[0]
-    destination_cell = grid_cells[-1]
-
-    # Initialize needed structures for BFS and path reconstucting later
-    stack = []  
-    visited = set()  
-    parent = {}
-    stack.append(start_cell)
-    visited.add(start_cell)
-    parent[start_cell] = None
-
-    # Inintialize visited cell counter
-    visited_cells_count = 0
-
-    # Main DFS loop
-    while stack:
-        # Pop the top cell from the stack and mark it as visited
-        current_cell = stack.pop()
-        current_cell.visited = True
-        visited_cells_count += 1
-
-        # Delay for visualization purposes
-        pygame.time.delay(60) 
-        pygame.display.flip()
-
-        # Redraw the entire maze on each iteration to keep all cells visible
-        for cell in grid_cells:
-            cell.draw(sc)
-        
-        # Display the current state of the algorithm
-        draw_text_of_running_alg(sc, "RUNNING: DFS", FONT, 17, 20, 230, "#FFFFFF")
-        draw_text_of_running_alg(sc, "CELLS EXPLORED: " + str(visited_cells_count), FONT, 17, 20, 260, "#FFFFFF")
-
-        # Display buttons
-        draw_button(sc, "GENERATE MAZE", 20, 300, BUTTON_COLOR)
-        draw_button(sc, "BFS", 20, 400, BUTTON_COLOR)
-        draw_button(sc, "DFS", 20, 350, BUTTON_COLOR)
-        draw_button(sc, "BIDIRECTIONAL BFS", 20, 450, BUTTON_COLOR)
-        draw_button(sc, "A STAR", 20, 500, BUTTON_COLOR)
-        draw_button(sc, "GBFS", 20, 550, BUTTON_COLOR)
-
-        # Draw the visited cell
-        current_cell.draw(sc)
-
-        # Check if the current cell is the destination
-        if current_cell == destination_cell:
-            # If destination is reached, reconstruct and return the path
-            path = reconstruct_path(sc, parent, start_cell, destination_cell)
-            return path, visited_cells_count
-
-        # Check neighbors and explore deeper
-        neighbors = current_cell.check_neighbors_for_search(grid_cells)
-        for neighbor in neighbors:
-            if neighbor not in visited:
-                # Push the neighbor onto the stack
-                stack.append(neighbor)
-                # Mark the neighbor as visited
-                visited.add(neighbor)
-                # Set the current cell as the parent of the neighbor
-                parent[neighbor] = current_cell
-    
-    return None, visited_cells_count
+from __future__ import annotations
+from maze import Maze
+from instrumentation import SearchStats, NULL_STATS
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import pygame
+    from cell import Cell
+    from reachability import ReachabilityIndex
+    from export import SearchResult
+
+def solve_maze_DFS(grid_cells: list[Cell], sc: pygame.Surface, stats: SearchStats = None):
+    """
+    Solve the maze using Depth-First Search (DFS), which explores as far as possible
+    along each branch before backtracking. DFS uses a stack to manage the traversal 
+    and explores deeper into the maze with each step.
+
+    Args:
+    - grid_cells (list): A list of all cells in the maze, where each cell is an object 
+      with properties like coordinates and neighbors, and methods for drawing and searching.
+    - sc (pygame.Surface): The pygame screen surface used for drawing and visualizing 
+      the maze and DFS traversal process.
+    - stats (SearchStats): Optional collector for hot-path counters and phase timings.
+
+    Returns:
+    - path (list or None): A list of cells representing the solution path from the 
+      start to the destination if found, otherwise returns None.
+    - visited_cells_count (int): The total number of cells visited during the search.
+    """
+
+    import pygame
+    from utils import draw_text_of_running_alg, reconstruct_path, draw_button
+    from config import FONT, BUTTON_COLOR
+
+    # Fall back to the no-op collector; hooks are skipped entirely when it is disabled
+    if stats is None:
+        stats = NULL_STATS
+    record = stats.enabled
+    stats.begin_phase("setup")
+
+    # Define the start and destination cells
+    start_cell = grid_cells[0]
+    destination_cell = grid_cells[-1]
+
+    # Initialize needed structures for BFS and path reconstucting later
+    stack = []  
+    visited = set()  
+    parent = {}
+    stack.append(start_cell)
+    if record:
+        stats.record_push(len(stack))
+    visited.add(start_cell)
+    parent[start_cell] = None
+
+    # Inintialize visited cell counter
+    visited_cells_count = 0
+
+    # Main DFS loop
+    stats.begin_phase("search")
+    while stack:
+        # Pop the top cell from the stack and mark it as visited
+        current_cell = stack.pop()
+        if record:
+            stats.record_pop()
+        current_cell.visited = True
+        visited_cells_count += 1
+
+        # Delay for visualization purposes
+        pygame.time.delay(60) 
+        pygame.display.flip()
+
+        # Redraw the entire maze on each iteration to keep all cells visible
+        for cell in grid_cells:
+            cell.draw(sc)
+        
+        # Display the current state of the algorithm
+        draw_text_of_running_alg(sc, "RUNNING: DFS", FONT, 17, 20, 230, "#FFFFFF")
+        draw_text_of_running_alg(sc, "CELLS EXPLORED: " + str(visited_cells_count), FONT, 17, 20, 260, "#FFFFFF")
+
+        # Display buttons
+        draw_button(sc, "GENERATE MAZE", 20, 300, BUTTON_COLOR)
+        draw_button(sc, "BFS", 20, 400, BUTTON_COLOR)
+        draw_button(sc, "DFS", 20, 350, BUTTON_COLOR)
+        draw_button(sc, "BIDIRECTIONAL BFS", 20, 450, BUTTON_COLOR)
+        draw_button(sc, "A STAR", 20, 500, BUTTON_COLOR)
+        draw_button(sc, "GBFS", 20, 550, BUTTON_COLOR)
+
+        # Draw the visited cell
+        current_cell.draw(sc)
+
+        # Check if the current cell is the destination
+        if current_cell == destination_cell:
+            # If destination is reached, reconstruct and return the path
+            stats.begin_phase("reconstruct")
+            path = reconstruct_path(sc, parent, start_cell, destination_cell)
+            stats.end_phase()
+            return path, visited_cells_count
+
+        # Check neighbors and explore deeper
+        neighbors = current_cell.check_neighbors_for_search(grid_cells)
+        if record:
+            stats.record_neighbors(len(neighbors))
+        for neighbor in neighbors:
+            if neighbor not in visited:
+                # Push the neighbor onto the stack
+                stack.append(neighbor)
+                if record:
+                    stats.record_push(len(stack))
+                # Mark the neighbor as visited
+                visited.add(neighbor)
+                # Set the current cell as the parent of the neighbor
+                parent[neighbor] = current_cell
+    
+    stats.end_phase()
+    return None, visited_cells_count
+
+def dfs_search(maze: Maze, start: int = 0, goal: int = None, stats: SearchStats = None, reachability: ReachabilityIndex = None,
+               result: SearchResult = None):
+    """
+    Solve a packed maze using Depth-First Search, without drawing. Like `solve_maze_DFS`, cells are
+    marked when they are pushed, so each cell is pushed at most once, and the path found is not
+    necessarily the shortest.
+
+    Args:
+    - maze (Maze): The packed maze.
+    - start (int): The index of the start cell.
+    - goal (int): The index of the destination cell (defaults to the last cell).
+    - stats (SearchStats): Optional collector for hot-path counters and phase timings.
+    - reachability (ReachabilityIndex): Optional component index used to reject unreachable goals
+      without searching.
+    - result (SearchResult): Optional object that receives the search arrays and the visit order
+      without copying.
+
+    Returns:
+    - path (List[int]): The cell indices of a path from start to goal else None
+    - visited_cells_count (int): The total number of cells visited during the search.
+    """
+
+    # Fall back to the no-op collector; hooks are skipped entirely when it is disabled
+    if stats is None:
+        stats = NULL_STATS
+    record = stats.enabled
+    stats.begin_phase("setup")
+
+    n = len(maze)
+    if goal is None:
+        goal = n - 1
+
+    # Give up at once when the index puts the goal in another component
+    if reachability is not None and not reachability.reachable(start, goal):
+        stats.end_phase()
+        return None, 0
+
+    from parentcodes import ParentCodes, parent_moves
+
+    walls = maze.walls
+
+    # Wall, neighbor offset and the code the neighbor stores for the current cell
+    moves = parent_moves(maze.cols)
+
+    # Parent codes; a cell's reached bit is set once it was pushed onto the stack
+    parents = ParentCodes(maze.cols, n)
+    codes = parents.codes
+    reached = parents.reached_bits
+
+    # Hand the search arrays to the caller; visited cells are appended to its visit order,
+    # together with the size of the frontier at that moment
+    order = None
+    frontier = None
+    if result is not None:
+        result.attach(maze, None, parents)
+        order = result.order
+        frontier = result.frontier
+
+    parents.reach(start)
+    stack = [start]
+    if record:
+        stats.record_push(len(stack))
+
+    # Counter to track number of visited cells
+    visited_cells_count = 0
+
+    # Main DFS loop
+    stats.begin_phase("search")
+    found = False
+    while stack:
+        current = stack.pop()
+        if record:
+            stats.record_pop()
+        visited_cells_count += 1
+        if order is not None:
+            order.append(current)
+            frontier.append(len(stack))
+
+        # If we reached the destination, stop and reconstruct the path
+        if current == goal:
+            found = True
+            break
+
+        # Push every open neighbor that was not pushed before
+        w = walls[current]
+        for wall, offset, code in moves:
+            if w & wall:
+                continue
+            neighbor = current + offset
+            if record:
+                stats.record_neighbors(1)
+            if reached[neighbor >> 3] & (1 << (neighbor & 7)):
+                continue
+            reached[neighbor >> 3] |= 1 << (neighbor & 7)
+            codes[neighbor >> 2] |= code << ((neighbor & 3) << 1)
+            stack.append(neighbor)
+            if record:
+                stats.record_push(len(stack))
+
+    if not found:
+        stats.end_phase()
+        return None, visited_cells_count
+
+    stats.begin_phase("reconstruct")
+    path = parents.path(start, goal)
+    stats.end_phase()
+    return path, visited_cells_count
@@ -0,0 +1,223 @@
+from __future__ import annotations
+from array import array
+from maze import Maze
+from instrumentation import SearchStats, NULL_STATS
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from reachability import ReachabilityIndex
+    from export import SearchResult
+
+def _settle_cells(maze: Maze, start: int, dist: array, parents, stats: SearchStats):
+    """
+    Run Dial's algorithm from `start`, filling `dist` and `parents` and yielding every cell as it is
+    settled, together with the number of entries still queued. The caller stops the search by
+    leaving the loop; the cell it was handed is not relaxed then.
+
+    Args:
+    - maze (Maze): The packed maze, optionally with cell weights.
+    - start (int): The index of the start cell.
+    - dist (array): Distance array filled with -1, one entry per cell.
+    - parents (ParentCodes): Empty parent codes, one entry per cell.
+    - stats (SearchStats): Collector for hot-path counters.
+
+    Yields:
+    - current (int): The index of the cell just settled.
+    - queued (int): The number of queue entries left, stale ones included.
+    """
+
+    from parentcodes import parent_moves
+
+    n = len(maze)
+    record = stats.enabled
+    walls = maze.walls
+    weights = maze.weights if maze.weights is not None else b"\x01" * n
+
+    # Wall, neighbor offset and the code the neighbor stores for the current cell
+    moves = parent_moves(maze.cols)
+    codes = parents.codes
+    reached = parents.reached_bits
+
+    # Settled marks cells whose distance is final
+    settled = bytearray(n)
+
+    # Circular bucket queue: bucket d % width holds the cells queued with distance d
+    width = maze.max_weight() + 1
+    buckets = [[] for _ in range(width)]
+    buckets[0].append(start)
+    dist[start] = 0
+    parents.reach(start)
+    queued = 1
+    if record:
+        stats.record_push(queued)
+
+    d = 0
+    while queued:
+        # Advance to the next non-empty bucket
+        bucket = buckets[d % width]
+        while not bucket:
+            d += 1
+            bucket = buckets[d % width]
+        current = bucket.pop()
+        queued -= 1
+        if record:
+            stats.record_pop()
+
+        # Skip stale entries: the cell was already settled with a smaller distance
+        if settled[current]:
+            if record:
+                stats.record_stale()
+            continue
+        settled[current] = 1
+        yield current, queued
+
+        # Relax every open neighbor
+        w = walls[current]
+        for wall, offset, code in moves:
+            if w & wall:
+                continue
+            neighbor = current + offset
+            if record:
+                stats.record_neighbors(1)
+            if settled[neighbor]:
+                continue
+            new_dist = d + weights[neighbor]
+            if dist[neighbor] < 0 or new_dist < dist[neighbor]:
+                dist[neighbor] = new_dist
+                shift = (neighbor & 3) << 1
+                codes[neighbor >> 2] = codes[neighbor >> 2] & ~(3 << shift) | code << shift
+                reached[neighbor >> 3] |= 1 << (neighbor & 7)
+                buckets[new_dist % width].append(neighbor)
+                queued += 1
+                if record:
+                    stats.record_push(queued)
+
+def dijkstra_search(maze: Maze, start: int = 0, goal: int = None, stats: SearchStats = None, reachability: ReachabilityIndex = None,
+                    result: SearchResult = None):
+    """
+    Solve a weighted packed maze using Dijkstra's algorithm with a bucket queue (Dial's algorithm).
+
+    Cell weights are small integers (1-255), so every distance still waiting in the queue lies within
+    `max_weight` of the distance being expanded. The queue is therefore a circular array of
+    `max_weight + 1` buckets indexed by distance, and both pushes and pops are O(1) instead of the
+    O(log n) of a binary heap. Entries whose cell was already settled through a cheaper path are
+    skipped when they are popped.
+
+    Args:
+    - maze (Maze): The packed maze, optionally with cell weights.
+    - start (int): The index of the start cell.
+    - goal (int): The index of the destination cell (defaults to the last cell).
+    - stats (SearchStats): Optional collector for hot-path counters and phase timings.
+    - reachability (ReachabilityIndex): Optional component index used to reject unreachable goals
+      without searching.
+    - result (SearchResult): Optional object that receives the search arrays and the visit order
+      without copying.
+
+    Returns:
+    - path (List[int]): The cell indices of a cheapest path from start to goal else None
+    - visited_cells_count (int): The total number of cells settled during the search.
+    """
+
+    # Fall back to the no-op collector; hooks are skipped entirely when it is disabled
+    if stats is None:
+        stats = NULL_STATS
+    stats.begin_phase("setup")
+
+    n = len(maze)
+    if goal is None:
+        goal = n - 1
+
+    # Give up at once when the index puts the goal in another component
+    if reachability is not None and not reachability.reachable(start, goal):
+        stats.end_phase()
+        return None, 0
+
+    from parentcodes import ParentCodes
+
+    # Distance array and parent codes
+    dist = array(maze.cost_typecode(maze.max_weight()), [-1]) * n
+    parents = ParentCodes(maze.cols, n)
+
+    # Hand the search arrays to the caller; settled cells are appended to its visit order,
+    # together with the size of the frontier at that moment
+    order = None
+    frontier = None
+    if result is not None:
+        result.attach(maze, dist, parents)
+        order = result.order
+        frontier = result.frontier
+
+    # Counter to track number of settled cells
+    visited_cells_count = 0
+
+    # Main Dijkstra loop
+    stats.begin_phase("search")
+    found = False
+    for current, queued in _settle_cells(maze, start, dist, parents, stats):
+        visited_cells_count += 1
+        if order is not None:
+            order.append(current)
+            frontier.append(queued)
+
+        # If we reached the destination, stop and reconstruct the path
+        if current == goal:
+            found = True
+            break
+
+    if not found:
+        stats.end_phase()
+        return None, visited_cells_count
+
+    stats.begin_phase("reconstruct")
+    path = parents.path(start, goal)
+    stats.end_phase()
+    return path, visited_cells_count
+
+def multi_target_search(maze: Maze, start: int, goals, stats: SearchStats = None):
+    """
+    Solve several queries that share a start cell with a single Dijkstra search. The search runs
+    like `dijkstra_search` but only stops once every goal is settled (or the reachable part of the
+    maze is exhausted), so a batch of k goals costs one search instead of k.
+
+    Args:
+    - maze (Maze): The packed maze, optionally with cell weights.
+    - start (int): The index of the shared start cell.
+    - goals (Iterable[int]): The indices of the destination cells.
+    - stats (SearchStats): Optional collector for hot-path counters and phase timings.
+
+    Returns:
+    - paths (Dict[int, List[int]]): Every goal mapped to the cell indices of a cheapest path from the
+      start, or None if it is unreachable.
+    - visited_cells_count (int): The total number of cells settled during the search.
+    """
+
+    # Fall back to the no-op collector; hooks are skipped entirely when it is disabled
+    if stats is None:
+        stats = NULL_STATS
+    stats.begin_phase("setup")
+
+    from parentcodes import ParentCodes
+
+    # Goals are read twice, so a one-shot iterable is materialized first
+    goals = list(goals)
+    n = len(maze)
+    dist = array(maze.cost_typecode(maze.max_weight()), [-1]) * n
+    parents = ParentCodes(maze.cols, n)
+
+    # Goals that are not settled yet
+    remaining = set(goals)
+    visited_cells_count = 0
+
+    # Main Dijkstra loop, until every goal is settled
+    stats.begin_phase("search")
+    if remaining:
+        for current, _ in _settle_cells(maze, start, dist, parents, stats):
+            visited_cells_count += 1
+            remaining.discard(current)
+            if not remaining:
+                break
+
+    stats.begin_phase("reconstruct")
+    paths = {goal: None if goal in remaining else parents.path(start, goal) for goal in goals}
+    stats.end_phase()
+    return paths, visited_cells_count
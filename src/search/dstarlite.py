@@ -0,0 +1,270 @@
+import heapq  # For priority queue functionality
+from array import array
+from maze import Maze, TOP, RIGHT, BOTTOM, LEFT
+from instrumentation import SearchStats, NULL_STATS
+
+INF = float('inf')
+
+class DStarLite:
+    """
+    Incremental shortest-path replanner (D* Lite) for a packed maze whose walls change during a run.
+
+    The planner searches backwards from the goal and keeps, for every cell it has touched, its cost
+    to the goal (`g`) and a one-step lookahead of that cost (`rhs`). It listens to the maze, so
+    opening or closing a wall only marks the two cells next to that wall as inconsistent, and a new
+    cell weight the open neighbors of that cell; the next call to `plan` repairs the search tree
+    around them instead of searching again from scratch. The start may also move (`move_start`) as
+    the agent walks along the path.
+
+    Attributes:
+    - maze (Maze): The maze being planned on.
+    - start (int): The index of the current start cell.
+    - goal (int): The index of the destination cell.
+    """
+
+    def __init__(self, maze: Maze, start: int = 0, goal: int = None, stats: SearchStats = None):
+        """
+        Initializes the planner and subscribes it to the wall and weight changes of the maze.
+
+        Args:
+        - maze (Maze): The packed maze, optionally with cell weights.
+        - start (int): The index of the start cell.
+        - goal (int): The index of the destination cell (defaults to the last cell).
+        - stats (SearchStats): Optional collector; counters accumulate over all `plan` calls.
+        """
+
+        # Fall back to the no-op collector; hooks are skipped entirely when it is disabled
+        if stats is None:
+            stats = NULL_STATS
+        self._stats = stats
+        self._record = stats.enabled
+        stats.begin_phase("setup")
+
+        n = len(maze)
+        self.maze = maze
+        self.start = start
+        self.goal = n - 1 if goal is None else goal
+        self._cols = maze.cols
+        self._min_weight = maze.min_weight()
+        self._directions = ((TOP, -maze.cols), (RIGHT, 1), (BOTTOM, maze.cols), (LEFT, -1))
+
+        # Cost-to-goal estimates and their one-step lookahead values
+        self._g = array('d', [INF]) * n
+        self._rhs = array('d', [INF]) * n
+
+        # Priority queue of inconsistent cells with lazy deletion: `_queued` holds the valid key of
+        # every queued cell, heap entries whose key differs are stale
+        self._heap = []
+        self._queued = {}
+
+        # Key modifier that keeps old keys valid when the start moves
+        self._km = 0
+        self._last_start = start
+
+        self._rhs[self.goal] = 0
+        self._insert(self.goal, self._calculate_key(self.goal))
+        maze.add_listener(self._on_wall_change)
+        maze.add_weight_listener(self._on_weight_change)
+        stats.end_phase()
+
+    def close(self):
+        """
+        Unsubscribes the planner from the wall and weight changes of the maze.
+        """
+
+        self.maze.remove_listener(self._on_wall_change)
+        self.maze.remove_weight_listener(self._on_weight_change)
+
+    def _heuristic(self, a: int, b: int):
+        """
+        Returns the Manhattan distance between two cells scaled by the smallest weight (admissible).
+        """
+
+        cols = self._cols
+        return (abs(a % cols - b % cols) + abs(a // cols - b // cols)) * self._min_weight
+
+    def _calculate_key(self, s: int):
+        """
+        Returns the priority of a cell: (estimated total cost through it, its cost to the goal).
+        """
+
+        m = min(self._g[s], self._rhs[s])
+        return (m + self._heuristic(self.start, s) + self._km, m)
+
+    def _insert(self, s: int, key):
+        """
+        Queues a cell with the given key, replacing any previous entry of it.
+        """
+
+        self._queued[s] = key
+        heapq.heappush(self._heap, (key[0], key[1], s))
+        if self._record:
+            self._stats.record_push(len(self._heap))
+
+    def _top(self):
+        """
+        Drops stale heap entries and returns the smallest valid (key, cell), or None when empty.
+        """
+
+        heap = self._heap
+        while heap:
+            k1, k2, s = heap[0]
+            key = self._queued.get(s)
+            if key is not None and key[0] == k1 and key[1] == k2:
+                return (k1, k2), s
+            heapq.heappop(heap)
+            if self._record:
+                self._stats.record_pop()
+                self._stats.record_stale()
+        return None
+
+    def _update_vertex(self, u: int):
+        """
+        Recomputes the lookahead cost of a cell and (re)queues it if it became inconsistent.
+        """
+
+        g, rhs = self._g, self._rhs
+        if u != self.goal:
+            # Stepping into a neighbor costs the neighbor's weight
+            maze = self.maze
+            w = maze.walls[u]
+            weights = maze.weights
+            best = INF
+            checked = 0
+            for wall, offset in self._directions:
+                if w & wall:
+                    continue
+                s = u + offset
+                checked += 1
+                cost = g[s] + (1 if weights is None else weights[s])
+                if cost < best:
+                    best = cost
+            if self._record:
+                self._stats.record_neighbors(checked)
+            rhs[u] = best
+
+        self._queued.pop(u, None)
+        if g[u] != rhs[u]:
+            self._insert(u, self._calculate_key(u))
+
+    def _on_wall_change(self, a: int, b: int, is_open: bool):
+        """
+        Maze listener: the costs between `a` and `b` changed, so both cells may be inconsistent now.
+        """
+
+        self._update_vertex(a)
+        self._update_vertex(b)
+
+    def _on_weight_change(self, index: int, old_weight: int, weight: int):
+        """
+        Weight listener: stepping into `index` costs a different amount now, so every open neighbor
+        of it may be inconsistent. A weight below the smallest one seen so far would make the
+        heuristic inadmissible, so the heuristic is rescaled and every queued key recomputed first.
+        """
+
+        if weight < self._min_weight:
+            self._min_weight = weight
+            self._queued = {s: self._calculate_key(s) for s in self._queued}
+            self._heap = [(key[0], key[1], s) for s, key in self._queued.items()]
+            heapq.heapify(self._heap)
+        for s in self.maze.open_neighbors(index):
+            self._update_vertex(s)
+
+    def move_start(self, start: int):
+        """
+        Moves the start cell, e.g. after the agent walked along the path. Queued keys stay valid
+        because the heuristic drift is folded into the key modifier.
+
+        Args:
+        - start (int): The index of the new start cell.
+        """
+
+        self._km += self._heuristic(self._last_start, start)
+        self._last_start = start
+        self.start = start
+
+    def _compute_shortest_path(self):
+        """
+        Expands inconsistent cells until the start cell is consistent and no queued cell can
+        improve its cost.
+
+        Returns:
+        - int: The number of cells expanded.
+        """
+
+        g, rhs = self._g, self._rhs
+        record = self._record
+        start = self.start
+        expanded = 0
+
+        while True:
+            top = self._top()
+            if top is None:
+                break
+            k_old, u = top
+            if k_old >= self._calculate_key(start) and rhs[start] == g[start]:
+                break
+
+            heapq.heappop(self._heap)
+            del self._queued[u]
+            if record:
+                self._stats.record_pop()
+            expanded += 1
+
+            k_new = self._calculate_key(u)
+            if k_old < k_new:
+                # The key grew since the cell was queued: requeue it with the up-to-date key
+                self._insert(u, k_new)
+            elif g[u] > rhs[u]:
+                # Overconsistent: the cell got cheaper, settle it and update its neighbors
+                g[u] = rhs[u]
+                for s in self.maze.open_neighbors(u):
+                    self._update_vertex(s)
+            else:
+                # Underconsistent: the cell got more expensive, reset it and update it and its neighbors
+                g[u] = INF
+                self._update_vertex(u)
+                for s in self.maze.open_neighbors(u):
+                    self._update_vertex(s)
+
+        return expanded
+
+    def plan(self):
+        """
+        Repairs the search tree after the wall changes and start moves since the last call, and
+        extracts the current cheapest path.
+
+        Returns:
+        - path (List[int]): The cell indices of a cheapest path from the start to the goal else None
+        - visited_cells_count (int): The number of cells expanded by this call.
+        """
+
+        stats = self._stats
+        stats.begin_phase("search")
+        visited_cells_count = self._compute_shortest_path()
+
+        if self._g[self.start] == INF:
+            stats.end_phase()
+            return None, visited_cells_count
+
+        # Follow the cheapest neighbor from the start to the goal
+        stats.begin_phase("reconstruct")
+        g = self._g
+        walls = self.maze.walls
+        weights = self.maze.weights
+        path = [self.start]
+        current = self.start
+        while current != self.goal:
+            w = walls[current]
+            best, best_cost = -1, INF
+            for wall, offset in self._directions:
+                if w & wall:
+                    continue
+                s = current + offset
+                cost = g[s] + (1 if weights is None else weights[s])
+                if cost < best_cost:
+                    best, best_cost = s, cost
+            current = best
+            path.append(current)
+        stats.end_phase()
+        return path, visited_cells_count
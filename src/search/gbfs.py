@@ -1,91 +1,231 @@
-import pygame
-import heapq  # For priority queue functionality
-from typing import List
-from cell import Cell
-from config import *
-from utils import manhattan_distance, reconstruct_path, draw_text_of_running_alg, draw_button
-
-def solve_maze_greedy_bfs(grid_cells: List[Cell], sc: pygame.Surface):
-    """
-    Solve the maze using the Greedy Best-First Search (GBFS) algorithm, which selects the next cell 
-    to explore based on the heuristic value (Manhattan distance) to the destination.
-
-    Args:
-    - grid_cells (List[Cell]): List of all grid cells in the maze.
-    - sc (pygame.Surface): The screen surface for drawing the maze.
-
-    Returns:
-    - path (List[Cell]): The reconstructed path from the start to the destination if found, else None.
-    - visited_cells_count (int): The total number of cells visited during the search.
-    """
-
-    # Define the start end destination cells
-    start_cell = grid_cells[0]
-    destination_cell = grid_cells[-1]
-
-    # Priority queue to keep track of cells to explore, ordered by heuristic cost (h_cost) (holds tuples of (h_cost, id, cell))
-    open_set = []
-    heapq.heappush(open_set, (0, id(start_cell), start_cell))
-
-    # Visited set and parent dictionary for path reconstruction
-    parent = {}
-    parent[start_cell] = None
-    visited = set()
-
-    # Counter to track number of visited cells
-    visited_cells_count = 0
-
-    # Main GBFS loop
-    while open_set:
-        # Get the cell with the lowest heuristic (h_cost) and mark it as visited
-        _, _, current_cell = heapq.heappop(open_set)
-        current_cell.visited = True
-        visited_cells_count += 1
-
-        # If we reached the destination, reconstruct the path
-        if current_cell == destination_cell:
-            path = reconstruct_path(sc, parent, start_cell, destination_cell)
-            return path, visited_cells_count
-
-        # Redraw the entire maze to show progress
-        for cell in grid_cells:
-            cell.draw(sc)
-        current_cell.draw(sc)
-
-        # Display the current state of the algorithm
-        draw_text_of_running_alg(sc, "RUNNING: GBFS", FONT, 17, 20, 230, "#FFFFFF")
-        draw_text_of_running_alg(sc, "CELLS EXPLORED: " + str(visited_cells_count), FONT, 17, 20, 260, "#FFFFFF")
-
-        # Display buttons
-        draw_button(sc, "GENERATE MAZE", 20, 300, BUTTON_COLOR)
-        draw_button(sc, "BFS", 20, 400, BUTTON_COLOR)
-        draw_button(sc, "DFS", 20, 350, BUTTON_COLOR)
-        draw_button(sc, "BIDIRECTIONAL BFS", 20, 450, BUTTON_COLOR)
-        draw_button(sc, "A STAR", 20, 500, BUTTON_COLOR)
-        draw_button(sc, "GBFS", 20, 550, BUTTON_COLOR)
-
-        # Delay for visualization purposes
-        pygame.time.delay(60)
-        pygame.display.flip()
-
-        # Mark the current cell as visited
-        visited.add(current_cell)
-
-        # Get the neighbors of the current cell
-        neighbors = current_cell.check_neighbors_for_search(grid_cells)
-        for neighbor in neighbors:
-            # Skip visited cells
-            if neighbor in visited:
-                continue
-
-            # This is where Greedy BFS differs from A*: we only use the heuristic (h_cost)
-            h_cost = manhattan_distance(neighbor, destination_cell)
-
-            # If neighbor is not in open_set, add it with its h_cost
-            if neighbor not in [item[2] for item in open_set]:
-                parent[neighbor] = current_cell
-                heapq.heappush(open_set, (h_cost, id(neighbor), neighbor))
-
-    return None, visited_cells_count
-
-
+from __future__ import annotations
+import heapq  # For priority queue functionality
+from maze import Maze
+from instrumentation import SearchStats, NULL_STATS
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import pygame
+    from cell import Cell
+    from reachability import ReachabilityIndex
+    from export import SearchResult
+
+def solve_maze_greedy_bfs(grid_cells: list[Cell], sc: pygame.Surface, stats: SearchStats = None):
+    """
+    Solve the maze using the Greedy Best-First Search (GBFS) algorithm, which selects the next cell 
+    to explore based on the heuristic value (Manhattan distance) to the destination. Among cells 
+    with the same heuristic value, the one with the smallest `weight` is explored first.
+
+    Args:
+    - grid_cells (List[Cell]): List of all grid cells in the maze.
+    - sc (pygame.Surface): The screen surface for drawing the maze.
+    - stats (SearchStats): Optional collector for hot-path counters and phase timings.
+
+    Returns:
+    - path (List[Cell]): The reconstructed path from the start to the destination if found, else None.
+    - visited_cells_count (int): The total number of cells visited during the search.
+    """
+
+    import pygame
+    from utils import manhattan_distance, reconstruct_path, draw_text_of_running_alg, draw_button
+    from config import FONT, BUTTON_COLOR
+
+    # Fall back to the no-op collector; hooks are skipped entirely when it is disabled
+    if stats is None:
+        stats = NULL_STATS
+    record = stats.enabled
+    stats.begin_phase("setup")
+
+    # Define the start end destination cells
+    start_cell = grid_cells[0]
+    destination_cell = grid_cells[-1]
+
+    # Priority queue to keep track of cells to explore, ordered by heuristic cost (h_cost) and then by weight (holds tuples of (h_cost, weight, id, cell))
+    open_set = []
+    heapq.heappush(open_set, (0, start_cell.weight, id(start_cell), start_cell))
+    if record:
+        stats.record_push(len(open_set))
+
+    # Visited set and parent dictionary for path reconstruction
+    parent = {}
+    parent[start_cell] = None
+    visited = set()
+
+    # Counter to track number of visited cells
+    visited_cells_count = 0
+
+    # Main GBFS loop
+    stats.begin_phase("search")
+    while open_set:
+        # Get the cell with the lowest heuristic (h_cost) and mark it as visited
+        _, _, _, current_cell = heapq.heappop(open_set)
+        if record:
+            stats.record_pop()
+        current_cell.visited = True
+        visited_cells_count += 1
+
+        # If we reached the destination, reconstruct the path
+        if current_cell == destination_cell:
+            stats.begin_phase("reconstruct")
+            path = reconstruct_path(sc, parent, start_cell, destination_cell)
+            stats.end_phase()
+            return path, visited_cells_count
+
+        # Redraw the entire maze to show progress
+        for cell in grid_cells:
+            cell.draw(sc)
+        current_cell.draw(sc)
+
+        # Display the current state of the algorithm
+        draw_text_of_running_alg(sc, "RUNNING: GBFS", FONT, 17, 20, 230, "#FFFFFF")
+        draw_text_of_running_alg(sc, "CELLS EXPLORED: " + str(visited_cells_count), FONT, 17, 20, 260, "#FFFFFF")
+
+        # Display buttons
+        draw_button(sc, "GENERATE MAZE", 20, 300, BUTTON_COLOR)
+        draw_button(sc, "BFS", 20, 400, BUTTON_COLOR)
+        draw_button(sc, "DFS", 20, 350, BUTTON_COLOR)
+        draw_button(sc, "BIDIRECTIONAL BFS", 20, 450, BUTTON_COLOR)
+        draw_button(sc, "A STAR", 20, 500, BUTTON_COLOR)
+        draw_button(sc, "GBFS", 20, 550, BUTTON_COLOR)
+
+        # Delay for visualization purposes
+        pygame.time.delay(60)
+        pygame.display.flip()
+
+        # Mark the current cell as visited
+        visited.add(current_cell)
+
+        # Get the neighbors of the current cell
+        neighbors = current_cell.check_neighbors_for_search(grid_cells)
+        if record:
+            stats.record_neighbors(len(neighbors))
+        for neighbor in neighbors:
+            # Skip visited cells
+            if neighbor in visited:
+                continue
+
+            # This is where Greedy BFS differs from A*: we only use the heuristic (h_cost)
+            h_cost = manhattan_distance(neighbor, destination_cell)
+
+            # Add the neighbor unless it was queued before: its h_cost never changes, so an earlier
+            # entry is never worse and a dictionary lookup replaces scanning the heap
+            if neighbor not in parent:
+                parent[neighbor] = current_cell
+                heapq.heappush(open_set, (h_cost, neighbor.weight, id(neighbor), neighbor))
+                if record:
+                    stats.record_push(len(open_set))
+
+    stats.end_phase()
+    return None, visited_cells_count
+
+def gbfs_search(maze: Maze, start: int = 0, goal: int = None, stats: SearchStats = None, reachability: ReachabilityIndex = None,
+                result: SearchResult = None):
+    """
+    Solve a packed maze using Greedy Best-First Search, without drawing. Cells are explored in order
+    of their Manhattan distance to the destination; among cells at the same distance, the one that
+    is cheapest to step into is explored first. Each cell is queued at most once.
+
+    Args:
+    - maze (Maze): The packed maze, optionally with cell weights.
+    - start (int): The index of the start cell.
+    - goal (int): The index of the destination cell (defaults to the last cell).
+    - stats (SearchStats): Optional collector for hot-path counters and phase timings.
+    - reachability (ReachabilityIndex): Optional component index used to reject unreachable goals
+      without searching.
+    - result (SearchResult): Optional object that receives the search arrays and the visit order
+      without copying.
+
+    Returns:
+    - path (List[int]): The cell indices of a path from start to goal (not necessarily the cheapest) else None
+    - visited_cells_count (int): The total number of cells expanded during the search.
+    """
+
+    # Fall back to the no-op collector; hooks are skipped entirely when it is disabled
+    if stats is None:
+        stats = NULL_STATS
+    record = stats.enabled
+    stats.begin_phase("setup")
+
+    n = len(maze)
+    if goal is None:
+        goal = n - 1
+
+    # Give up at once when the index puts the goal in another component
+    if reachability is not None and not reachability.reachable(start, goal):
+        stats.end_phase()
+        return None, 0
+
+    from parentcodes import ParentCodes, parent_moves
+
+    cols = maze.cols
+    walls = maze.walls
+    weights = maze.weights if maze.weights is not None else b"\x01" * n
+    goal_x, goal_y = goal % cols, goal // cols
+
+    # Wall, neighbor offset and the code the neighbor stores for the current cell
+    moves = parent_moves(cols)
+
+    # Parent codes; a cell's reached bit is set once it was pushed onto the priority queue
+    parents = ParentCodes(cols, n)
+    codes = parents.codes
+    reached = parents.reached_bits
+
+    # Hand the search arrays to the caller; settled cells are appended to its visit order,
+    # together with the size of the frontier at that moment
+    order = None
+    frontier = None
+    if result is not None:
+        result.attach(maze, None, parents)
+        order = result.order
+        frontier = result.frontier
+
+    parents.reach(start)
+    open_set = [(0, 0, start)]
+    if record:
+        stats.record_push(len(open_set))
+
+    # Counter to track number of expanded cells
+    visited_cells_count = 0
+
+    # Main GBFS loop
+    stats.begin_phase("search")
+    found = False
+    while open_set:
+        _, _, current = heapq.heappop(open_set)
+        if record:
+            stats.record_pop()
+        visited_cells_count += 1
+        if order is not None:
+            order.append(current)
+            frontier.append(len(open_set))
+
+        # If we reached the destination, stop and reconstruct the path
+        if current == goal:
+            found = True
+            break
+
+        # Queue every open neighbor that was not queued before
+        w = walls[current]
+        for wall, offset, code in moves:
+            if w & wall:
+                continue
+            neighbor = current + offset
+            if record:
+                stats.record_neighbors(1)
+            if reached[neighbor >> 3] & (1 << (neighbor & 7)):
+                continue
+            reached[neighbor >> 3] |= 1 << (neighbor & 7)
+            codes[neighbor >> 2] |= code << ((neighbor & 3) << 1)
+            h_cost = abs(neighbor % cols - goal_x) + abs(neighbor // cols - goal_y)
+            heapq.heappush(open_set, (h_cost, weights[neighbor], neighbor))
+            if record:
+                stats.record_push(len(open_set))
+
+    if not found:
+        stats.end_phase()
+        return None, visited_cells_count
+
+    stats.begin_phase("reconstruct")
+    path = parents.path(start, goal)
+    stats.end_phase()
+    return path, visited_cells_count
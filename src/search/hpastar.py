@@ -0,0 +1,336 @@
+import heapq  # For priority queue functionality
+from maze import Maze, TOP, RIGHT, BOTTOM, LEFT
+from instrumentation import SearchStats, NULL_STATS
+from reachability import ReachabilityIndex
+
+class HierarchicalPathfinder:
+    """
+    Hierarchical pathfinding (HPA*) on a packed maze.
+
+    The maze is partitioned into square clusters of `cluster_size` cells. Every open crossing between
+    two clusters is an entrance, and each cluster caches a table with the cost between every pair
+    of its entrances, found by Dijkstra searches that never leave the cluster. A query connects the
+    start and goal to the entrances of their clusters, runs A* on this abstract graph of entrances,
+    and finally refines only the cluster segments of the chosen route into cells.
+
+    Because every crossing is kept as its own entrance, each segment of an optimal path between two
+    crossings lies inside one cluster, so the returned paths are optimal, not just near-optimal.
+
+    Cluster tables are built lazily (or all at once with `precompute`) and cached. The finder listens
+    to the maze, and a wall change only drops the tables of the one or two clusters the wall touches,
+    a weight change only the table of the cluster of that cell; they are rebuilt on the next query
+    that needs them.
+
+    Attributes:
+    - maze (Maze): The maze being searched.
+    - cluster_size (int): The side length of a cluster, in cells.
+    - tables_built (int): The number of cluster tables built so far, including rebuilds.
+    """
+
+    def __init__(self, maze: Maze, cluster_size: int = 16):
+        """
+        Initializes the finder and subscribes it to the wall and weight changes of the maze.
+
+        Args:
+        - maze (Maze): The packed maze, optionally with cell weights.
+        - cluster_size (int): The side length of a cluster, in cells.
+        """
+
+        self.maze = maze
+        self.cluster_size = cluster_size
+        self.tables_built = 0
+        self._cluster_cols = (maze.cols + cluster_size - 1) // cluster_size
+        self._cluster_rows = (maze.rows + cluster_size - 1) // cluster_size
+        self._weights = maze.weights if maze.weights is not None else b"\x01" * len(maze)
+        self._min_weight = maze.min_weight()
+
+        # Cached cluster tables: cluster -> (entrances, {entrance: [(other entrance, cost)]})
+        self._tables = {}
+        maze.add_listener(self._on_wall_change)
+        maze.add_weight_listener(self._on_weight_change)
+
+    def close(self):
+        """
+        Unsubscribes the finder from the wall and weight changes of the maze.
+        """
+
+        self.maze.remove_listener(self._on_wall_change)
+        self.maze.remove_weight_listener(self._on_weight_change)
+
+    def _cluster_of(self, index: int):
+        """
+        Returns the id of the cluster containing a cell.
+        """
+
+        cols, size = self.maze.cols, self.cluster_size
+        return (index % cols) // size + (index // cols) // size * self._cluster_cols
+
+    def _bounds(self, cluster: int):
+        """
+        Returns the cell bounds (x0, y0, x1, y1) of a cluster, with x1 and y1 exclusive.
+        """
+
+        size = self.cluster_size
+        x0 = cluster % self._cluster_cols * size
+        y0 = cluster // self._cluster_cols * size
+        return x0, y0, min(x0 + size, self.maze.cols), min(y0 + size, self.maze.rows)
+
+    def _on_wall_change(self, a: int, b: int, is_open: bool):
+        """
+        Maze listener: drops the cached tables of the clusters on both sides of the changed wall.
+        """
+
+        self._tables.pop(self._cluster_of(a), None)
+        self._tables.pop(self._cluster_of(b), None)
+
+    def _on_weight_change(self, index: int, old_weight: int, weight: int):
+        """
+        Weight listener: drops the cached table of the cluster containing the cell. Crossings into the
+        cell are priced when a query reads them, so other clusters keep their tables.
+        """
+
+        # The first weight switches an unweighted maze to its own weights array
+        self._weights = self.maze.weights
+        self._min_weight = min(self._min_weight, weight)
+        self._tables.pop(self._cluster_of(index), None)
+
+    def _crossings(self, index: int):
+        """
+        Returns the open neighbors of a cell that lie in another cluster, with the cost of stepping into them.
+        """
+
+        cluster = self._cluster_of(index)
+        return [(neighbor, self._weights[neighbor]) for neighbor in self.maze.open_neighbors(index)
+                if self._cluster_of(neighbor) != cluster]
+
+    def _cluster_search(self, sources, cluster: int, targets=None, reverse: bool = False):
+        """
+        Dijkstra search that never leaves one cluster.
+
+        Args:
+        - sources (Iterable[int]): The cells the search starts from, at cost 0.
+        - cluster (int): The cluster the search is restricted to.
+        - targets (Iterable[int]): Optional cells after whose settlement the search stops early.
+        - reverse (bool): If True, costs are measured from each cell to the sources instead.
+
+        Returns:
+        - dist (Dict[int, int]): The cost of every settled cell.
+        - parent (Dict[int, int]): The predecessor of every reached cell (-1 for the sources).
+        - settled (int): The number of cells settled.
+        """
+
+        cols = self.maze.cols
+        walls = self.maze.walls
+        weights = self._weights
+        x0, y0, x1, y1 = self._bounds(cluster)
+
+        dist = {}
+        parent = {}
+        best = {}
+        heap = []
+        for s in sources:
+            best[s] = 0
+            parent[s] = -1
+            heap.append((0, s))
+        heapq.heapify(heap)
+        remaining = set(targets) if targets is not None else None
+
+        while heap:
+            d, u = heapq.heappop(heap)
+            if u in dist:
+                continue
+            dist[u] = d
+            if remaining is not None:
+                remaining.discard(u)
+                if not remaining:
+                    break
+
+            # Relax the open neighbors inside the cluster
+            x, y = u % cols, u // cols
+            w = walls[u]
+            for wall, offset, inside in ((TOP, -cols, y > y0), (RIGHT, 1, x < x1 - 1),
+                                         (BOTTOM, cols, y < y1 - 1), (LEFT, -1, x > x0)):
+                if not inside or w & wall:
+                    continue
+                v = u + offset
+                if v in dist:
+                    continue
+                nd = d + (weights[u] if reverse else weights[v])
+                if nd < best.get(v, nd + 1):
+                    best[v] = nd
+                    parent[v] = u
+                    heapq.heappush(heap, (nd, v))
+
+        return dist, parent, len(dist)
+
+    def _table(self, cluster: int):
+        """
+        Returns the cached table of a cluster, building it first if needed.
+
+        Returns:
+        - entrances (List[int]): The cells of the cluster with an open crossing to another cluster.
+        - edges (Dict[int, List[Tuple[int, int]]]): Every entrance mapped to the other entrances it
+          can reach inside the cluster, with the cost.
+        """
+
+        table = self._tables.get(cluster)
+        if table is not None:
+            return table
+
+        # Entrances are the border cells with an open wall towards another cluster
+        x0, y0, x1, y1 = self._bounds(cluster)
+        cols = self.maze.cols
+        border = set()
+        for x in range(x0, x1):
+            border.add(x + y0 * cols)
+            border.add(x + (y1 - 1) * cols)
+        for y in range(y0, y1):
+            border.add(x0 + y * cols)
+            border.add(x1 - 1 + y * cols)
+        entrances = sorted(cell for cell in border if self._crossings(cell))
+
+        # Entrance-to-entrance costs inside the cluster
+        edges = {}
+        for entrance in entrances:
+            dist, _, _ = self._cluster_search([entrance], cluster, entrances)
+            edges[entrance] = [(other, dist[other]) for other in entrances if other != entrance and other in dist]
+
+        table = self._tables[cluster] = (entrances, edges)
+        self.tables_built += 1
+        return table
+
+    def precompute(self):
+        """
+        Builds the tables of every cluster up front instead of on first use.
+        """
+
+        for cluster in range(self._cluster_cols * self._cluster_rows):
+            self._table(cluster)
+
+    def _heuristic(self, a: int, b: int):
+        """
+        Returns the Manhattan distance between two cells scaled by the smallest weight (admissible).
+        """
+
+        cols = self.maze.cols
+        return (abs(a % cols - b % cols) + abs(a // cols - b // cols)) * self._min_weight
+
+    def solve(self, start: int = 0, goal: int = None, stats: SearchStats = None, reachability: ReachabilityIndex = None):
+        """
+        Finds a cheapest path with an abstract search over cluster entrances, then refines it into cells.
+
+        Args:
+        - start (int): The index of the start cell.
+        - goal (int): The index of the destination cell (defaults to the last cell).
+        - stats (SearchStats): Optional collector for hot-path counters and phase timings. Counters
+          cover the abstract search.
+        - reachability (ReachabilityIndex): Optional component index used to reject unreachable goals
+          without searching.
+
+        Returns:
+        - path (List[int]): The cell indices of a cheapest path from start to goal else None
+        - visited_cells_count (int): The number of abstract nodes expanded plus the cells settled while
+          connecting the start and goal and refining the route.
+        """
+
+        # Fall back to the no-op collector; hooks are skipped entirely when it is disabled
+        if stats is None:
+            stats = NULL_STATS
+        record = stats.enabled
+        stats.begin_phase("setup")
+
+        if goal is None:
+            goal = len(self.maze) - 1
+
+        # Give up at once when the index puts the goal in another component
+        if reachability is not None and not reachability.reachable(start, goal):
+            stats.end_phase()
+            return None, 0
+
+        start_cluster = self._cluster_of(start)
+        goal_cluster = self._cluster_of(goal)
+        start_entrances, _ = self._table(start_cluster)
+        goal_entrances, _ = self._table(goal_cluster)
+
+        # Connect the start to the entrances of its cluster (and to the goal if they share a cluster)
+        targets = list(start_entrances) + ([goal] if goal_cluster == start_cluster else [])
+        dist, _, visited_cells_count = self._cluster_search([start], start_cluster, targets)
+        start_edges = [(cell, dist[cell]) for cell in targets if cell in dist and cell != start]
+
+        # Connect the entrances of the goal cluster to the goal
+        dist, _, settled = self._cluster_search([goal], goal_cluster, goal_entrances, reverse=True)
+        visited_cells_count += settled
+        to_goal = {cell: dist[cell] for cell in goal_entrances if cell in dist and cell != goal}
+
+        # A* over the abstract graph of entrances
+        stats.begin_phase("search")
+        g_cost = {start: 0}
+        parent = {start: None}
+        closed = set()
+        open_set = [(self._heuristic(start, goal), start)]
+        if record:
+            stats.record_push(len(open_set))
+        found = start == goal
+
+        while open_set and not found:
+            _, u = heapq.heappop(open_set)
+            if record:
+                stats.record_pop()
+            if u in closed:
+                if record:
+                    stats.record_stale()
+                continue
+            closed.add(u)
+            visited_cells_count += 1
+            if u == goal:
+                found = True
+                break
+
+            # Abstract edges: inside the cluster, across a crossing, and into the goal
+            if u == start:
+                neighbors = list(start_edges)
+            else:
+                neighbors = list(self._table(self._cluster_of(u))[1].get(u, ()))
+                if u in to_goal:
+                    neighbors.append((goal, to_goal[u]))
+            neighbors.extend(self._crossings(u))
+            if record:
+                stats.record_neighbors(len(neighbors))
+
+            for v, cost in neighbors:
+                if v in closed:
+                    continue
+                tentative_g_cost = g_cost[u] + cost
+                if tentative_g_cost < g_cost.get(v, tentative_g_cost + 1):
+                    g_cost[v] = tentative_g_cost
+                    parent[v] = u
+                    heapq.heappush(open_set, (tentative_g_cost + self._heuristic(v, goal), v))
+                    if record:
+                        stats.record_push(len(open_set))
+
+        if not found:
+            stats.end_phase()
+            return None, visited_cells_count
+
+        # Refine the abstract route: crossings are single steps, cluster segments need a local search
+        stats.begin_phase("reconstruct")
+        route = [goal]
+        while parent[route[-1]] is not None:
+            route.append(parent[route[-1]])
+        route.reverse()
+
+        path = [start]
+        for u, v in zip(route, route[1:]):
+            cluster = self._cluster_of(u)
+            if self._cluster_of(v) != cluster:
+                path.append(v)
+                continue
+            _, local_parent, settled = self._cluster_search([u], cluster, [v])
+            visited_cells_count += settled
+            segment = [v]
+            while local_parent[segment[-1]] != -1:
+                segment.append(local_parent[segment[-1]])
+            path.extend(reversed(segment[:-1]))
+        stats.end_phase()
+
+        return path, visited_cells_count
@@ -0,0 +1,317 @@
+from __future__ import annotations
+from collections import OrderedDict  # For the bounded transposition table
+from maze import Maze
+from instrumentation import SearchStats, NULL_STATS
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import pygame
+    from cell import Cell
+    from reachability import ReachabilityIndex
+    from export import SearchResult
+
+def solve_maze_IDA_star(grid_cells: list[Cell], sc: pygame.Surface, transposition_size: int = 0, stats: SearchStats = None):
+    """
+    Solve the maze using Iterative Deepening A* (IDA*). Each iteration is a depth-first search that
+    prunes every cell whose f cost (steps taken + Manhattan distance to the destination) exceeds the
+    current bound; the next bound is the smallest f cost that was pruned. Only the current path and
+    the unexplored neighbors of its cells are kept, so memory grows with the path depth instead of
+    with the size of the maze.
+
+    The `visited` flag of a cell marks that it lies on the current path, which keeps the depth-first
+    search from walking in circles without any extra bookkeeping.
+
+    Args:
+    - grid_cells (List[Cell]): A list of all cells in the maze.
+    - sc (pygame.Surface): The pygame screen surface used for visualizing the search, or None to
+      search without drawing.
+    - transposition_size (int): Maximum number of entries in the transposition table, which remembers
+      the cheapest cost each cell was reached with during the current iteration and prunes costlier
+      revisits. The least recently used entries are evicted first; 0 disables the table.
+    - stats (SearchStats): Optional collector for hot-path counters and phase timings. The queue
+      high-water mark is the deepest path explored.
+
+    Returns:
+    - path (List[Cell]): A list of cells representing the solution path from the start to the
+      destination else None
+    - visited_cells_count (int): The total number of cells expanded over all iterations.
+    """
+
+    import pygame
+    from utils import manhattan_distance, draw_text_of_running_alg, draw_button
+    from config import FONT, BUTTON_COLOR
+
+    # Fall back to the no-op collector; hooks are skipped entirely when it is disabled
+    if stats is None:
+        stats = NULL_STATS
+    record = stats.enabled
+    stats.begin_phase("setup")
+
+    # Define the start and destination cells
+    start_cell = grid_cells[0]
+    destination_cell = grid_cells[-1]
+
+    # The first bound is the heuristic estimate of the start cell
+    bound = manhattan_distance(start_cell, destination_cell)
+
+    # Counter to track number of expanded cells over all iterations
+    visited_cells_count = 0
+
+    # Main IDA* loop: one bounded depth-first search per iteration
+    stats.begin_phase("search")
+    while True:
+        # Smallest f cost that exceeded the bound in this iteration
+        next_bound = float('inf')
+        table = OrderedDict() if transposition_size > 0 else None
+
+        # The current path, and for each cell on it an iterator over its unexplored neighbors
+        path = [start_cell]
+        start_cell.visited = True
+        visited_cells_count += 1
+        if record:
+            stats.record_push(len(path))
+        if start_cell == destination_cell:
+            break
+        neighbors = start_cell.check_neighbors_for_search(grid_cells)
+        if record:
+            stats.record_neighbors(len(neighbors))
+        frames = [iter(neighbors)]
+
+        found = False
+        while frames:
+            neighbor = next(frames[-1], None)
+
+            # All neighbors of the deepest cell are explored: backtrack
+            if neighbor is None:
+                frames.pop()
+                cell = path.pop()
+                cell.visited = False
+                if record:
+                    stats.record_pop()
+                if sc is not None:
+                    cell.draw(sc)
+                continue
+
+            # Prune the neighbor if its f cost exceeds the bound, remembering the smallest such cost
+            g = len(path)
+            f = g + manhattan_distance(neighbor, destination_cell)
+            if f > bound:
+                if f < next_bound:
+                    next_bound = f
+                continue
+
+            # Prune the neighbor if it was already reached at least as cheaply in this iteration
+            if table is not None:
+                best_g = table.get(neighbor)
+                if best_g is not None and best_g <= g:
+                    continue
+                table[neighbor] = g
+                table.move_to_end(neighbor)
+                if len(table) > transposition_size:
+                    table.popitem(last=False)
+
+            # Extend the path with the neighbor
+            neighbor.visited = True
+            path.append(neighbor)
+            visited_cells_count += 1
+            if record:
+                stats.record_push(len(path))
+            if sc is not None:
+                neighbor.draw(sc)
+                pygame.display.flip()
+
+            # If we reached the destination, the current path is the solution
+            if neighbor == destination_cell:
+                found = True
+                break
+
+            neighbors = neighbor.check_neighbors_for_search(grid_cells)
+            if record:
+                stats.record_neighbors(len(neighbors))
+            frames.append(iter(neighbors))
+
+        if found:
+            break
+
+        # Display the current state of the algorithm once per iteration
+        if sc is not None:
+            for cell in grid_cells:
+                cell.draw(sc)
+            draw_text_of_running_alg(sc, "RUNNING: IDA Star", FONT, 17, 20, 230, "#FFFFFF")
+            draw_text_of_running_alg(sc, "CELLS EXPLORED: " + str(visited_cells_count), FONT, 17, 20, 260, "#FFFFFF")
+            draw_button(sc, "GENERATE MAZE", 20, 300, BUTTON_COLOR)
+            draw_button(sc, "BFS", 20, 400, BUTTON_COLOR)
+            draw_button(sc, "DFS", 20, 350, BUTTON_COLOR)
+            draw_button(sc, "BIDIRECTIONAL BFS", 20, 450, BUTTON_COLOR)
+            draw_button(sc, "A STAR", 20, 500, BUTTON_COLOR)
+            draw_button(sc, "GBFS", 20, 550, BUTTON_COLOR)
+            draw_button(sc, "IDA STAR", 20, 600, BUTTON_COLOR)
+            draw_button(sc, "IDDFS", 20, 650, BUTTON_COLOR)
+            pygame.time.delay(60)
+            pygame.display.flip()
+
+        # No cell was pruned by the bound: the destination is unreachable
+        if next_bound == float('inf'):
+            stats.end_phase()
+            return None, visited_cells_count
+        bound = next_bound
+
+    # Mark the cells of the solution path
+    stats.begin_phase("reconstruct")
+    for cell in path:
+        cell.is_solution = True
+        if sc is not None:
+            cell.draw(sc)
+            pygame.display.flip()
+    stats.end_phase()
+
+    return path, visited_cells_count
+
+def ida_star_search(maze: Maze, start: int = 0, goal: int = None, stats: SearchStats = None, reachability: ReachabilityIndex = None,
+                    result: SearchResult = None, transposition_size: int = 0):
+    """
+    Solve a packed maze using Iterative Deepening A*, without drawing. Like `solve_maze_IDA_star`, every
+    iteration is a depth-first search bounded by the f cost (steps taken + Manhattan distance to the
+    goal), and only the current path, the cells on it and an iterator over the unexplored neighbors of
+    each of them are kept: the search has no per-cell arrays, so its memory grows with the path depth
+    instead of with the size of the maze. Steps are counted like `bfs_search`; cell weights are ignored.
+
+    Args:
+    - maze (Maze): The packed maze.
+    - start (int): The index of the start cell.
+    - goal (int): The index of the destination cell (defaults to the last cell).
+    - stats (SearchStats): Optional collector for hot-path counters and phase timings. The queue
+      high-water mark is the deepest path explored.
+    - reachability (ReachabilityIndex): Optional component index used to reject unreachable goals
+      without searching.
+    - result (SearchResult): Optional object that receives the visit order without copying; the
+      search keeps no per-cell arrays, so its `dist` and `parent` stay None.
+    - transposition_size (int): Maximum number of entries in the transposition table (see
+      `solve_maze_IDA_star`); 0 disables the table.
+
+    Returns:
+    - path (List[int]): The cell indices of a shortest path from start to goal else None
+    - visited_cells_count (int): The total number of cells expanded over all iterations.
+    """
+
+    # Fall back to the no-op collector; hooks are skipped entirely when it is disabled
+    if stats is None:
+        stats = NULL_STATS
+    record = stats.enabled
+    stats.begin_phase("setup")
+
+    n = len(maze)
+    if goal is None:
+        goal = n - 1
+
+    # Give up at once when the index puts the goal in another component
+    if reachability is not None and not reachability.reachable(start, goal):
+        stats.end_phase()
+        return None, 0
+
+    cols = maze.cols
+    goal_x, goal_y = goal % cols, goal // cols
+
+    # Hand the visit order to the caller; expanded cells are appended to it, together with the
+    # depth of the path at that moment
+    order = None
+    frontier = None
+    if result is not None:
+        result.attach(maze)
+        order = result.order
+        frontier = result.frontier
+
+    # The first bound is the heuristic estimate of the start cell
+    bound = abs(start % cols - goal_x) + abs(start // cols - goal_y)
+
+    # Counter to track number of expanded cells over all iterations
+    visited_cells_count = 0
+
+    # Main IDA* loop: one bounded depth-first search per iteration
+    stats.begin_phase("search")
+    while True:
+        # Smallest f cost that exceeded the bound in this iteration
+        next_bound = float('inf')
+        table = OrderedDict() if transposition_size > 0 else None
+
+        # The current path, the cells on it, and for each of them an iterator over its unexplored neighbors
+        path = [start]
+        on_path = {start}
+        visited_cells_count += 1
+        if record:
+            stats.record_push(len(path))
+        if order is not None:
+            order.append(start)
+            frontier.append(len(path))
+        if start == goal:
+            break
+        neighbors = maze.open_neighbors(start)
+        if record:
+            stats.record_neighbors(len(neighbors))
+        frames = [iter(neighbors)]
+
+        found = False
+        while frames:
+            neighbor = next(frames[-1], None)
+
+            # All neighbors of the deepest cell are explored: backtrack
+            if neighbor is None:
+                frames.pop()
+                on_path.discard(path.pop())
+                if record:
+                    stats.record_pop()
+                continue
+
+            # Keep the depth-first search from walking in circles
+            if neighbor in on_path:
+                continue
+
+            # Prune the neighbor if its f cost exceeds the bound, remembering the smallest such cost
+            g = len(path)
+            f = g + abs(neighbor % cols - goal_x) + abs(neighbor // cols - goal_y)
+            if f > bound:
+                if f < next_bound:
+                    next_bound = f
+                continue
+
+            # Prune the neighbor if it was already reached at least as cheaply in this iteration
+            if table is not None:
+                best_g = table.get(neighbor)
+                if best_g is not None and best_g <= g:
+                    continue
+                table[neighbor] = g
+                table.move_to_end(neighbor)
+                if len(table) > transposition_size:
+                    table.popitem(last=False)
+
+            # Extend the path with the neighbor
+            path.append(neighbor)
+            on_path.add(neighbor)
+            visited_cells_count += 1
+            if record:
+                stats.record_push(len(path))
+            if order is not None:
+                order.append(neighbor)
+                frontier.append(len(path))
+
+            # If we reached the destination, the current path is the solution
+            if neighbor == goal:
+                found = True
+                break
+
+            neighbors = maze.open_neighbors(neighbor)
+            if record:
+                stats.record_neighbors(len(neighbors))
+            frames.append(iter(neighbors))
+
+        if found:
+            break
+
+        # No cell was pruned by the bound: the destination is unreachable
+        if next_bound == float('inf'):
+            stats.end_phase()
+            return None, visited_cells_count
+        bound = next_bound
+
+    stats.end_phase()
+    return path, visited_cells_count
@@ -0,0 +1,199 @@
+import heapq  # For priority queue functionality
+from collections import deque
+from tiles import TiledMaze
+from instrumentation import SearchStats, NULL_STATS
+from parentcodes import ParentCodes, parent_moves
+
+def tiled_bfs_search(tiles: TiledMaze, start: int = 0, goal: int = None, prefetch: bool = True, stats: SearchStats = None):
+    """
+    Solve a disk-backed maze using Breadth-First Search. Walls are looked up through the tile cache
+    and the parent of every reached cell is kept as a 2-bit direction code in a `ParentCodes` table,
+    so the search state takes 3 bits per cell of the maze (37.5 MB for 10^8 cells) plus the queue.
+
+    Args:
+    - tiles (TiledMaze): The tiled maze.
+    - start (int): The index of the start cell.
+    - goal (int): The index of the destination cell (defaults to the last cell).
+    - prefetch (bool): Start reading the tile across a tile border as soon as the frontier crosses it.
+    - stats (SearchStats): Optional collector for hot-path counters and phase timings.
+
+    Returns:
+    - path (List[int]): The cell indices of a shortest path from start to goal else None
+    - visited_cells_count (int): The total number of cells visited during the search.
+    """
+
+    # Fall back to the no-op collector; hooks are skipped entirely when it is disabled
+    if stats is None:
+        stats = NULL_STATS
+    record = stats.enabled
+    stats.begin_phase("setup")
+
+    if goal is None:
+        goal = len(tiles) - 1
+    tile_of = tiles.tile_of
+
+    # Wall, neighbor offset and the code the neighbor stores for the current cell
+    moves = parent_moves(tiles.cols)
+    parents = ParentCodes(tiles.cols, len(tiles))
+    codes = parents.codes
+    reached = parents.reached_bits
+
+    queue = deque([start])
+    parents.reach(start)
+    if record:
+        stats.record_push(len(queue))
+
+    # Counter to track number of visited cells
+    visited_cells_count = 0
+
+    # Main BFS loop
+    stats.begin_phase("search")
+    found = False
+    while queue:
+        current = queue.popleft()
+        if record:
+            stats.record_pop()
+        visited_cells_count += 1
+
+        # If we reached the destination, stop and reconstruct the path
+        if current == goal:
+            found = True
+            break
+
+        w = tiles.walls_at(current)
+        current_tile = tile_of(current) if prefetch else -1
+        for wall, offset, code in moves:
+            if w & wall:
+                continue
+            neighbor = current + offset
+            if record:
+                stats.record_neighbors(1)
+            bit = 1 << (neighbor & 7)
+            if reached[neighbor >> 3] & bit:
+                continue
+            reached[neighbor >> 3] |= bit
+            codes[neighbor >> 2] |= code << ((neighbor & 3) << 1)
+            queue.append(neighbor)
+            if record:
+                stats.record_push(len(queue))
+
+            # The frontier crossed into another tile: read it before the search gets there
+            if prefetch:
+                neighbor_tile = tile_of(neighbor)
+                if neighbor_tile != current_tile:
+                    tiles.prefetch(neighbor_tile)
+
+    if not found:
+        stats.end_phase()
+        return None, visited_cells_count
+
+    stats.begin_phase("reconstruct")
+    path = parents.path(start, goal)
+    stats.end_phase()
+    return path, visited_cells_count
+
+def tiled_astar_search(tiles: TiledMaze, start: int = 0, goal: int = None, prefetch: bool = True, stats: SearchStats = None):
+    """
+    Solve a disk-backed maze using the A* algorithm. Costs and heuristic follow `astar_search`, and
+    like `tiled_bfs_search` the walls and weights are read through the tile cache and parents are kept
+    as direction codes. Costs are only stored for the cells reached, in a dictionary that is emptied
+    of each cell as it is expanded, so it holds the open set rather than the explored region.
+
+    Args:
+    - tiles (TiledMaze): The tiled maze.
+    - start (int): The index of the start cell.
+    - goal (int): The index of the destination cell (defaults to the last cell).
+    - prefetch (bool): Start reading the tile across a tile border as soon as the frontier crosses it.
+    - stats (SearchStats): Optional collector for hot-path counters and phase timings.
+
+    Returns:
+    - path (List[int]): The cell indices of a cheapest path from start to goal else None
+    - visited_cells_count (int): The total number of cells expanded during the search.
+    """
+
+    # Fall back to the no-op collector; hooks are skipped entirely when it is disabled
+    if stats is None:
+        stats = NULL_STATS
+    record = stats.enabled
+    stats.begin_phase("setup")
+
+    if goal is None:
+        goal = len(tiles) - 1
+    cols = tiles.cols
+    min_weight = tiles.min_weight()
+    goal_x, goal_y = goal % cols, goal // cols
+    tile_of = tiles.tile_of
+
+    # Wall, neighbor offset and the code the neighbor stores for the current cell
+    moves = parent_moves(cols)
+    parents = ParentCodes(cols, len(tiles))
+
+    # Costs of the open cells, and one bit per expanded cell
+    g_cost = {start: 0}
+    closed = bytearray((len(tiles) + 7) // 8)
+    parents.reach(start)
+    h = (abs(start % cols - goal_x) + abs(start // cols - goal_y)) * min_weight
+    open_set = [(h, h, start)]
+    if record:
+        stats.record_push(len(open_set))
+
+    # Counter to track number of expanded cells
+    visited_cells_count = 0
+
+    # Main loop for A* search
+    stats.begin_phase("search")
+    found = False
+    while open_set:
+        _, _, current = heapq.heappop(open_set)
+        if record:
+            stats.record_pop()
+
+        # Skip stale entries: the cell was already expanded through a cheaper entry
+        closed_bit = 1 << (current & 7)
+        if closed[current >> 3] & closed_bit:
+            if record:
+                stats.record_stale()
+            continue
+        closed[current >> 3] |= closed_bit
+        visited_cells_count += 1
+
+        # If we reached the destination, stop and reconstruct the path
+        if current == goal:
+            found = True
+            break
+
+        # The cost of an expanded cell is final and no longer needed once its neighbors are relaxed
+        g = g_cost.pop(current)
+        w = tiles.walls_at(current)
+        current_tile = tile_of(current) if prefetch else -1
+        for wall, offset, code in moves:
+            if w & wall:
+                continue
+            neighbor = current + offset
+            if record:
+                stats.record_neighbors(1)
+            if closed[neighbor >> 3] & (1 << (neighbor & 7)):
+                continue
+            tentative_g_cost = g + tiles.weight_at(neighbor)
+            if tentative_g_cost < g_cost.get(neighbor, tentative_g_cost + 1):
+                g_cost[neighbor] = tentative_g_cost
+                parents.set(neighbor, code)
+                h = (abs(neighbor % cols - goal_x) + abs(neighbor // cols - goal_y)) * min_weight
+                heapq.heappush(open_set, (tentative_g_cost + h, h, neighbor))
+                if record:
+                    stats.record_push(len(open_set))
+
+                # The frontier crossed into another tile: read it before the search gets there
+                if prefetch:
+                    neighbor_tile = tile_of(neighbor)
+                    if neighbor_tile != current_tile:
+                        tiles.prefetch(neighbor_tile)
+
+    if not found:
+        stats.end_phase()
+        return None, visited_cells_count
+
+    stats.begin_phase("reconstruct")
+    path = parents.path(start, goal)
+    stats.end_phase()
+    return path, visited_cells_count
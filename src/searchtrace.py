@@ -0,0 +1,215 @@
+import struct
+from array import array
+from export import SearchResult
+
+# File header: magic, format version, cols, rows, start, goal, walls flag, algorithm name length
+HEADER = struct.Struct("<4sHIIiiBB")
+MAGIC = b"MZTR"
+VERSION = 1
+
+# Section header: number of values, number of bytes
+SECTION = struct.Struct("<II")
+
+def encode_deltas(values):
+    """
+    Encodes integers as the differences between neighbors, each zigzag-mapped to an unsigned number
+    and written as a little-endian base-128 varint. Consecutive cells of a search are usually close
+    to each other, so most steps take one or two bytes instead of eight.
+
+    Args:
+    - values (Iterable[int]): The integers to encode.
+
+    Returns:
+    - data (bytes): The encoded values.
+    """
+
+    data = bytearray()
+    previous = 0
+    for value in values:
+        delta = value - previous
+        previous = value
+        # Zigzag: 0, -1, 1, -2, ... become 0, 1, 2, 3, ...
+        code = delta << 1 if delta >= 0 else (-delta << 1) - 1
+        while code >= 0x80:
+            data.append(code & 0x7F | 0x80)
+            code >>= 7
+        data.append(code)
+    return bytes(data)
+
+
+def decode_deltas(data, count: int = None):
+    """
+    Decodes integers written by `encode_deltas`.
+
+    Args:
+    - data (bytes-like): The encoded values.
+    - count (int): The number of values, used to size the output at once when known.
+
+    Returns:
+    - values (array): The decoded integers.
+    """
+
+    values = array('l', [0]) * count if count is not None else array('l')
+    position = 0
+    previous = 0
+    code = 0
+    shift = 0
+    for byte in data:
+        code |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        previous += code >> 1 if not code & 1 else -((code + 1) >> 1)
+        if count is not None:
+            values[position] = previous
+        else:
+            values.append(previous)
+        position += 1
+        code = 0
+        shift = 0
+    return values
+
+
+class SearchTrace:
+    """
+    A recorded headless search: the cells in the order they were settled, the frontier size at each
+    of those steps and the final path, plus the walls of the maze so the trace can be replayed on
+    its own. Step i of a replay shows `order[:i]` as explored; the arrays allow random access, so a
+    replay can show any step without running the search again.
+
+    On disk every integer array is delta-encoded (see `encode_deltas`), so a step of a typical search
+    takes three or four bytes for the cell and the frontier size together.
+
+    Attributes:
+    - cols (int): The number of columns of the maze.
+    - rows (int): The number of rows of the maze.
+    - algorithm (str): The name of the solver that produced the trace.
+    - start (int): The index of the start cell.
+    - goal (int): The index of the destination cell.
+    - order (array): The indices of the cells in the order the search settled them.
+    - frontier (array): The frontier size when each cell of `order` was settled.
+    - path (array): The cells of the path found, empty if the goal was unreachable.
+    - walls (bytes or None): The wall bits of the maze, if recorded.
+    """
+
+    def __init__(self, cols: int, rows: int, algorithm: str = "", start: int = 0, goal: int = -1,
+                 order=None, frontier=None, path=None, walls=None):
+        self.cols = cols
+        self.rows = rows
+        self.algorithm = algorithm
+        self.start = start
+        self.goal = goal
+        self.order = order if order is not None else array('l')
+        self.frontier = frontier if frontier is not None else array('l')
+        self.path = path if path is not None else array('l')
+        self.walls = walls
+
+    def __len__(self):
+        return len(self.order)
+
+    @classmethod
+    def from_result(cls, maze, algorithm: str, start: int, goal: int, path, result: SearchResult, walls: bool = True):
+        """
+        Builds a trace from the `SearchResult` a headless search filled in.
+
+        Args:
+        - maze (Maze): The searched maze.
+        - algorithm (str): The name of the solver.
+        - start (int): The index of the start cell.
+        - goal (int): The index of the destination cell.
+        - path (List[int]): The path the search returned, or None.
+        - result (SearchResult): The result passed to the search.
+        - walls (bool): Store a copy of the walls so the trace replays without the maze.
+
+        Returns:
+        - trace (SearchTrace): The trace, sharing the order and frontier arrays of `result`.
+        """
+
+        return cls(maze.cols, maze.rows, algorithm, start, goal, result.order, result.frontier,
+                   array('l', path or ()), bytes(maze.walls) if walls else None)
+
+    def to_bytes(self):
+        """
+        Encodes the trace in its compact file format.
+        """
+
+        name = self.algorithm.encode()
+        parts = [HEADER.pack(MAGIC, VERSION, self.cols, self.rows, self.start, self.goal, self.walls is not None, len(name)), name]
+        if self.walls is not None:
+            parts.append(self.walls)
+        for values in (self.order, self.frontier, self.path):
+            data = encode_deltas(values)
+            parts.append(SECTION.pack(len(values), len(data)))
+            parts.append(data)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Decodes a trace written by `to_bytes`.
+        """
+
+        data = memoryview(data)
+        magic, version, cols, rows, start, goal, has_walls, name_size = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a search trace")
+        position = HEADER.size
+        algorithm = bytes(data[position:position + name_size]).decode()
+        position += name_size
+        walls = None
+        if has_walls:
+            walls = bytes(data[position:position + cols * rows])
+            position += cols * rows
+
+        sections = []
+        for _ in range(3):
+            count, size = SECTION.unpack_from(data, position)
+            position += SECTION.size
+            sections.append(decode_deltas(data[position:position + size], count))
+            position += size
+        order, frontier, path = sections
+        return cls(cols, rows, algorithm, start, goal, order, frontier, path, walls)
+
+    def save(self, path: str):
+        """
+        Writes the trace to a file.
+        """
+
+        with open(path, "wb") as file:
+            file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str):
+        """
+        Reads a trace written by `save`.
+        """
+
+        with open(path, "rb") as file:
+            return cls.from_bytes(file.read())
+
+
+def record_trace(maze, algorithm: str, start: int = 0, goal: int = None, walls: bool = True):
+    """
+    Runs a headless solver and records its trace. Recording only appends two integers per settled
+    cell to arrays, so the search runs at nearly full speed; encoding happens when the trace is saved.
+
+    Args:
+    - maze (Maze): The packed maze.
+    - algorithm (str): One of the keys of `headless.SOLVERS`.
+    - start (int): The index of the start cell.
+    - goal (int): The index of the destination cell (defaults to the last cell).
+    - walls (bool): Store a copy of the walls in the trace.
+
+    Returns:
+    - trace (SearchTrace): The recorded search.
+    - visited_cells_count (int): The visited cells count returned by the solver.
+    """
+
+    # Imported here so loading a trace for replay does not need the solver registry
+    from headless import load_solver
+
+    if goal is None:
+        goal = len(maze) - 1
+    result = SearchResult()
+    path, visited_cells_count = load_solver(algorithm)(maze, start, goal, result=result)
+    return SearchTrace.from_result(maze, algorithm, start, goal, path, result, walls), visited_cells_count
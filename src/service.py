@@ -0,0 +1,458 @@
+import json
+import asyncio
+import argparse
+import itertools
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from maze import Maze, generate_packed_maze, braid_maze
+from search.dijkstra import multi_target_search
+
+# Seconds a solve request waits for other requests against the same maze and start cell
+BATCH_WINDOW = 0.002
+
+# Pending connections the listening socket accepts, sized for thousands of concurrent clients
+BACKLOG = 4096
+
+# Largest number of columns or rows of a generated maze
+MAX_SIDE = 4096
+
+# Cells kept by the service and by each worker; the least recently used mazes are dropped beyond it
+MAX_CACHED_CELLS = 1 << 26
+
+# Largest request body accepted, in bytes
+MAX_BODY = 1 << 16
+
+# Solvers that can be requested by name besides the batched Dijkstra search
+SOLVERS = {"astar": ("search.astar", "astar_search"),
+           "gbfs": ("search.gbfs", "gbfs_search")}
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+           500: "Internal Server Error"}
+
+class ServiceError(Exception):
+    """
+    An error reported to the client with an HTTP status code.
+    """
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _cache_maze(mazes: OrderedDict, maze_id: int, maze: Maze):
+    """
+    Stores a maze as the most recently used one and drops the least recently used mazes until the
+    cache holds at most `MAX_CACHED_CELLS` cells. The newest maze is always kept.
+
+    Args:
+    - mazes (OrderedDict): The mazes by id, least recently used first.
+    - maze_id (int): The id of the maze in the service.
+    - maze (Maze): The maze to store.
+    """
+
+    mazes[maze_id] = maze
+    mazes.move_to_end(maze_id)
+    cells = sum(len(cached) for cached in mazes.values())
+    while cells > MAX_CACHED_CELLS and len(mazes) > 1:
+        cells -= len(mazes.popitem(last=False)[1])
+
+
+class _MazeNotCached(Exception):
+    """
+    Raised by a job in a worker process that has not received the maze yet, so the service sends it
+    along with the retry.
+    """
+
+
+# Jobs executed in the worker processes. Each worker keeps the mazes it has seen by id, so a job
+# only carries the maze id and its query, and a maze is pickled at most once per worker unless it
+# was dropped from the worker's cache in between.
+_worker_mazes = OrderedDict()
+
+def _worker_maze(maze_id: int, data):
+    """
+    Returns the maze cached in this worker under `maze_id`, caching `data` first if it is given.
+
+    Args:
+    - maze_id (int): The id of the maze in the service.
+    - data (tuple): None, or the (cols, rows, walls, weights) of the maze.
+    """
+
+    if data is not None:
+        _cache_maze(_worker_mazes, maze_id, Maze.from_bytes(*data))
+    maze = _worker_mazes.get(maze_id)
+    if maze is None:
+        raise _MazeNotCached(maze_id)
+    _worker_mazes.move_to_end(maze_id)
+    return maze
+
+
+def _generate_job(maze_id: int, cols: int, rows: int, seed, braid: float, max_weight: int):
+    """
+    Generates a packed maze in a worker process and caches it there.
+
+    Returns:
+    - walls (bytes): The wall bytes of the maze.
+    - weights (bytes or None): The weight bytes of the maze, if it is weighted.
+    """
+
+    maze = generate_packed_maze(cols, rows, seed)
+    if braid > 0:
+        braid_maze(maze, braid, seed)
+    if max_weight > 1:
+        maze.randomize_weights(max_weight, seed)
+    _cache_maze(_worker_mazes, maze_id, maze)
+    return bytes(maze.walls), None if maze.weights is None else bytes(maze.weights)
+
+
+def _batch_job(maze_id: int, data, start: int, goals):
+    """
+    Solves every goal of a batch with one multi-target Dijkstra search in a worker process.
+
+    Returns:
+    - paths (Dict[int, List[int]]): Every goal mapped to its path, or None if it is unreachable.
+    - visited_cells_count (int): The number of cells settled by the shared search.
+    """
+
+    return multi_target_search(_worker_maze(maze_id, data), start, goals)
+
+
+def _solve_job(maze_id: int, data, algorithm: str, start: int, goal: int):
+    """
+    Solves a single query with one of the `SOLVERS` in a worker process.
+
+    Returns:
+    - path (List[int]): The path from start to goal else None
+    - visited_cells_count (int): The number of cells expanded.
+    """
+
+    module_name, function_name = SOLVERS[algorithm]
+    solver = getattr(__import__(module_name, fromlist=[function_name]), function_name)
+    return solver(_worker_maze(maze_id, data), start, goal)
+
+
+class MazeService:
+    """
+    Asynchronous maze generation and solving service.
+
+    Mazes are kept in memory and referred to by id. Solve requests that arrive within
+    `batch_window` seconds of each other for the same maze and start cell are coalesced into one
+    multi-target Dijkstra search. While a batch is being solved, new requests for the same maze and
+    start collect into the next batch, which starts as soon as the running one finishes, so batches
+    grow with the load instead of queueing up. All generation and solving runs in a process pool,
+    so the event loop only parses requests and routes results. Workers cache the mazes they have
+    been sent, so a query only ships the maze id unless it lands on a worker that has not seen the
+    maze yet. The service and every worker keep at most `MAX_CACHED_CELLS` cells of mazes and drop
+    the least recently used ones beyond that; requests for a dropped maze get a 404.
+
+    Attributes:
+    - mazes (OrderedDict[int, Maze]): The generated mazes by id, least recently used first.
+    - batch_window (float): Seconds a solve request waits for others to join its batch.
+    """
+
+    def __init__(self, workers: int = None, batch_window: float = BATCH_WINDOW):
+        """
+        Initializes the service and its process pool.
+
+        Args:
+        - workers (int): The number of worker processes (defaults to the number of CPUs).
+        - batch_window (float): Seconds a solve request waits for others to join its batch.
+        """
+
+        self.mazes = OrderedDict()
+        self.batch_window = batch_window
+        self._pool = ProcessPoolExecutor(workers)
+        self._ids = itertools.count(1)
+
+        # Open batches: (maze id, start) -> {goal: [futures waiting for that goal]}
+        self._pending = {}
+        # Keys whose batch is being solved right now
+        self._running = set()
+        # Running flush tasks, referenced so they are not garbage collected
+        self._tasks = set()
+
+    def close(self):
+        """
+        Shuts the process pool down.
+        """
+
+        self._pool.shutdown()
+
+    def _maze(self, maze_id):
+        """
+        Returns the maze with the given id or raises a 404 error.
+        """
+
+        maze = self.mazes.get(maze_id)
+        if maze is None:
+            raise ServiceError(404, f"Unknown maze_id: {maze_id!r}")
+        self.mazes.move_to_end(maze_id)
+        return maze
+
+    def _cell(self, maze: Maze, index, name: str):
+        """
+        Validates a cell index of a request or raises a 400 error.
+        """
+
+        # bool is a subclass of int, but `true` is not a cell index
+        if not isinstance(index, int) or isinstance(index, bool) or not 0 <= index < len(maze):
+            raise ServiceError(400, f"{name} must be a cell index between 0 and {len(maze) - 1}")
+        return index
+
+    async def generate(self, cols: int, rows: int, seed=None, braid: float = 0, max_weight: int = 1):
+        """
+        Generates a new maze in the process pool and stores it.
+
+        Args:
+        - cols (int): The number of columns.
+        - rows (int): The number of rows.
+        - seed: Optional seed for a reproducible maze.
+        - braid (float): The share of dead ends to remove (see `maze.braid_maze`).
+        - max_weight (int): If above 1, cells get random traversal costs between 1 and this value.
+
+        Returns:
+        - dict: The new maze id and its dimensions.
+        """
+
+        # bool is a subclass of int, but `true` is not a size
+        if not all(type(value) is int for value in (cols, rows, max_weight)):
+            raise ServiceError(400, "cols, rows and max_weight must be integers")
+        if not 1 <= cols <= MAX_SIDE or not 1 <= rows <= MAX_SIDE:
+            raise ServiceError(400, f"cols and rows must be between 1 and {MAX_SIDE}")
+        if type(braid) not in (int, float) or not 0 <= braid <= 1 or not 1 <= max_weight <= 255:
+            raise ServiceError(400, "braid must be between 0 and 1 and max_weight between 1 and 255")
+
+        # The id is taken up front so the worker that generates the maze can cache it right away
+        maze_id = next(self._ids)
+        loop = asyncio.get_running_loop()
+        walls, weights = await loop.run_in_executor(self._pool, _generate_job, maze_id, cols, rows, seed, braid,
+                                                    max_weight)
+        _cache_maze(self.mazes, maze_id, Maze.from_bytes(cols, rows, walls, weights))
+        return {"maze_id": maze_id, "cols": cols, "rows": rows}
+
+    async def solve(self, maze_id, start: int = 0, goal: int = None, algorithm: str = "dijkstra"):
+        """
+        Solves a query, batching it with concurrent Dijkstra queries against the same maze and start.
+
+        Args:
+        - maze_id (int): The id returned by `generate`.
+        - start (int): The index of the start cell.
+        - goal (int): The index of the destination cell (defaults to the last cell).
+        - algorithm (str): 'dijkstra' (batched), or one of the `SOLVERS`.
+
+        Returns:
+        - dict: The path, its cost, the number of visited cells and the size of the batch it was solved in.
+        """
+
+        maze = self._maze(maze_id)
+        start = self._cell(maze, start, "start")
+        goal = self._cell(maze, len(maze) - 1 if goal is None else goal, "goal")
+        loop = asyncio.get_running_loop()
+
+        if algorithm != "dijkstra":
+            if algorithm not in SOLVERS:
+                raise ServiceError(400, f"Unknown algorithm: {algorithm!r}")
+            path, visited_cells_count = await self._run(_solve_job, maze_id, algorithm, start, goal)
+            return self._result(maze, path, visited_cells_count, 1)
+
+        # Join the open batch for this maze and start cell, or open a new one
+        key = (maze_id, start)
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = self._pending[key] = {}
+            # A batch waits for the running one with the same key instead of starting its own timer
+            if key not in self._running:
+                loop.call_later(self.batch_window, self._start_flush, key)
+        future = loop.create_future()
+        batch.setdefault(goal, []).append(future)
+        return await future
+
+    def _start_flush(self, key):
+        """
+        Closes the batch for `key` and starts solving it.
+        """
+
+        self._running.add(key)
+        task = asyncio.ensure_future(self._flush(key, self._pending.pop(key)))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush(self, key, batch):
+        """
+        Solves a closed batch in the process pool and resolves the futures waiting on it.
+        """
+
+        try:
+            # The maze may have been dropped from the cache while the batch was collecting
+            maze = self._maze(key[0])
+            paths, visited_cells_count = await self._run(_batch_job, key[0], key[1], list(batch))
+        except Exception as error:
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(error)
+            return
+        finally:
+            # Start the batch that collected while this one was being solved
+            self._running.discard(key)
+            if key in self._pending:
+                self._start_flush(key)
+
+        batch_size = sum(len(futures) for futures in batch.values())
+        for goal, futures in batch.items():
+            result = self._result(maze, paths[goal], visited_cells_count, batch_size)
+            for future in futures:
+                if not future.done():
+                    future.set_result(result)
+
+    async def _run(self, job, maze_id: int, *args):
+        """
+        Runs a job on a stored maze in the process pool. Only the maze id is sent at first; a worker
+        that has not cached the maze yet refuses the job, which is then sent again with the maze.
+        """
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._pool, job, maze_id, None, *args)
+        except _MazeNotCached:
+            maze = self._maze(maze_id)
+            data = (maze.cols, maze.rows, bytes(maze.walls), None if maze.weights is None else bytes(maze.weights))
+            return await loop.run_in_executor(self._pool, job, maze_id, data, *args)
+
+    @staticmethod
+    def _result(maze: Maze, path, visited_cells_count: int, batch_size: int):
+        """
+        Builds the JSON response of a solve request.
+        """
+
+        return {"path": path,
+                "cost": None if path is None else maze.path_cost(path),
+                "visited_cells_count": visited_cells_count,
+                "batch_size": batch_size}
+
+    async def _dispatch(self, method: str, target: str, body: bytes):
+        """
+        Routes one HTTP request to the matching handler.
+
+        Returns:
+        - status (int): The HTTP status code.
+        - payload (dict): The JSON response body.
+        """
+
+        try:
+            if target == "/health":
+                return 200, {"status": "ok", "mazes": len(self.mazes)}
+            if target not in ("/generate", "/solve"):
+                raise ServiceError(404, f"Unknown endpoint: {target}")
+            if method != "POST":
+                raise ServiceError(405, f"{target} only accepts POST")
+            try:
+                params = json.loads(body or b"{}")
+            except ValueError:
+                raise ServiceError(400, "The request body must be JSON")
+            if not isinstance(params, dict):
+                raise ServiceError(400, "The request body must be a JSON object")
+            handler = self.generate if target == "/generate" else self.solve
+            try:
+                return 200, await handler(**params)
+            except TypeError as error:
+                raise ServiceError(400, str(error))
+        except ServiceError as error:
+            return error.status, {"error": str(error)}
+        except Exception as error:
+            return 500, {"error": f"{type(error).__name__}: {error}"}
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Serves HTTP/1.1 requests with JSON bodies on one connection, keeping it alive between requests.
+        """
+
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, _ = request_line.decode("latin-1").split()
+                except ValueError:
+                    break
+
+                # Read the headers and the body
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                # A malformed length leaves the body unframed, so answer 400 and close the connection
+                try:
+                    length = int(headers.get("content-length", 0))
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    status, payload = 400, {"error": "Content-Length must be a non-negative integer"}
+                    keep_alive = False
+                elif length > MAX_BODY:
+                    # The body is not read, so the connection cannot carry another request
+                    status, payload = 413, {"error": f"The request body must not exceed {MAX_BODY} bytes"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length)
+                    status, payload = await self._dispatch(method, target, body)
+                    keep_alive = headers.get("connection", "").lower() != "close"
+
+                data = json.dumps(payload).encode()
+                head = (f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                        f"Content-Type: application/json\r\n"
+                        f"Content-Length: {len(data)}\r\n"
+                        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+                writer.write(head.encode() + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8765, unix_path: str = None, workers: int = None,
+                batch_window: float = BATCH_WINDOW):
+    """
+    Runs the maze service until it is cancelled.
+
+    Args:
+    - host (str): The interface to listen on.
+    - port (int): The TCP port to listen on.
+    - unix_path (str): If given, listen on this Unix socket instead of TCP.
+    - workers (int): The number of worker processes.
+    - batch_window (float): Seconds a solve request waits for others to join its batch.
+    """
+
+    service = MazeService(workers, batch_window)
+    if unix_path:
+        server = await asyncio.start_unix_server(service.handle_connection, path=unix_path, backlog=BACKLOG)
+    else:
+        server = await asyncio.start_server(service.handle_connection, host, port, backlog=BACKLOG)
+    try:
+        async with server:
+            print("Serving on", unix_path or f"http://{host}:{port}")
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve maze generation and solving over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", dest="unix_path", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, help="number of worker processes")
+    parser.add_argument("--batch-window-ms", type=float, default=BATCH_WINDOW * 1000)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix_path, args.workers, args.batch_window_ms / 1000))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,35 @@
+import pytest
+from maze import generate_packed_maze, braid_maze
+from regression import SOLVERS, REQUIRES, QUICK_SIZES, UI_SIZE, run_matrix, check_case, reference_distances, describe_failure
+
+@pytest.mark.parametrize("solver_name", list(SOLVERS))
+def test_solver_matrix(solver_name):
+    """
+    Every solver returns valid paths, as short or cheap as it promises, within its time and memory
+    budgets on every generator and quick size.
+    """
+
+    if solver_name in REQUIRES:
+        pytest.importorskip(REQUIRES[solver_name])
+    results = run_matrix(solvers=[solver_name], sizes=QUICK_SIZES, seeds=(0,))
+    assert results
+    failed = [describe_failure(row) for row in results if row["problems"]]
+    assert not failed, "\n".join(failed)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_drawing_bidirectional_bfs_is_shortest(seed):
+    """
+    The drawing bidirectional BFS finishes the level in which the searches meet, so it returns a
+    shortest path on mazes with many loops, where the first touching pair of cells can lie on a
+    longer one.
+    """
+
+    pytest.importorskip("pygame")
+    maze = generate_packed_maze(*UI_SIZE, seed)
+    braid_maze(maze, 1.0, seed)
+    goal = len(maze) - 1
+    problems, output, _, _ = check_case(maze, "draw-bidirectional", 0, goal, reference_distances(maze, 0),
+                                        measure_memory=False)
+    assert not problems, problems
+    assert output[0] is not None
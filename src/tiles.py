@@ -0,0 +1,271 @@
+import struct
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from maze import Maze, ALL_WALLS
+
+# File header: magic, format version, cols, rows, tile size, weighted flag (padded to 64 bytes)
+HEADER = struct.Struct("<4sHIIIB")
+HEADER_SIZE = 64
+MAGIC = b"MZTL"
+VERSION = 1
+
+# Memory the tile cache may use unless told otherwise
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+
+def write_tiled(maze: Maze, path: str, tile_size: int = 256):
+    """
+    Writes a packed maze to a tiled file: the cells are cut into square tiles of `tile_size` x
+    `tile_size` cells, and every tile is stored as one contiguous record (its wall bytes, followed by
+    its weight bytes if the maze is weighted). Tiles at the right and bottom edges are padded to full
+    size, so the record of any tile is found by multiplication alone.
+
+    Args:
+    - maze (Maze): The packed maze to store.
+    - path (str): The file to write.
+    - tile_size (int): The side length of a tile, in cells.
+    """
+
+    cols, rows = maze.cols, maze.rows
+    tile_cols = (cols + tile_size - 1) // tile_size
+    tile_rows = (rows + tile_size - 1) // tile_size
+
+    # Padding cells have every wall standing and the largest weight, so they never matter
+    layers = [(maze.walls, ALL_WALLS)]
+    if maze.weights is not None:
+        layers.append((maze.weights, 255))
+
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, cols, rows, tile_size, maze.weights is not None).ljust(HEADER_SIZE, b"\0"))
+        for ty in range(tile_rows):
+            for tx in range(tile_cols):
+                x0, y0 = tx * tile_size, ty * tile_size
+                width = min(tile_size, cols - x0)
+                for layer, fill in layers:
+                    block = bytearray([fill]) * (tile_size * tile_size)
+                    for dy in range(min(tile_size, rows - y0)):
+                        row = x0 + (y0 + dy) * cols
+                        block[dy * tile_size:dy * tile_size + width] = layer[row:row + width]
+                    file.write(block)
+
+
+class TiledMaze:
+    """
+    Read-only, disk-backed maze for mazes too large for RAM. Cells are read tile by tile from a file
+    written by `write_tiled` and kept in an LRU cache bounded by a memory budget, so only the tiles
+    around the search frontier are in memory.
+
+    Solvers can announce the tiles they are about to need with `prefetch`; those are read by a
+    background thread while the search goes on, and a later lookup that finds its tile already read
+    counts as a prefetch hit instead of a miss. Hit, miss and prefetch counters help tune the tile
+    size and memory budget. They count tile loads: lookups that stay on the tile of the previous
+    lookup take a shortcut that is not counted, which keeps every counter in the same unit.
+
+    Attributes:
+    - cols (int): The number of columns.
+    - rows (int): The number of rows.
+    - tile_size (int): The side length of a tile, in cells.
+    - weighted (bool): Whether the file stores cell weights.
+    - capacity (int): The number of tiles the budget holds, cached and prefetched ones together.
+    - hits (int): Tile loads served from the cache.
+    - misses (int): Tile reads that had to wait for the disk.
+    - prefetches (int): Tile reads started ahead of time.
+    - prefetch_hits (int): Tile loads that a prefetch had already read.
+    - evictions (int): Tiles dropped from the cache to stay within the budget.
+    """
+
+    def __init__(self, path: str, memory_budget: int = DEFAULT_MEMORY_BUDGET):
+        """
+        Opens a tiled maze file.
+
+        Args:
+        - path (str): A file written by `write_tiled`.
+        - memory_budget (int): The bytes the tile cache may use; at least one tile is always cached.
+        """
+
+        self._file = open(path, "rb", buffering=0)
+        magic, version, self.cols, self.rows, self.tile_size, weighted = HEADER.unpack(self._file.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            self._file.close()
+            raise ValueError(f"{path} is not a tiled maze file")
+        self.weighted = bool(weighted)
+
+        size = self.tile_size
+        self._tile_cols = (self.cols + size - 1) // size
+        self._tile_rows = (self.rows + size - 1) // size
+        self._record_size = size * size * (2 if self.weighted else 1)
+        self.capacity = max(1, memory_budget // self._record_size)
+
+        # Prefetched tiles count against the budget too; at most this many are in flight
+        self._prefetch_window = max(1, self.capacity // 4)
+
+        # Cached tiles (tile id -> record bytes) in least recently used order
+        self._cache = OrderedDict()
+        # Prefetches in flight (tile id -> future of the record bytes)
+        self._pending = {}
+        self._prefetcher = ThreadPoolExecutor(1)
+        self._lock = threading.Lock()
+
+        # The most recently used tile, which most lookups hit without touching the cache
+        self._last_tile = -1
+        self._last_record = None
+        self.reset_stats()
+
+    def __len__(self):
+        return self.cols * self.rows
+
+    def close(self):
+        """
+        Stops the prefetch thread and closes the file.
+        """
+
+        self._prefetcher.shutdown()
+        self._file.close()
+
+    def reset_stats(self):
+        """
+        Resets the hit, miss and prefetch counters.
+        """
+
+        self.hits = 0
+        self.misses = 0
+        self.prefetches = 0
+        self.prefetch_hits = 0
+        self.evictions = 0
+
+    def tile_stats(self):
+        """
+        Returns the cache counters and the hit rate as a dictionary.
+        """
+
+        lookups = self.hits + self.misses + self.prefetch_hits
+        return {
+            "tile_size": self.tile_size,
+            "capacity": self.capacity,
+            "cached": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "prefetches": self.prefetches,
+            "prefetch_hits": self.prefetch_hits,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits + self.prefetch_hits) / lookups if lookups else 0.0,
+        }
+
+    def tile_of(self, index: int):
+        """
+        Returns the id of the tile containing a cell.
+        """
+
+        size = self.tile_size
+        return (index // self.cols) // size * self._tile_cols + (index % self.cols) // size
+
+    def _read(self, tile: int):
+        """
+        Reads the record of a tile from the file (called from both threads).
+        """
+
+        with self._lock:
+            self._file.seek(HEADER_SIZE + tile * self._record_size)
+            return self._file.read(self._record_size)
+
+    def _load(self, tile: int):
+        """
+        Returns the record of a tile, from the cache, a finished prefetch or the disk.
+        """
+
+        record = self._cache.get(tile)
+        if record is not None:
+            self._cache.move_to_end(tile)
+            self.hits += 1
+        else:
+            future = self._pending.pop(tile, None)
+            if future is not None:
+                record = future.result()
+                self.prefetch_hits += 1
+            else:
+                record = self._read(tile)
+                self.misses += 1
+            while self._cache and len(self._cache) + len(self._pending) >= self.capacity:
+                self._cache.popitem(last=False)
+                self.evictions += 1
+            self._cache[tile] = record
+        self._last_tile = tile
+        self._last_record = record
+        return record
+
+    def prefetch(self, tile: int):
+        """
+        Starts reading a tile in the background unless it is cached or already being read.
+
+        Args:
+        - tile (int): The id of the tile, e.g. from `tile_of`.
+        """
+
+        if tile in self._cache or tile in self._pending:
+            return
+        # Drop the oldest prefetch that was never used to stay within the window, and cancel its
+        # read if the thread has not started it yet
+        if len(self._pending) >= self._prefetch_window:
+            self._pending.pop(next(iter(self._pending))).cancel()
+        self._pending[tile] = self._prefetcher.submit(self._read, tile)
+        self.prefetches += 1
+
+    def walls_at(self, index: int):
+        """
+        Returns the wall bits of a cell.
+        """
+
+        cols, size = self.cols, self.tile_size
+        x, y = index % cols, index // cols
+        tile = y // size * self._tile_cols + x // size
+        if tile == self._last_tile:
+            record = self._last_record
+        else:
+            record = self._load(tile)
+        return record[(y % size) * size + x % size]
+
+    def weight_at(self, index: int):
+        """
+        Returns the cost of stepping into a cell.
+        """
+
+        if not self.weighted:
+            return 1
+        cols, size = self.cols, self.tile_size
+        x, y = index % cols, index // cols
+        tile = y // size * self._tile_cols + x // size
+        if tile == self._last_tile:
+            record = self._last_record
+        else:
+            record = self._load(tile)
+        return record[size * size + (y % size) * size + x % size]
+
+    def min_weight(self):
+        """
+        Returns the smallest cell weight, scanning the file tile by tile without using the cache.
+        """
+
+        if not self.weighted:
+            return 1
+        size = self.tile_size * self.tile_size
+        return min(min(self._read(tile)[size:]) for tile in range(self._tile_cols * self._tile_rows))
+
+    def to_maze(self):
+        """
+        Loads the whole maze into a packed `Maze` (only for mazes that fit in memory).
+        """
+
+        walls = bytearray(len(self))
+        weights = bytearray(len(self)) if self.weighted else None
+        cols, size = self.cols, self.tile_size
+        for ty in range(self._tile_rows):
+            for tx in range(self._tile_cols):
+                record = self._read(ty * self._tile_cols + tx)
+                x0 = tx * size
+                width = min(size, cols - x0)
+                for dy in range(min(size, self.rows - ty * size)):
+                    row = x0 + (ty * size + dy) * cols
+                    walls[row:row + width] = record[dy * size:dy * size + width]
+                    if weights is not None:
+                        weights[row:row + width] = record[size * size + dy * size:size * size + dy * size + width]
+        return Maze.from_bytes(self.cols, self.rows, walls, weights)